@@ -1,16 +1,22 @@
 """A Python package that helps you create and execute a directed acyclic graph (DAG) of parameters and their relationships."""  # noqa: E501
 
 __all__ = [
+    "RNG_ID",
     "Array",
     "ArrayRef",
     "BooleanParameter",
+    "CacheInfo",
     "CategoricalParameter",
     "CollectionABC",
     "CollectionRef",
     "CoreModel",
     "ExecInfo",
+    "ExecutionHooks",
     "ExecutionModel",
+    "ExecutionPlan",
+    "ExecutionState",
     "FunctionRelationship",
+    "IncrementalResults",
     "Mapping",
     "MappingRef",
     "Model",
@@ -18,20 +24,38 @@ __all__ = [
     "ParameterABC",
     "ParameterId",
     "ParameterRef",
+    "Profile",
     "PydanticParameter",
     "RealParameter",
     "ReferenceABC",
     "RelationshipABC",
+    "RelationshipCache",
     "RelationshipId",
+    "RelationshipStats",
+    "ResultsView",
+    "RolledExecutionModel",
+    "RolledExecutionPlan",
+    "SensitivityResults",
     "StaticParameterId",
     "StaticRelationshipId",
+    "StopCondition",
     "SubModelRelationship",
+    "TimeSeriesArrayId",
+    "TimeSeriesColumn",
     "TimeSeriesParameterId",
     "TimeSeriesRelationshipId",
+    "checkpoint_exec_model",
     "create_exec_model_from_core_model",
+    "create_rolled_exec_model_from_core_model",
     "distance_constrained_sampling",
     "execute_exec_model",
+    "execute_exec_model_async",
+    "execute_exec_model_batch",
+    "execute_exec_model_incremental",
+    "execute_exec_model_parallel",
+    "execute_exec_model_sensitivity",
     "export_dot",
+    "hash_arguments_key",
     "relationship",
     "results_to_df",
     "run_experiments",
@@ -42,6 +66,7 @@ from ._core import (
     Array,
     ArrayRef,
     BooleanParameter,
+    CacheInfo,
     CategoricalParameter,
     CollectionABC,
     CollectionRef,
@@ -56,19 +81,42 @@ from ._core import (
     RealParameter,
     ReferenceABC,
     RelationshipABC,
+    RelationshipCache,
+    StopCondition,
     SubModelRelationship,
+    hash_arguments_key,
 )
 from ._exec import (
+    RNG_ID,
+    ExecutionHooks,
     ExecutionModel,
+    ExecutionPlan,
+    ExecutionState,
+    IncrementalResults,
     NodeId,
     ParameterId,
+    Profile,
     RelationshipId,
+    RelationshipStats,
+    ResultsView,
+    RolledExecutionModel,
+    RolledExecutionPlan,
+    SensitivityResults,
     StaticParameterId,
     StaticRelationshipId,
+    TimeSeriesArrayId,
+    TimeSeriesColumn,
     TimeSeriesParameterId,
     TimeSeriesRelationshipId,
+    checkpoint_exec_model,
     create_exec_model_from_core_model,
+    create_rolled_exec_model_from_core_model,
     execute_exec_model,
+    execute_exec_model_async,
+    execute_exec_model_batch,
+    execute_exec_model_incremental,
+    execute_exec_model_parallel,
+    execute_exec_model_sensitivity,
 )
 from ._experiment import distance_constrained_sampling, results_to_df, run_experiments, sample_parameter_values
 from ._export import export_dot
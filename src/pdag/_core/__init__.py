@@ -2,6 +2,7 @@ __all__ = [
     "Array",
     "ArrayRef",
     "BooleanParameter",
+    "CacheInfo",
     "CategoricalParameter",
     "CollectionABC",
     "CollectionRef",
@@ -17,11 +18,16 @@ __all__ = [
     "RealParameter",
     "ReferenceABC",
     "RelationshipABC",
+    "RelationshipCache",
+    "StopCondition",
     "SubModelRelationship",
+    "hash_arguments_key",
 ]
 
+from .cache import CacheInfo, RelationshipCache, hash_arguments_key
 from .collection import Array, CollectionABC, Mapping
 from .model import CoreModel, Module
 from .parameter import BooleanParameter, CategoricalParameter, ParameterABC, PydanticParameter, RealParameter
 from .reference import ArrayRef, CollectionRef, ExecInfo, MappingRef, ParameterRef, ReferenceABC
 from .relationship import FunctionRelationship, RelationshipABC, SubModelRelationship
+from .stop import StopCondition
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple, cast
+
+import numpy as np
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int | None
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return _freeze(value.tolist())
+        return (value.dtype.str, value.shape, value.tobytes())
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    return cast("Hashable", value)
+
+
+def hash_arguments_key(**kwargs: Any) -> Hashable:
+    """Make a cache key from the arguments of a relationship.
+
+    Mappings and lists (e.g. the values of collection references) are converted to tuples,
+    and NumPy arrays are keyed by their dtype, shape, and data. Other values must be hashable.
+    """
+    return _freeze(kwargs)
+
+
+@dataclass
+class RelationshipCache:
+    """Bounded LRU cache of the results of a function relationship.
+
+    The cache is keyed by `key(**kwargs)`, where `kwargs` are the arguments the relationship is called with.
+    The default key function, [`hash_arguments_key`][pdag.hash_arguments_key], supports hashable values,
+    NumPy arrays, and mappings and lists of them. Use a custom key function for other unhashable arguments.
+    If `maxsize` is `None`, the cache is unbounded.
+    """
+
+    maxsize: int | None = 128
+    key: Callable[..., Hashable] = hash_arguments_key
+
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    _entries: OrderedDict[Hashable, Any] = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.maxsize is not None and self.maxsize <= 0:
+            msg = f"maxsize must be positive or None, got {self.maxsize}."
+            raise ValueError(msg)
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def wrap[**P, T](self, function: Callable[P, T]) -> Callable[P, T]:
+        """Return a function that looks up the cache before calling `function`."""
+
+        def cached_function(*args: P.args, **kwargs: P.kwargs) -> T:
+            try:
+                key = self.key(*args, **kwargs)
+                hash(key)
+            except TypeError as e:
+                msg = "The relationship arguments cannot be used as a cache key. Specify a custom key function."
+                raise TypeError(msg) from e
+
+            with self._lock:
+                if key in self._entries:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return self._entries[key]  # type: ignore[no-any-return]
+                self.misses += 1
+
+            result = function(*args, **kwargs)
+
+            with self._lock:
+                self._entries[key] = result
+                if self.maxsize is not None and len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+            return result
+
+        return cached_function
@@ -81,7 +81,7 @@ class CollectionABC[K: Hashable, T: ParameterABC[Any] | RelationshipABC](
         raise TypeError(msg)
 
     @abstractmethod
-    def ref(
+    def ref(  # noqa: PLR0913
         self,
         key: K | None = None,
         *,
@@ -89,6 +89,7 @@ class CollectionABC[K: Hashable, T: ParameterABC[Any] | RelationshipABC](
         next: bool = False,  # noqa: A002
         initial: bool = False,
         all_time_steps: bool = False,
+        lag: int = 0,
     ) -> CollectionRef[Any]:
         raise NotImplementedError
 
@@ -115,7 +116,7 @@ class Mapping[K: str | tuple[str, ...], T: ParameterABC[Any] | RelationshipABC](
     def keys(self) -> Iterable[K]:
         yield from self.mapping.keys()
 
-    def ref(
+    def ref(  # noqa: PLR0913
         self,
         key: str | tuple[str | EllipsisType, ...] | None = None,
         *,
@@ -123,6 +124,7 @@ class Mapping[K: str | tuple[str, ...], T: ParameterABC[Any] | RelationshipABC](
         next: bool = False,  # noqa: A002
         initial: bool = False,
         all_time_steps: bool = False,
+        lag: int = 0,
     ) -> MappingRef:
         """Create a reference to the mapping."""
         return MappingRef(
@@ -132,6 +134,7 @@ class Mapping[K: str | tuple[str, ...], T: ParameterABC[Any] | RelationshipABC](
             next=next,
             initial=initial,
             all_time_steps=all_time_steps,
+            lag=lag,
         )
 
 
@@ -156,7 +159,7 @@ class Array[T: ParameterABC[Any] | RelationshipABC](CollectionABC[tuple[int, ...
     def items(self) -> Iterable[tuple[tuple[int, ...], T]]:
         yield from np.ndenumerate(self.array)
 
-    def ref(
+    def ref(  # noqa: PLR0913
         self,
         key: tuple[int, ...] | None = None,
         *,
@@ -164,8 +167,13 @@ class Array[T: ParameterABC[Any] | RelationshipABC](CollectionABC[tuple[int, ...
         next: bool = False,  # noqa: A002
         initial: bool = False,
         all_time_steps: bool = False,
+        lag: int = 0,
+        as_array: bool = False,
     ) -> ArrayRef:
-        """Create a reference to the array."""
+        """Create a reference to the array.
+
+        The array is passed as nested lists, or as a NumPy array of the parameter dtype if `as_array=True`.
+        """
         return ArrayRef(
             name=self.name,
             key=key,
@@ -173,4 +181,6 @@ class Array[T: ParameterABC[Any] | RelationshipABC](CollectionABC[tuple[int, ...
             next=next,
             initial=initial,
             all_time_steps=all_time_steps,
+            lag=lag,
+            as_array=as_array,
         )
@@ -8,6 +8,7 @@ from .collection import CollectionABC
 from .parameter import ParameterABC
 from .reference import CollectionRef, ParameterRef, ReferenceABC
 from .relationship import RelationshipABC
+from .stop import StopCondition
 
 
 @dataclass
@@ -29,6 +30,10 @@ class CoreModel:
         dict[str, CollectionABC[Hashable, ParameterABC[Any] | RelationshipABC]],
         Doc("Mapping of collection names to collections."),
     ]
+    stop_condition: Annotated[
+        StopCondition | None,
+        Doc("Condition that ends the time loop early. If None, all time steps are run."),
+    ] = None
 
     _parameter_dict: dict[str, ParameterABC[Any]] = field(init=False)
     _relationship_dict: dict[str, RelationshipABC] = field(init=False)
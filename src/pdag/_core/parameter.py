@@ -82,21 +82,36 @@ class ParameterABC[T](InitArgsRecorder, ABC):
         """
         raise NotImplementedError
 
-    def ref(
+    def ref(  # noqa: PLR0913
         self,
         *,
         previous: bool = False,
         next: bool = False,  # noqa: A002
         initial: bool = False,
         all_time_steps: bool = False,
+        lag: int = 0,
+        window: int | None = None,
+        as_array: bool = False,
     ) -> ParameterRef:
-        """Create a reference to this parameter in the model definition."""
+        """Create a reference to this parameter in the model definition.
+
+        In a relationship evaluated at each time step, `lag=k` refers to the value `k` time steps before
+        the current one, and `window=k` to the array of the values at the last `k` time steps,
+        from the oldest to the current one. The relationship is evaluated from the first time step
+        at which all the referred values exist.
+
+        Array values (`all_time_steps=True` and `window=k`) are passed as lists, or as NumPy arrays
+        of the parameter dtype if `as_array=True`.
+        """
         return ParameterRef(
             name=self.name,
             previous=previous,
             next=next,
             initial=initial,
             all_time_steps=all_time_steps,
+            lag=lag,
+            window=window,
+            as_array=as_array,
         )
 
 
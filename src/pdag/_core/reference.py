@@ -19,13 +19,27 @@ class ReferenceABC(InitArgsRecorder):
     next: bool = field(default=False, kw_only=True)
     initial: bool = field(default=False, kw_only=True)
     all_time_steps: bool = field(default=False, kw_only=True)
+    lag: int = field(default=0, kw_only=True)
+    window: int | None = field(default=None, kw_only=True)
+
+    # Pass array values as NumPy arrays of the parameter dtype instead of lists
+    as_array: bool = field(default=False, kw_only=True)
 
     __init_args__: tuple[Any, ...] = field(init=False, compare=False, hash=False)
     __init_kwargs__: dict[str, Any] = field(init=False, compare=False, hash=False)
 
     def __post_init__(self) -> None:
-        if sum([self.previous, self.next, self.initial, self.all_time_steps]) > 1:
-            msg = "Reference cannot have more than one of previous, next, initial, or all_time_steps set."
+        if (
+            sum([self.previous, self.next, self.initial, self.all_time_steps, self.lag != 0, self.window is not None])
+            > 1
+        ):
+            msg = "Reference cannot have more than one of previous, next, initial, all_time_steps, lag, or window set."
+            raise ValueError(msg)
+        if self.lag < 0:
+            msg = "Reference lag must be non-negative."
+            raise ValueError(msg)
+        if self.window is not None and self.window < 1:
+            msg = "Reference window must be positive."
             raise ValueError(msg)
         if not self.name.isidentifier():
             msg = "Reference name must be a valid identifier."
@@ -33,7 +47,18 @@ class ReferenceABC(InitArgsRecorder):
 
     @property
     def normal(self) -> bool:
-        return not any([self.previous, self.next, self.initial, self.all_time_steps])
+        return not any(
+            [self.previous, self.next, self.initial, self.all_time_steps, self.lag != 0, self.window is not None],
+        )
+
+    @property
+    def lookback(self) -> int:
+        """Number of time steps before the current one whose values are referred to."""
+        if self.previous:
+            return 1
+        if self.window is not None:
+            return self.window - 1
+        return self.lag
 
 
 @dataclass(frozen=True)  # Frozen to be valid as a dictionary key
@@ -62,6 +87,10 @@ class ArrayRef(CollectionRef[tuple[int, ...]]):
 
 @dataclass(frozen=True)
 class ExecInfo:
-    """Represents the information available during the execution of a model."""
+    """Represents the information available during the execution of a model.
+
+    `"rng"` is the [`numpy.random.Generator`][numpy.random.Generator] of the case, given as the input
+    [`RNG_ID`][pdag.RNG_ID], so that the relationships can draw random numbers reproducibly.
+    """
 
-    attribute: Literal["n_time_steps", "time"]
+    attribute: Literal["n_time_steps", "time", "rng"]
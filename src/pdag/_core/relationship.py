@@ -2,11 +2,12 @@ from abc import ABC, abstractmethod
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from types import EllipsisType
-from typing import TYPE_CHECKING, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 from pdag._utils import InitArgsRecorder
 
-from .reference import ExecInfo, ReferenceABC
+from .cache import RelationshipCache
+from .reference import ExecInfo, ParameterRef, ReferenceABC
 
 if TYPE_CHECKING:
     from .model import CoreModel
@@ -44,9 +45,17 @@ class RelationshipABC(ABC, InitArgsRecorder):
     def iter_output_refs(self) -> Iterable[ReferenceABC]:
         raise NotImplementedError
 
+    @property
+    def lookback(self) -> int:
+        """Number of time steps before the current one whose values the relationship refers to."""
+        return max(
+            (param_ref.lookback for param_ref in self.iter_input_refs() if isinstance(param_ref, ReferenceABC)),
+            default=0,
+        )
+
     @property
     def includes_past(self) -> bool:
-        return any(param_ref.previous for param_ref in self.iter_input_refs() if isinstance(param_ref, ReferenceABC))
+        return self.lookback > 0
 
     @property
     def includes_future(self) -> bool:
@@ -60,16 +69,28 @@ class FunctionRelationship[**P, T](RelationshipABC):
     outputs: list[ReferenceABC] = field(kw_only=True)
     function_body: str = field(kw_only=True)
     output_is_scalar: bool = field(kw_only=True)
+    vectorized: bool = field(default=False, kw_only=True)
+    is_async: bool = field(default=False, kw_only=True)
+    # Relationships evaluated at each time step are only evaluated every `every` time steps
+    every: int = field(default=1, kw_only=True)
+    # Fold relationships update the values of their outputs once per time step, starting from `fold_initial`
+    fold: bool = field(default=False, kw_only=True)
+    fold_initial: Any = field(default=None, kw_only=True)
+    cache: RelationshipCache | None = field(default=None, compare=False, kw_only=True)
     _function: Callable[P, T] | None = field(default=None, compare=False, kw_only=True)
 
     def is_hydrated(self) -> bool:
         return self._function is not None
 
-    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+    @property
+    def function(self) -> Callable[P, T]:
         if self._function is None:
             msg = f"Function relationship {self.name} has not been hydrated."
             raise ValueError(msg)
-        return self._function(*args, **kwargs)
+        return self._function
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> T:
+        return self.function(*args, **kwargs)
 
     def iter_input_refs(self) -> Iterable[ReferenceABC | ExecInfo]:
         return self.inputs.values()
@@ -77,6 +98,30 @@ class FunctionRelationship[**P, T](RelationshipABC):
     def iter_output_refs(self) -> Iterable[ReferenceABC]:
         return self.outputs
 
+    def is_accumulator_ref(self, ref: ReferenceABC | ExecInfo) -> bool:
+        """Whether an input reference of a fold relationship receives the value of an output after the previous step."""
+        return (
+            self.fold
+            and isinstance(ref, ParameterRef)
+            and ref.previous
+            and any(ref.name == output_ref.name for output_ref in self.outputs)
+        )
+
+    @property
+    def lookback(self) -> int:
+        return max(
+            (
+                param_ref.lookback
+                for param_ref in self.iter_input_refs()
+                if isinstance(param_ref, ReferenceABC) and not self.is_accumulator_ref(param_ref)
+            ),
+            default=0,
+        )
+
+    def fold_initial_values(self) -> tuple[Any, ...]:
+        """Values the accumulators of a fold relationship start from, in the order of the outputs."""
+        return (self.fold_initial,) if self.output_is_scalar else tuple(self.fold_initial)
+
 
 @dataclass
 class SubModelRelationship(RelationshipABC):
@@ -0,0 +1,46 @@
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Annotated, Any, Literal
+
+from typing_extensions import Doc
+
+from .reference import ParameterRef
+
+type FillPolicy = Literal["hold", "none"]
+
+
+@dataclass
+class StopCondition:
+    """Condition on a time-series parameter that ends the time loop early.
+
+    After the time steps of a case are run up to a time step at which the condition holds,
+    the remaining time steps are skipped and the values of the time-series parameters at those time steps
+    are filled in according to `fill`: `"hold"` repeats the value at the stop step and `"none"` sets `None`.
+    Static relationships that refer to all time steps are run on the filled values.
+    Only the stop condition of the root model is used.
+    """
+
+    ref: Annotated[ParameterRef, Doc("Reference to a time-series parameter of the model.")]
+    predicate: Annotated[
+        Callable[[Any], bool] | None,
+        Doc("Function of the parameter value that returns whether to stop. If None, the value itself is used."),
+    ] = None
+    fill: Annotated[FillPolicy, Doc("How to fill the time-series parameters at the skipped time steps.")] = "hold"
+    fill_values: Annotated[
+        dict[ParameterRef, Any],
+        Doc("Constant fill values of specific time-series parameters of the model, overriding `fill`."),
+    ] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if self.fill not in ("hold", "none"):
+            msg = f"Unknown fill policy: {self.fill}"
+            raise ValueError(msg)
+        if not self.ref.normal or any(not ref.normal for ref in self.fill_values):
+            msg = (
+                "References of a stop condition cannot have previous, next, initial, all_time_steps, lag, "
+                "or window set."
+            )
+            raise ValueError(msg)
+
+    def should_stop(self, value: Any) -> bool:
+        return bool(value if self.predicate is None else self.predicate(value))
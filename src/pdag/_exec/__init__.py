@@ -1,24 +1,55 @@
 __all__ = [
+    "RNG_ID",
+    "ExecutionHooks",
     "ExecutionModel",
+    "ExecutionPlan",
+    "ExecutionState",
+    "IncrementalResults",
     "NodeId",
     "ParameterId",
+    "Profile",
     "RelationshipId",
+    "RelationshipStats",
+    "ResultsView",
+    "RolledExecutionModel",
+    "RolledExecutionPlan",
+    "SensitivityResults",
     "StaticParameterId",
     "StaticRelationshipId",
+    "TimeSeriesArrayId",
+    "TimeSeriesColumn",
     "TimeSeriesParameterId",
     "TimeSeriesRelationshipId",
+    "checkpoint_exec_model",
     "create_exec_model_from_core_model",
+    "create_rolled_exec_model_from_core_model",
     "execute_exec_model",
+    "execute_exec_model_async",
+    "execute_exec_model_batch",
+    "execute_exec_model_incremental",
+    "execute_exec_model_parallel",
+    "execute_exec_model_sensitivity",
 ]
-from .core import execute_exec_model
+from .async_exec import execute_exec_model_async
+from .batch import execute_exec_model_batch
+from .core import checkpoint_exec_model, execute_exec_model
+from .hooks import ExecutionHooks
+from .incremental import IncrementalResults, execute_exec_model_incremental
 from .model import (
+    RNG_ID,
     ExecutionModel,
     NodeId,
     ParameterId,
     RelationshipId,
     StaticParameterId,
     StaticRelationshipId,
+    TimeSeriesArrayId,
     TimeSeriesParameterId,
     TimeSeriesRelationshipId,
 )
+from .parallel import execute_exec_model_parallel
+from .plan import ExecutionPlan, ExecutionState, ResultsView, TimeSeriesColumn
+from .profile import Profile, RelationshipStats
+from .rolled import RolledExecutionModel, RolledExecutionPlan, create_rolled_exec_model_from_core_model
+from .sensitivity import SensitivityResults, execute_exec_model_sensitivity
 from .to_exec_model import create_exec_model_from_core_model
@@ -0,0 +1,83 @@
+import asyncio
+import contextlib
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from .model import ExecutionModel, Inputs, ParameterId
+from .plan import CallInstruction, ExecutionPlan, ResultsView
+
+
+class _Scheduler:
+    """Run the instructions of a plan as soon as the instructions they depend on have completed."""
+
+    def __init__(self, plan: ExecutionPlan, values: list[Any], max_concurrency: int | None) -> None:
+        self.plan = plan
+        self.values = values
+        self.dependents = plan.dependents()
+        self.semaphore: contextlib.AbstractAsyncContextManager[Any] = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency is not None else contextlib.nullcontext()
+        )
+        self.n_dependencies = dict.fromkeys(range(len(plan.instructions)), 0)
+        for indices in self.dependents.values():
+            for index in indices:
+                self.n_dependencies[index] += 1
+        self.ready = deque(index for index, count in self.n_dependencies.items() if count == 0)
+
+    def _complete(self, index: int) -> None:
+        for dependent in self.dependents[index]:
+            self.n_dependencies[dependent] -= 1
+            if self.n_dependencies[dependent] == 0:
+                self.ready.append(dependent)
+
+    async def _run_async(self, index: int, instruction: CallInstruction) -> int:
+        async with self.semaphore:
+            await instruction.run_async(self.values)
+        return index
+
+    async def run(self) -> None:
+        running: set[asyncio.Task[int]] = set()
+        try:
+            while self.ready or running:
+                while self.ready:
+                    index = self.ready.popleft()
+                    instruction = self.plan.instructions[index]
+                    if isinstance(instruction, CallInstruction) and instruction.is_async:
+                        running.add(asyncio.create_task(self._run_async(index, instruction)))
+                    else:
+                        instruction.run(self.values)
+                        self._complete(index)
+                if running:
+                    done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        self._complete(task.result())
+        finally:
+            for task in running:
+                task.cancel()
+
+
+async def execute_exec_model_async(
+    exec_model: ExecutionModel,
+    inputs: Inputs,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    max_concurrency: int | None = None,
+) -> dict[ParameterId, Any]:
+    """Execute the model for a single case, awaiting async relationships concurrently.
+
+    Each async relationship is started as soon as all of its inputs are available,
+    with at most `max_concurrency` of them running at the same time.
+    Synchronous relationships are called directly in the event loop.
+    The relationships that draw from the generator given as `RNG_ID` are run one at a time in the order of
+    sequential execution, so they draw the same random numbers.
+    """
+    if max_concurrency is not None and max_concurrency <= 0:
+        msg = f"max_concurrency must be positive or None, got {max_concurrency}."
+        raise ValueError(msg)
+    plan = exec_model.compile(outputs=outputs)
+    if plan.stop is not None:
+        msg = "Models with a stop condition are not supported by async execution."
+        raise ValueError(msg)
+    values = plan.initial_values(inputs)
+    await _Scheduler(plan, values, max_concurrency).run()
+    return ResultsView(plan.parameter_ids, plan.slots, values, plan.columns).to_dict()
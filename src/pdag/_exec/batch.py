@@ -0,0 +1,91 @@
+from collections.abc import Mapping
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .model import ExecutionModel, ParameterId
+from .plan import MISSING, CallInstruction, as_column
+
+
+class _CaseRow:
+    """Slot values of a single case, read from and written to the columns of all cases."""
+
+    __slots__ = ("_case_index", "_columns", "_output_buffers")
+
+    def __init__(
+        self,
+        columns: list[Any],
+        output_buffers: dict[int, npt.NDArray[np.object_]],
+        case_index: int,
+    ) -> None:
+        self._columns = columns
+        self._output_buffers = output_buffers
+        self._case_index = case_index
+
+    def __getitem__(self, slot: int) -> Any:
+        value = self._columns[slot][self._case_index]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __setitem__(self, slot: int, value: Any) -> None:
+        self._output_buffers[slot][self._case_index] = value
+
+
+def _run_case_by_case(instruction: CallInstruction, columns: list[Any], n_cases: int) -> None:
+    output_buffers = {slot: np.empty(n_cases, dtype=object) for slot in instruction.iter_output_slots()}
+    for case_index in range(n_cases):
+        instruction.run(_CaseRow(columns, output_buffers, case_index))
+    for slot, buffer in output_buffers.items():
+        columns[slot] = as_column(buffer.tolist())
+
+
+def execute_exec_model_batch(
+    exec_model: ExecutionModel,
+    inputs_columns: Mapping[ParameterId, Any],
+    *,
+    n_cases: int | None = None,
+) -> dict[ParameterId, npt.NDArray[Any]]:
+    """Execute the model for many cases at once.
+
+    `inputs_columns` maps each input parameter to the sequence of its values across cases.
+    Relationships marked with `vectorized=True` are called once with the values of all cases;
+    the other relationships are called case by case.
+
+    Returns a mapping from each parameter to the array of its values across cases.
+    """
+    columns_by_id = {parameter_id: as_column(values) for parameter_id, values in inputs_columns.items()}
+    lengths = {len(column) for column in columns_by_id.values()}
+    if n_cases is not None:
+        lengths.add(n_cases)
+    if len(lengths) != 1:
+        msg = (
+            "Cannot determine the number of cases."
+            if not lengths
+            else f"All input columns must have the same length, but got lengths {sorted(lengths)}."
+        )
+        raise ValueError(msg)
+    (n_cases,) = lengths
+
+    plan = exec_model.compile()
+    if plan.stop is not None:
+        msg = "Models with a stop condition are not supported by batch execution."
+        raise ValueError(msg)
+    columns = plan.initial_values(columns_by_id)
+    if plan.preset_values is not None:
+        # Preset values, e.g., the initial accumulators of fold relationships, are shared by all cases
+        for slot, value in enumerate(plan.preset_values):
+            if value is not MISSING and columns[slot] is value:
+                columns[slot] = as_column([value] * n_cases)
+    for instruction in plan.instructions:
+        if not isinstance(instruction, CallInstruction):
+            instruction.run(columns)
+        elif instruction.vectorized:
+            instruction.run_batch(columns, n_cases)
+        else:
+            _run_case_by_case(instruction, columns, n_cases)
+
+    return {
+        parameter_id: column
+        for parameter_id, column in zip(plan.parameter_ids, columns, strict=True)
+        if column is not MISSING
+    }
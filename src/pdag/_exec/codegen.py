@@ -0,0 +1,256 @@
+import uuid
+import weakref
+from collections.abc import Callable, Hashable
+from collections.abc import Mapping as MappingABC
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .model import Inputs, ParameterId
+from .plan import (
+    MISSING,
+    ArraySlotConnector,
+    CallInstruction,
+    ConstantInput,
+    CopyInstruction,
+    ExecutionPlan,
+    ExecutionState,
+    Instruction,
+    MappingListSlotConnector,
+    MappingSlotConnector,
+    ResultsView,
+    ScalarSlotConnector,
+    SlotConnectorABC,
+    StopCheck,
+)
+
+if TYPE_CHECKING:
+    from .profile import Profile
+
+_FUNCTION_NAME = "_execute"
+
+# Generated executors that are alive in this process, keyed by their reference.
+# Pickling an executor only stores its reference, so it can be passed to workers forked from this process.
+_REGISTRY: weakref.WeakValueDictionary[str, "GeneratedExecutor"] = weakref.WeakValueDictionary()
+
+
+class _Namespace:
+    """Global namespace of the generated function.
+
+    Objects that cannot be written as literals (functions, mapping keys, `ExecInfo` values) are bound to names here.
+    """
+
+    def __init__(self) -> None:
+        self.globals: dict[str, Any] = {"MISSING": MISSING, "np": np}
+        self._names: dict[int, str] = {}
+
+    def bind(self, obj: Any, prefix: str) -> str:
+        if id(obj) not in self._names:
+            name = f"{prefix}{len(self._names)}"
+            self._names[id(obj)] = name
+            self.globals[name] = obj
+        return self._names[id(obj)]
+
+    def constant(self, value: Any) -> str:
+        if value is None or type(value) in {bool, int, float, str}:
+            return repr(value)
+        return self.bind(value, "c")
+
+
+def _var(slot: int) -> str:
+    return f"v{slot}"
+
+
+def _flat_vars(connector: ArraySlotConnector) -> str:
+    return "(" + "".join(f"{_var(slot)}, " for slot in connector.iter_slots()) + ")"
+
+
+def _gather_expr(connector: SlotConnectorABC | ConstantInput, namespace: _Namespace) -> str:
+    if isinstance(connector, ConstantInput):
+        return namespace.constant(connector.value)
+    if isinstance(connector, ScalarSlotConnector):
+        return _var(connector.slot)
+    if isinstance(connector, MappingSlotConnector):
+        return _mapping_expr(connector.slots, namespace)
+    if isinstance(connector, MappingListSlotConnector):
+        return "[" + ", ".join(_mapping_expr(mapping, namespace) for mapping in connector.slots) + "]"
+    if isinstance(connector, ArraySlotConnector):
+        return f"{namespace.bind(connector, 'a')}.to_argument({_flat_vars(connector)})"
+    msg = f"Connector type {type(connector)} is not supported."
+    raise TypeError(msg)
+
+
+def _mapping_expr(slots: MappingABC[Hashable, int], namespace: _Namespace) -> str:
+    return "{" + ", ".join(f"{namespace.constant(key)}: {_var(slot)}" for key, slot in slots.items()) + "}"
+
+
+def _scatter_lines(connector: SlotConnectorABC, value_expr: str, namespace: _Namespace) -> list[str]:
+    if isinstance(connector, ScalarSlotConnector):
+        return [f"{_var(connector.slot)} = {value_expr}"]
+    if isinstance(connector, MappingSlotConnector):
+        return [f"{_var(slot)} = {value_expr}[{namespace.constant(key)}]" for key, slot in connector.slots.items()]
+    if isinstance(connector, MappingListSlotConnector):
+        item_vars = [f"_item{i}" for i in range(len(connector.slots))]
+        # `() = value` checks that the value is empty, as the interpreter does
+        lines = [f"({', '.join(item_vars)},) = {value_expr}" if item_vars else f"() = {value_expr}"]
+        for item_var, mapping in zip(item_vars, connector.slots, strict=True):
+            lines.extend(f"{_var(slot)} = {item_var}[{namespace.constant(key)}]" for key, slot in mapping.items())
+        return lines
+    if isinstance(connector, ArraySlotConnector):
+        return [f"{_flat_vars(connector)} = {namespace.bind(connector, 'a')}.from_array({value_expr})"]
+    msg = f"Connector type {type(connector)} is not supported."
+    raise TypeError(msg)
+
+
+def generate_source(plan: ExecutionPlan) -> tuple[str, dict[str, Any]]:
+    """Generate the source of a straight-line function that executes the plan.
+
+    The generated function takes the initial slot values (see
+    [`ExecutionPlan.initial_values`][pdag.ExecutionPlan.initial_values]) and returns the final slot values.
+    Each parameter is held in its own local variable and each relationship is called directly.
+
+    Returns the source and the global namespace the source should be executed in.
+    """
+    namespace = _Namespace()
+    all_vars = ", ".join(_var(slot) for slot in range(len(plan.parameter_ids)))
+    body: list[str] = [f"({all_vars},) = values"] if plan.parameter_ids else []
+    if plan.stop is None:
+        body.extend(_range_lines(plan, 0, len(plan.instructions), namespace))
+    else:
+        body.extend(_stop_lines(plan, plan.stop, all_vars, namespace))
+    body.append(f"return [{all_vars}]")
+
+    source = f"def {_FUNCTION_NAME}(values):\n" + "".join(f"    {line}\n" for line in body)
+    return source, namespace.globals
+
+
+def _range_lines(plan: ExecutionPlan, start: int, end: int, namespace: _Namespace) -> list[str]:
+    lines: list[str] = []
+    for index in range(start, end):
+        lines.extend(_instruction_lines(plan.instructions[index], namespace))
+        if plan.free_after is not None:
+            lines.extend(f"{_var(slot)} = MISSING" for slot in plan.free_after[index])
+    return lines
+
+
+def _stop_lines(plan: ExecutionPlan, stop: StopCheck, all_vars: str, namespace: _Namespace) -> list[str]:
+    """Generate the code of a plan with a stop condition.
+
+    Each time step after the first one is guarded by a check that the time loop has not stopped yet.
+    """
+    stop_name = namespace.bind(stop, "s")
+    lines = ["_stop_step = None"]
+    start = 0
+    for time_step, end in enumerate(plan.step_ends):
+        step_lines = _range_lines(plan, start, end, namespace)
+        start = end
+        if time_step < len(plan.step_ends) - 1:
+            stop_var = _var(stop.stop_slots[time_step])
+            step_lines.append(
+                f"if {stop_var} is not MISSING and {stop_name}.stop_condition.should_stop({stop_var}): "
+                f"_stop_step = {time_step}",
+            )
+        if time_step == 0:
+            lines.extend(step_lines)
+        elif step_lines:
+            lines.append("if _stop_step is None:")
+            lines.extend(f"    {line}" for line in step_lines)
+    lines.append("if _stop_step is not None:")
+    lines.append(f"    _values = [{all_vars}]")
+    lines.append(f"    {stop_name}.fill(_values, _stop_step)")
+    lines.append(f"    ({all_vars},) = _values")
+    lines.extend(_range_lines(plan, start, len(plan.instructions), namespace))
+    return lines
+
+
+def _instruction_lines(instruction: Instruction, namespace: _Namespace) -> list[str]:
+    if isinstance(instruction, CopyInstruction):
+        target = _var(instruction.target_slot)
+        return [f"if {target} is MISSING: {target} = {_var(instruction.source_slot)}"]
+
+    assert isinstance(instruction, CallInstruction)
+    lines = [f"# {instruction.relationship_id}"]
+    if instruction.vectorized or instruction.is_async:
+        # Vectorized and async relationships are called through the instruction,
+        # which wraps the values in batches of one or runs the coroutine
+        instruction_name = namespace.bind(instruction, "i")
+        input_values = ", ".join(f"{slot}: {_var(slot)}" for slot in instruction.iter_input_slots())
+        lines.append(f"_values = {{{input_values}}}")
+        lines.append(f"{instruction_name}.run(_values)")
+        lines.extend(f"{_var(slot)} = _values[{slot}]" for slot in instruction.iter_output_slots())
+        return lines
+    function_name = namespace.bind(instruction.function, "f")
+    args = ", ".join(
+        f"{arg_name}={_gather_expr(connector, namespace)}" for arg_name, connector in instruction.inputs.items()
+    )
+    call_expr = f"{function_name}({args})"
+    if instruction.output_is_scalar:
+        (connector,) = instruction.outputs
+        if isinstance(connector, ScalarSlotConnector):
+            lines.append(f"{_var(connector.slot)} = {call_expr}")
+        else:
+            lines.append(f"_output = {call_expr}")
+            lines.extend(_scatter_lines(connector, "_output", namespace))
+        return lines
+    output_vars = [f"_output{i}" for i in range(len(instruction.outputs))]
+    lines.append(f"({', '.join(output_vars)},) = {call_expr}")
+    for output_var, connector in zip(output_vars, instruction.outputs, strict=True):
+        lines.extend(_scatter_lines(connector, output_var, namespace))
+    return lines
+
+
+def _load_generated_executor(reference: str) -> "GeneratedExecutor":
+    try:
+        return _REGISTRY[reference]
+    except KeyError:
+        msg = (
+            "The generated executor is not available in this process. "
+            "Generated executors can only be shared with processes forked after they were created."
+        )
+        raise RuntimeError(msg) from None
+
+
+@dataclass(eq=False)
+class GeneratedExecutor:
+    """Executor that runs a plan as generated straight-line Python code.
+
+    Use `ExecutionModel.compile(backend="codegen")` to get the (cached) executor of an execution model.
+    """
+
+    plan: ExecutionPlan
+    source: str = field(init=False, repr=False)
+    reference: str = field(init=False, default_factory=lambda: uuid.uuid4().hex)
+    _function: Callable[[list[Any]], list[Any]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.source, namespace = generate_source(self.plan)
+        code = compile(self.source, f"<pdag-codegen-{self.reference}>", "exec")
+        exec(code, namespace)  # noqa: S102
+        self._function = namespace[_FUNCTION_NAME]
+        _REGISTRY[self.reference] = self
+
+    def __reduce__(self) -> tuple[Callable[[str], "GeneratedExecutor"], tuple[str]]:
+        return _load_generated_executor, (self.reference,)
+
+    def execute(
+        self,
+        inputs: Inputs,
+        *,
+        profile: "Profile | None" = None,
+        state: ExecutionState | None = None,
+        stop_step: int | None = None,
+    ) -> ResultsView:
+        """Execute the generated code for a single case.
+
+        If `profile`, `state` or `stop_step` is given, the plan is interpreted instead,
+        so that each relationship call can be recorded or the execution can be paused and resumed.
+        """
+        if profile is not None or state is not None or stop_step is not None:
+            return self.plan.execute(inputs, profile=profile, state=state, stop_step=stop_step)
+        values = self._function(self.plan.initial_values(inputs))
+        return ResultsView(self.plan.parameter_ids, self.plan.slots, values, self.plan.columns)
+
+    def checkpoint(self, results: MappingABC[ParameterId, Any], time_step: int) -> ExecutionState:
+        """Create the state to resume from `time_step` out of the results of an execution stopped there."""
+        return self.plan.checkpoint(results, time_step)
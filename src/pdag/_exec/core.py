@@ -1,131 +1,93 @@
-from collections import deque
-from collections.abc import Mapping
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, Literal, overload
 
-import numpy as np
+from .model import BackendType, ExecutionModel, InputId, Inputs, ParameterId
+from .plan import ExecutionState
+from .profile import Profile
+from .rolled import RolledExecutionModel
 
-from .model import (
-    ArrayConnector,
-    ExecInfoType,
-    ExecutionModel,
-    MappingConnector,
-    MappingListConnector,
-    ParameterId,
-    RelationshipId,
-    ScalarConnector,
-    StaticParameterId,
-    StaticRelationshipId,
-    TimeSeriesParameterId,
-    TimeSeriesRelationshipId,
-)
 
+@overload
+def execute_exec_model(
+    exec_model: ExecutionModel | RolledExecutionModel,
+    inputs: Inputs,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    free_intermediates: bool = False,
+    profile: Profile | None = None,
+    columnar: Literal[False] = False,
+    state: ExecutionState | None = None,
+    stop_step: int | None = None,
+) -> dict[ParameterId, Any]: ...
+@overload
+def execute_exec_model(
+    exec_model: ExecutionModel | RolledExecutionModel,
+    inputs: Inputs,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    free_intermediates: bool = False,
+    profile: Profile | None = None,
+    columnar: Literal[True],
+    state: ExecutionState | None = None,
+    stop_step: int | None = None,
+) -> dict[InputId, Any]: ...
 
-def _get_exec_info_value(
-    exec_model: ExecutionModel,
-    exec_info_type: ExecInfoType,
-    relationship_id: RelationshipId,
-) -> Any:
-    match exec_info_type:
-        case ExecInfoType.N_TIME_STEPS:
-            return exec_model.n_time_steps
-        case ExecInfoType.TIME:
-            if isinstance(relationship_id, TimeSeriesRelationshipId):
-                return relationship_id.time_step
-            msg = f"Node {relationship_id} is not a TimeSeriesRelationshipId"
-            raise ValueError(msg)
 
+def execute_exec_model(  # noqa: PLR0913
+    exec_model: ExecutionModel | RolledExecutionModel,
+    inputs: Inputs,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    free_intermediates: bool = False,
+    profile: Profile | None = None,
+    columnar: bool = False,
+    state: ExecutionState | None = None,
+    stop_step: int | None = None,
+) -> dict[ParameterId, Any] | dict[InputId, Any]:
+    """Execute the model for a single case.
 
-def execute_exec_model(  # noqa: C901, PLR0912, PLR0915
-    exec_model: ExecutionModel,
-    inputs: Mapping[ParameterId, Any],
-) -> dict[ParameterId, Any]:
-    # TODO: Exec only part of the model (in which case you need to sort the nodes again?)
-    sorted_nodes_queue = deque(exec_model.topologically_sorted_node_ids)
-    results: dict[ParameterId, Any] = {}
-    while sorted_nodes_queue:
-        node_id = sorted_nodes_queue.popleft()
+    If `outputs` is given, only the relationships needed to compute those parameters are executed,
+    and the results only contain the inputs and the parameters computed on the way.
+    If `free_intermediates` is `True`, each intermediate value is dropped as soon as no remaining relationship uses it,
+    and the results only contain the inputs and `outputs` (or, if not given, the parameters no relationship uses).
+    Rolled execution models only support the interpreter backend without `outputs` or `free_intermediates`.
+    If `profile` is given, the calls of the relationships are recorded in it.
 
-        if node_id in results:
-            continue
+    The values of a time-series parameter at all time steps can be given as a single array keyed by its
+    [`TimeSeriesArrayId`][pdag.TimeSeriesArrayId], leaving out the time steps at which the parameter is not
+    in the model, e.g., the last one for an input only used to compute the next value of another parameter.
+    If `columnar` is `True`, the results are returned in the same way,
+    with each time-series parameter packed into an array whose dtype comes from the parameter type
+    (see [`TimeSeriesColumn`][pdag.TimeSeriesColumn]).
 
-        if isinstance(node_id, StaticParameterId | TimeSeriesParameterId):
-            if node_id in inputs:
-                results[node_id] = inputs[node_id]
-                continue
-            if node_id in exec_model.port_mapping_inverse:
-                parent_node_id = exec_model.port_mapping_inverse[node_id]
-                if parent_node_id in inputs:
-                    results[node_id] = inputs[parent_node_id]
-                    continue
-                if parent_node_id in results:
-                    results[node_id] = results[parent_node_id]
-                    continue
-                msg = f"Parent node {parent_node_id} not in results"
-                raise ValueError(msg)
-            msg = f"Node {node_id} not in inputs or port_mapping"
-            raise ValueError(msg)
+    If `state` is given, the execution resumes from the state created by
+    [`checkpoint_exec_model`][pdag.checkpoint_exec_model], so only the remaining time steps are run,
+    and `inputs` only needs the values that are not in the state, e.g., the inputs of the remaining time steps.
+    If `stop_step` is given, the execution stops before that time step, skipping the static relationships
+    run after the time steps. Both are not supported with a stop condition or `free_intermediates`.
+    """
+    executor = exec_model.compile(backend, outputs=outputs, free_intermediates=free_intermediates)
+    results = executor.execute(inputs, profile=profile, state=state, stop_step=stop_step)
+    return results.to_columns() if columnar else results.to_dict()
 
-        if isinstance(node_id, StaticRelationshipId | TimeSeriesRelationshipId):
-            relationship_info = exec_model.relationship_infos[node_id]
 
-            input_values: dict[str, Any] = {}
-            for input_arg_name, connector_or_exec_info in relationship_info.input_parameter_info.items():
-                if isinstance(connector_or_exec_info, ExecInfoType):
-                    input_values[input_arg_name] = _get_exec_info_value(
-                        exec_model,
-                        connector_or_exec_info,
-                        node_id,
-                    )
-                    continue
-                if isinstance(connector_or_exec_info, ScalarConnector):
-                    input_values[input_arg_name] = results[connector_or_exec_info.parameter_id]
-                    continue
-                if isinstance(connector_or_exec_info, MappingConnector):
-                    input_values[input_arg_name] = {
-                        key: results[param_id] for key, param_id in connector_or_exec_info.parameter_ids.items()
-                    }
-                    continue
-                if isinstance(connector_or_exec_info, MappingListConnector):
-                    input_values[input_arg_name] = [
-                        {key: results[param_id] for key, param_id in mapping.items()}
-                        for mapping in connector_or_exec_info.parameter_ids
-                    ]
-                    continue
-                if isinstance(connector_or_exec_info, ArrayConnector):
-                    value_array = np.empty(connector_or_exec_info.parameter_ids.shape, dtype=object)
-                    for index, param_id in np.ndenumerate(connector_or_exec_info.parameter_ids):
-                        value_array[index] = results[param_id]
-                    input_values[input_arg_name] = value_array.tolist()
-                    continue
-                msg = f"Connector type {type(connector_or_exec_info)} is not supported."
-                raise TypeError(msg)
+def checkpoint_exec_model(
+    exec_model: ExecutionModel | RolledExecutionModel,
+    inputs: Inputs,
+    *,
+    time_step: int,
+    state: ExecutionState | None = None,
+) -> ExecutionState:
+    """Execute the model until `time_step` and return the state to resume the execution from.
 
-            output_values = relationship_info.function_relationship(**input_values)
-
-            if relationship_info.function_relationship.output_is_scalar:
-                output_values = (output_values,)
-            for connector, output_value in zip(
-                relationship_info.output_parameter_info,
-                output_values,
-                strict=True,
-            ):
-                if isinstance(connector, ScalarConnector):
-                    results[connector.parameter_id] = output_value
-                    continue
-                if isinstance(connector, MappingConnector):
-                    for key, param_id in connector.parameter_ids.items():
-                        results[param_id] = output_value[key]
-                    continue
-                if isinstance(connector, MappingListConnector):
-                    for mapping, output_value_item in zip(connector.parameter_ids, output_value, strict=True):
-                        for key, param_id in mapping.items():
-                            results[param_id] = output_value_item[key]
-                    continue
-                if isinstance(connector, ArrayConnector):
-                    for index, param_id in np.ndenumerate(connector.parameter_ids):
-                        results[param_id] = np.asarray(output_value, dtype=object)[index]
-                    continue
-                msg = f"Connector type {type(connector)} is not supported."
-                raise TypeError(msg)
-
-    return results
+    The state holds the values needed to run the time steps from `time_step` on, so passing it to
+    [`execute_exec_model`][pdag.execute_exec_model] runs the remaining time steps without re-running
+    the earlier ones. A state can be resumed many times, e.g., to branch into variants with different inputs.
+    If `state` is given, the execution resumes from that earlier state.
+    """
+    executor = exec_model.compile()
+    results = executor.execute(inputs, state=state, stop_step=time_step)
+    return executor.checkpoint(results, time_step)
@@ -0,0 +1,68 @@
+import time
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any
+
+from .model import ParameterId, RelationshipId
+
+
+class ExecutionHooks:
+    """Callbacks invoked during the execution of a model.
+
+    Subclass it and override the callbacks of interest, then register an instance with
+    [`ExecutionModel.add_hooks`][pdag.ExecutionModel.add_hooks].
+    The relationship callbacks are compiled into the plan, so models without hooks run without any overhead.
+    The case callbacks are invoked by the experiment runners.
+    """
+
+    def before_relationship(self, relationship_id: RelationshipId, inputs: Mapping[str, Any]) -> None:
+        """Handle the call of a relationship with the keyword arguments `inputs`, before it runs."""
+
+    def after_relationship(
+        self,
+        relationship_id: RelationshipId,
+        inputs: Mapping[str, Any],
+        outputs: Any,
+        elapsed: float,
+    ) -> None:
+        """Handle the return of `outputs` by a relationship. `elapsed` is the wall time of the call in seconds."""
+
+    def case_start(self, case_index: int, inputs: Mapping[ParameterId, Any]) -> None:
+        """Handle the start of a case run by an experiment runner."""
+
+    def case_end(self, case_index: int, results: Mapping[ParameterId, Any]) -> None:
+        """Handle the end of a case run by an experiment runner."""
+
+
+def wrap_with_hooks(
+    function: Callable[..., Any],
+    relationship_id: RelationshipId,
+    hooks: Sequence[ExecutionHooks],
+    *,
+    is_async: bool = False,
+) -> Callable[..., Any]:
+    """Return a function that invokes the relationship callbacks of `hooks` around `function`."""
+    if is_async:
+
+        async def hooked_async_function(**kwargs: Any) -> Any:
+            for hook in hooks:
+                hook.before_relationship(relationship_id, kwargs)
+            start = time.perf_counter()
+            outputs = await function(**kwargs)
+            elapsed = time.perf_counter() - start
+            for hook in hooks:
+                hook.after_relationship(relationship_id, kwargs, outputs, elapsed)
+            return outputs
+
+        return hooked_async_function
+
+    def hooked_function(**kwargs: Any) -> Any:
+        for hook in hooks:
+            hook.before_relationship(relationship_id, kwargs)
+        start = time.perf_counter()
+        outputs = function(**kwargs)
+        elapsed = time.perf_counter() - start
+        for hook in hooks:
+            hook.after_relationship(relationship_id, kwargs, outputs, elapsed)
+        return outputs
+
+    return hooked_function
@@ -0,0 +1,102 @@
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .model import RNG_ID, ExecutionModel, ParameterId, RelationshipId
+from .plan import MISSING, CallInstruction, ExecutionPlan, Instruction, ResultsView
+
+
+@dataclass(frozen=True, slots=True)
+class IncrementalResults:
+    """Results of an incremental execution."""
+
+    results: dict[ParameterId, Any]
+    recomputed_relationship_ids: list[RelationshipId]
+
+
+def _apply_changed_inputs(
+    exec_model: ExecutionModel,
+    plan: ExecutionPlan,
+    values: list[Any],
+    changed_inputs: Mapping[ParameterId, Any],
+) -> set[int]:
+    changed_slots: set[int] = set()
+    for parameter_id, value in changed_inputs.items():
+        if parameter_id not in plan.slots:
+            msg = f"Parameter {parameter_id} is not in the model."
+            raise ValueError(msg)
+        if parameter_id in exec_model.output_parameter_id_to_relationship_ids:
+            msg = f"Parameter {parameter_id} is computed by a relationship and cannot be changed."
+            raise ValueError(msg)
+        if parameter_id in exec_model.fixed_values:
+            msg = f"Parameter {parameter_id} is fixed in the specialized model and cannot be changed."
+            raise ValueError(msg)
+        values[plan.slots[parameter_id]] = value
+        changed_slots.add(plan.slots[parameter_id])
+    return changed_slots
+
+
+def _clear_recomputed_values(
+    plan: ExecutionPlan,
+    values: list[Any],
+    instructions: list[Instruction],
+    changed_slots: set[int],
+) -> None:
+    # Values to recompute are cleared, so that port mappings are followed again
+    # and the accumulators of fold relationships start from their initial values
+    written_slots: set[int] = set()
+    for instruction in instructions:
+        written_slots.update(instruction.iter_output_slots())
+    written_slots -= changed_slots
+    for slot in written_slots:
+        values[slot] = MISSING if plan.preset_values is None else plan.preset_values[slot]
+    for instruction in instructions:
+        for slot in instruction.iter_input_slots():
+            if slot not in written_slots and values[slot] is MISSING:
+                msg = f"Parameter {plan.parameter_ids[slot]} is not in the previous results."
+                raise ValueError(msg)
+
+
+def execute_exec_model_incremental(
+    exec_model: ExecutionModel,
+    previous_results: Mapping[ParameterId, Any],
+    changed_inputs: Mapping[ParameterId, Any],
+) -> IncrementalResults:
+    """Re-execute the model after some inputs changed, starting from the results of a previous execution.
+
+    Only the relationships downstream of the changed inputs are executed again;
+    every other value is taken from `previous_results`.
+    Parameters mapped from a parent model are recomputed from their source,
+    so an input that overrides such a parameter must be passed again in `changed_inputs`.
+    If the model uses `ExecInfo("rng")`, the generator in `previous_results` has been advanced by the previous
+    execution, so a generator in the state it had before that execution must be given as `RNG_ID` in
+    `changed_inputs`. All the relationships that draw from it are then executed again in the same order.
+    """
+    plan = exec_model.compile()
+    if plan.stop is not None:
+        msg = "Models with a stop condition are not supported by incremental execution."
+        raise ValueError(msg)
+    if exec_model.uses_rng and RNG_ID not in changed_inputs:
+        msg = (
+            "The model uses a random number generator, so the generator in the state before the previous execution "
+            "must be given as RNG_ID in changed_inputs."
+        )
+        raise ValueError(msg)
+    values: list[Any] = [MISSING] * len(plan.parameter_ids)
+    for parameter_id, value in previous_results.items():
+        slot = plan.slots.get(parameter_id)
+        if slot is not None:
+            values[slot] = value
+
+    changed_slots = _apply_changed_inputs(exec_model, plan, values, changed_inputs)
+    instructions = [plan.instructions[index] for index in plan.downstream(changed_slots)]
+    _clear_recomputed_values(plan, values, instructions, changed_slots)
+    for instruction in instructions:
+        instruction.run(values)
+
+    return IncrementalResults(
+        results=ResultsView(plan.parameter_ids, plan.slots, values).to_dict(),
+        recomputed_relationship_ids=[
+            instruction.relationship_id for instruction in instructions if isinstance(instruction, CallInstruction)
+        ],
+    )
@@ -1,10 +1,12 @@
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from collections.abc import Hashable, Iterable
+from collections.abc import Hashable, Iterable, Mapping
+from collections.abc import Set as AbstractSet
 from dataclasses import dataclass, field
 from enum import StrEnum
-from typing import Annotated, Any, Self, cast
+from typing import TYPE_CHECKING, Annotated, Any, Final, Literal, Protocol, Self, cast, overload
 
+import numpy as np
 import numpy.typing as npt
 from typing_extensions import Doc
 
@@ -15,6 +17,11 @@ from pdag._utils import topological_sort
 
 from .utils import parameter_id_to_parameter
 
+if TYPE_CHECKING:
+    from .codegen import GeneratedExecutor
+    from .hooks import ExecutionHooks
+    from .plan import ExecutionPlan
+
 _model_path_doc = """\
 Path to the model. The root model is represented by an empty tuple.
 
@@ -79,6 +86,17 @@ class TimeSeriesParameterId(ParameterIdMixin):
     time_step: int
 
 
+@dataclass(frozen=True, slots=True)
+class TimeSeriesArrayId(ParameterIdMixin):
+    """ID of the values of a time-series parameter at all time steps, passed and returned as a single array."""
+
+    model_path: ModelPathType
+    name: str
+
+    def at(self, time_step: int) -> TimeSeriesParameterId:
+        return TimeSeriesParameterId(self.model_path, self.name, time_step)
+
+
 @dataclass(frozen=True, slots=True)
 class StaticRelationshipId(NodeIdMixin):
     model_path: ModelPathType
@@ -95,6 +113,7 @@ class TimeSeriesRelationshipId(NodeIdMixin):
 class ExecInfoType(StrEnum):
     N_TIME_STEPS = "n_time_steps"
     TIME = "time"
+    RNG = "rng"
 
     @classmethod
     def from_exec_info(cls, exec_info: ExecInfo) -> Self:
@@ -102,11 +121,26 @@ class ExecInfoType(StrEnum):
 
 
 # Type aliases
+type BackendType = Literal["interpreter", "codegen"]
 type ParameterId = StaticParameterId | TimeSeriesParameterId
+type InputId = ParameterId | TimeSeriesArrayId
 type FunctionRelationshipInputId = ExecInfoType | ParameterId | dict[Hashable, ParameterId]
 type RelationshipId = StaticRelationshipId | TimeSeriesRelationshipId
 type NodeId = ParameterId | RelationshipId
 
+# Input that holds the random number generator of a case, which is passed to the `ExecInfo("rng")` arguments.
+# It is only an input of the plans of the models that use it, and it is not a parameter of the models.
+RNG_ID: Final = StaticParameterId(model_path=(), name="<rng>")
+
+
+class Inputs(Protocol):
+    """Input values keyed by parameter ID, or by time-series array ID for the values at all time steps.
+
+    Any mapping whose keys are a subset of these IDs, e.g., `dict[StaticParameterId, float]`, is accepted.
+    """
+
+    def items(self) -> AbstractSet[tuple[InputId, Any]]: ...
+
 
 @dataclass(slots=True)
 class ConnectorABC(ABC):
@@ -143,6 +177,9 @@ class MappingListConnector(ConnectorABC):
 @dataclass(slots=True)
 class ArrayConnector(ConnectorABC):
     parameter_ids: npt.NDArray[ParameterId]  # type: ignore[type-var]
+    # NumPy dtype of the array of the parameter values passed to and returned from relationships,
+    # or None to pass them as (nested) lists
+    dtype: np.dtype[Any] | None = None
 
     def iter_parameter_ids(self) -> Iterable[ParameterId]:
         yield from self.parameter_ids.flat
@@ -154,6 +191,10 @@ class FunctionRelationshipInfo:
     input_parameter_info: dict[str, ConnectorABC | ExecInfoType]
     output_parameter_info: tuple[ConnectorABC, ...]
 
+    @property
+    def uses_rng(self) -> bool:
+        return any(input_info is ExecInfoType.RNG for input_info in self.input_parameter_info.values())
+
 
 @dataclass(slots=True)
 class ExecutionModel:
@@ -168,6 +209,11 @@ class ExecutionModel:
     _core_model: CoreModel = field(repr=False, compare=False, kw_only=True)
 
     n_time_steps: int | None = None
+    # Values of the parameters bound by `specialize` and of the initial accumulators of fold relationships,
+    # which are neither inputs nor computed by the relationships
+    fixed_values: dict[ParameterId, Any] = field(default_factory=dict, kw_only=True)
+    # Hidden accumulators of fold relationships at each time step to their outputs, which share their slots
+    accumulator_ids: dict[ParameterId, ParameterId] = field(default_factory=dict, kw_only=True)
 
     # Derived attributes
     relationship_id_to_input_parameter_ids: dict[RelationshipId, set[ParameterId]] = field(
@@ -183,6 +229,13 @@ class ExecutionModel:
     port_mapping_inverse: dict[ParameterId, ParameterId] = field(init=False, repr=False, compare=False)
 
     _topologically_sorted_node_ids: list[NodeId] = field(init=False, repr=False, compare=False)
+    _compiled: dict[tuple[BackendType, frozenset[ParameterId] | None, bool], Any] = field(
+        init=False,
+        default_factory=dict,
+        repr=False,
+        compare=False,
+    )
+    hooks: list["ExecutionHooks"] = field(init=False, default_factory=list, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         relationship_id_to_input_parameter_ids_dd: defaultdict[RelationshipId, set[ParameterId]] = defaultdict(
@@ -215,14 +268,33 @@ class ExecutionModel:
         # Sort nodes topologically
         self._topologically_sorted_node_ids = topological_sort(dependencies)
 
+    def add_hooks(self, hooks: "ExecutionHooks") -> None:
+        """Register hooks that are invoked when the relationships are called.
+
+        The compiled executors are discarded, so the hooks are compiled into the next plan.
+        """
+        self.hooks.append(hooks)
+        self._compiled.clear()
+
+    def remove_hooks(self, hooks: "ExecutionHooks") -> None:
+        """Unregister hooks registered with [`add_hooks`][pdag.ExecutionModel.add_hooks]."""
+        self.hooks.remove(hooks)
+        self._compiled.clear()
+
     def input_parameter_ids(self) -> set[ParameterId]:
         return {
             parameter_id
             for parameter_id in self.parameter_ids
             if parameter_id not in self.output_parameter_id_to_relationship_ids
             and parameter_id not in self.port_mapping_inverse
+            and parameter_id not in self.fixed_values
         }
 
+    @property
+    def uses_rng(self) -> bool:
+        """Whether a relationship draws random numbers from the generator given as the input `RNG_ID`."""
+        return any(relationship_info.uses_rng for relationship_info in self.relationship_infos.values())
+
     def input_parameters(self) -> dict[ParameterId, ParameterABC[Any]]:
         return {
             parameter_id: parameter_id_to_parameter(parameter_id, root_model=self._core_model)
@@ -238,3 +310,176 @@ class ExecutionModel:
     @property
     def topologically_sorted_node_ids(self) -> list[NodeId]:
         return self._topologically_sorted_node_ids
+
+    @overload
+    def compile(
+        self,
+        backend: Literal["interpreter"] = "interpreter",
+        *,
+        outputs: Iterable[ParameterId] | None = None,
+        free_intermediates: bool = False,
+    ) -> "ExecutionPlan": ...
+    @overload
+    def compile(
+        self,
+        backend: Literal["codegen"],
+        *,
+        outputs: Iterable[ParameterId] | None = None,
+        free_intermediates: bool = False,
+    ) -> "GeneratedExecutor": ...
+    @overload
+    def compile(
+        self,
+        backend: BackendType,
+        *,
+        outputs: Iterable[ParameterId] | None = None,
+        free_intermediates: bool = False,
+    ) -> "ExecutionPlan | GeneratedExecutor": ...
+
+    def compile(
+        self,
+        backend: BackendType = "interpreter",
+        *,
+        outputs: Iterable[ParameterId] | None = None,
+        free_intermediates: bool = False,
+    ) -> "ExecutionPlan | GeneratedExecutor":
+        """Compile the model into an executor.
+
+        With the `"interpreter"` backend, the model is compiled into an execution plan,
+        i.e., a list of instructions over integer parameter slots.
+        With the `"codegen"` backend, the plan is further turned into generated straight-line Python code.
+
+        If `outputs` is given, the executor only runs the relationships needed to compute those parameters.
+        If `free_intermediates` is `True`, the executor drops each intermediate value after its last use,
+        so the results only contain the inputs and `outputs` (or, if not given, the parameters no relationship uses).
+
+        The executor is created on the first call and cached on the model for each backend and set of outputs,
+        so the model should not be mutated afterwards.
+        """
+        outputs_key = frozenset(outputs) if outputs is not None else None
+        key = (backend, outputs_key, free_intermediates)
+        if key not in self._compiled:
+            match backend:
+                case "interpreter" if free_intermediates:
+                    self._compiled[key] = self.compile("interpreter", outputs=outputs_key).free_dead_values(outputs_key)
+                case "interpreter" if outputs_key is not None:
+                    self._compiled[key] = self.compile("interpreter").prune(outputs_key)
+                case "interpreter":
+                    from .plan import compile_exec_model  # noqa: PLC0415
+
+                    self._compiled[key] = compile_exec_model(self)
+                case "codegen":
+                    from .codegen import GeneratedExecutor  # noqa: PLC0415
+
+                    self._compiled[key] = GeneratedExecutor(
+                        self.compile("interpreter", outputs=outputs_key, free_intermediates=free_intermediates),
+                    )
+                case _:
+                    msg = f"Invalid backend: {backend}"
+                    raise ValueError(msg)
+        return cast("ExecutionPlan | GeneratedExecutor", self._compiled[key])
+
+    def specialize(self, fixed_inputs: Mapping[ParameterId, Any]) -> "ExecutionModel":
+        """Create a model with the values of `fixed_inputs` bound.
+
+        The relationships that only depend on the fixed inputs are executed once here and folded into constants,
+        so the created model neither runs them nor has the fixed inputs and their outputs as inputs.
+        The results of the created model still contain the values of those parameters.
+        """
+        input_parameter_ids = self.input_parameter_ids()
+        for parameter_id in fixed_inputs:
+            if parameter_id not in input_parameter_ids:
+                msg = f"Parameter {parameter_id} is not an input of the model."
+                raise ValueError(msg)
+
+        # The steps of a fold relationship update the same accumulator, so they are folded all or none
+        fold_keys = {
+            relationship_id: _fold_relationship_key(relationship_id, relationship_info)
+            for relationship_id, relationship_info in self.relationship_infos.items()
+        }
+        # The random numbers are drawn from the generator of each case
+        unfoldable_relationship_ids = {
+            relationship_id
+            for relationship_id, relationship_info in self.relationship_infos.items()
+            if relationship_info.uses_rng
+        }
+        while True:
+            fixed_parameter_ids, folded_relationship_ids = self._fixed_parameters_and_relationships(
+                fixed_inputs,
+                unfoldable_relationship_ids,
+            )
+            partially_folded_keys = (
+                {fold_keys[relationship_id] for relationship_id in folded_relationship_ids}
+                & {key for relationship_id, key in fold_keys.items() if relationship_id not in folded_relationship_ids}
+            ) - {None}
+            if not partially_folded_keys:
+                break
+            unfoldable_relationship_ids.update(
+                relationship_id for relationship_id, key in fold_keys.items() if key in partially_folded_keys
+            )
+
+        plan = self.compile().hoist(fixed_inputs)
+        assert plan.preset_values is not None
+        fixed_values = {
+            parameter_id: plan.preset_values[plan.slots[parameter_id]]
+            for parameter_id in fixed_parameter_ids
+            if parameter_id in plan.slots
+        }
+        specialized = ExecutionModel(
+            parameter_ids=self.parameter_ids,
+            relationship_infos={
+                relationship_id: relationship_info
+                for relationship_id, relationship_info in self.relationship_infos.items()
+                if relationship_id not in folded_relationship_ids
+            },
+            # The fixed parameters are kept as nodes, so that the results contain their values
+            input_parameter_id_to_relationship_ids={parameter_id: set() for parameter_id in fixed_values}
+            | {
+                parameter_id: relationship_ids - folded_relationship_ids
+                for parameter_id, relationship_ids in self.input_parameter_id_to_relationship_ids.items()
+            },
+            relationship_id_to_output_parameter_ids={
+                relationship_id: output_parameter_ids
+                for relationship_id, output_parameter_ids in self.relationship_id_to_output_parameter_ids.items()
+                if relationship_id not in folded_relationship_ids
+            },
+            port_mapping={
+                source: target for source, target in self.port_mapping.items() if target not in fixed_parameter_ids
+            },
+            n_time_steps=self.n_time_steps,
+            _core_model=self._core_model,
+            fixed_values=fixed_values,
+            accumulator_ids=self.accumulator_ids,
+        )
+        specialized.hooks.extend(self.hooks)
+        return specialized
+
+    def _fixed_parameters_and_relationships(
+        self,
+        fixed_inputs: Mapping[ParameterId, Any],
+        unfoldable_relationship_ids: set[RelationshipId],
+    ) -> tuple[set[ParameterId], set[RelationshipId]]:
+        """Find the parameters whose values and the relationships whose results only depend on `fixed_inputs`."""
+        fixed_parameter_ids = set(self.fixed_values) | set(fixed_inputs)
+        folded_relationship_ids: set[RelationshipId] = set()
+        for node_id in self.topologically_sorted_node_ids:
+            if isinstance(node_id, StaticRelationshipId | TimeSeriesRelationshipId):
+                if (
+                    node_id not in unfoldable_relationship_ids
+                    and self.relationship_id_to_input_parameter_ids.get(node_id, set()) <= fixed_parameter_ids
+                ):
+                    folded_relationship_ids.add(node_id)
+                    fixed_parameter_ids.update(self.relationship_id_to_output_parameter_ids.get(node_id, ()))
+            elif self.port_mapping_inverse.get(node_id) in fixed_parameter_ids:
+                fixed_parameter_ids.add(node_id)
+        return fixed_parameter_ids, folded_relationship_ids
+
+
+def _fold_relationship_key(
+    relationship_id: RelationshipId,
+    relationship_info: FunctionRelationshipInfo,
+) -> tuple[ModelPathType, str] | None:
+    """Identify the fold relationship that a relationship is a step of, or return `None` for other relationships."""
+    if not relationship_info.function_relationship.fold:
+        return None
+    return relationship_id.model_path, relationship_id.name
@@ -0,0 +1,108 @@
+import multiprocessing
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal
+
+from .model import RNG_ID, ExecutionModel, Inputs, ParameterId
+from .plan import CallInstruction, ExecutionPlan, ResultsView
+
+type PoolType = Literal["thread", "process"]
+
+# The plan executed by the worker processes. It is set before the workers are forked.
+_worker_plan: ExecutionPlan | None = None
+
+
+def _init_worker(plan: ExecutionPlan) -> None:
+    global _worker_plan  # noqa: PLW0603
+    _worker_plan = plan
+
+
+def _run_in_worker(index: int, input_values: dict[int, Any]) -> dict[int, Any]:
+    assert _worker_plan is not None
+    instruction = _worker_plan.instructions[index]
+    # A dict keyed by slot is enough for the instruction to read its inputs and write its outputs
+    instruction.run(input_values)
+    return {slot: input_values[slot] for slot in instruction.iter_output_slots()}
+
+
+def _create_pool(plan: ExecutionPlan, pool: PoolType, max_workers: int | None) -> Executor:
+    match pool:
+        case "thread":
+            return ThreadPoolExecutor(max_workers=max_workers)
+        case "process":
+            # Relationships are generally not picklable, so the workers are forked with the plan
+            return ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(plan,),
+            )
+        case _:
+            msg = f"Unknown pool type: {pool}"
+            raise ValueError(msg)
+
+
+def _run_calls_in_threads(executor: Executor, plan: ExecutionPlan, calls: list[int], values: list[Any]) -> None:
+    # Instructions of a level write to distinct slots, so they can share the values
+    futures = [executor.submit(plan.instructions[index].run, values) for index in calls]
+    for future in futures:
+        future.result()
+
+
+def _run_calls_in_processes(executor: Executor, plan: ExecutionPlan, calls: list[int], values: list[Any]) -> None:
+    # A worker would draw from its own copy of the generator, so the relationships that use it are run in this process
+    rng_slot = plan.slots.get(RNG_ID)
+    local_calls = [index for index in calls if rng_slot in set(plan.instructions[index].iter_input_slots())]
+    futures = [
+        executor.submit(
+            _run_in_worker,
+            index,
+            {slot: values[slot] for slot in plan.instructions[index].iter_input_slots()},
+        )
+        for index in calls
+        if index not in local_calls
+    ]
+    for index in local_calls:
+        plan.instructions[index].run(values)
+    for future in futures:
+        for slot, value in future.result().items():
+            values[slot] = value
+
+
+def execute_exec_model_parallel(
+    exec_model: ExecutionModel,
+    inputs: Inputs,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    pool: PoolType = "thread",
+    max_workers: int | None = None,
+) -> dict[ParameterId, Any]:
+    """Execute the model for a single case, running independent relationships concurrently.
+
+    The relationships are grouped into topological levels and the relationships of each level are run
+    on a pool of `max_workers` workers.
+    A thread pool (`pool="thread"`) helps when the relationships release the GIL, e.g. in NumPy.
+    A process pool (`pool="process"`) forks its workers, so it is only available on platforms that support `fork`;
+    the argument and return values of the relationships must be picklable.
+    The relationships that draw from the generator given as `RNG_ID` are run one at a time in the order of
+    sequential execution, and in the main process with a process pool, so they draw the same random numbers.
+    """
+    plan = exec_model.compile(outputs=outputs)
+    if plan.stop is not None:
+        msg = "Models with a stop condition are not supported by parallel execution."
+        raise ValueError(msg)
+    values = plan.initial_values(inputs)
+    with _create_pool(plan, pool, max_workers) as executor:
+        for level in plan.levels():
+            calls = [index for index in level if isinstance(plan.instructions[index], CallInstruction)]
+            for index in level:
+                if not isinstance(plan.instructions[index], CallInstruction):
+                    plan.instructions[index].run(values)
+            if len(calls) == 1:
+                plan.instructions[calls[0]].run(values)
+            elif pool == "thread":
+                _run_calls_in_threads(executor, plan, calls, values)
+            else:
+                _run_calls_in_processes(executor, plan, calls, values)
+
+    return ResultsView(plan.parameter_ids, plan.slots, values, plan.columns).to_dict()
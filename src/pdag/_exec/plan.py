@@ -0,0 +1,1273 @@
+import asyncio
+import copy
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from collections.abc import Mapping as MappingABC
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import accumulate
+from typing import TYPE_CHECKING, Any, Final, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from pdag._core import BooleanParameter, CategoricalParameter, CoreModel, ParameterRef, RealParameter, StopCondition
+from pdag._utils import topological_levels
+
+from .hooks import ExecutionHooks, wrap_with_hooks
+from .model import (
+    RNG_ID,
+    ArrayConnector,
+    ConnectorABC,
+    ExecInfoType,
+    ExecutionModel,
+    FunctionRelationshipInfo,
+    InputId,
+    Inputs,
+    MappingConnector,
+    MappingListConnector,
+    ModelPathType,
+    ParameterId,
+    RelationshipId,
+    ScalarConnector,
+    StaticParameterId,
+    StaticRelationshipId,
+    TimeSeriesArrayId,
+    TimeSeriesParameterId,
+    TimeSeriesRelationshipId,
+)
+from .to_exec_model import _iter_parameters_recursively
+
+if TYPE_CHECKING:
+    from .profile import Profile
+
+
+class _Missing:
+    """Marker for a slot whose value has not been set yet."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<MISSING>"
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Final = _Missing()
+
+
+class SlotValues(Protocol):
+    """Storage of parameter values indexed by slot, e.g., a list of values of a single case."""
+
+    def __getitem__(self, slot: int, /) -> Any: ...
+    def __setitem__(self, slot: int, value: Any, /) -> None: ...
+
+
+def as_column(values: Iterable[Any]) -> npt.NDArray[Any]:
+    """Convert values of a parameter across cases into a one-dimensional array.
+
+    Values of builtin scalar types are stored in an array of the corresponding NumPy dtype.
+    Any other values are stored as-is in an object array.
+    """
+    if isinstance(values, np.ndarray) and values.ndim == 1:
+        return values
+    values = list(values)
+    if all(isinstance(value, bool | int | float | str | np.generic) for value in values) and values:
+        return np.array(values)
+    column = np.empty(len(values), dtype=object)
+    for i, value in enumerate(values):
+        column[i] = value
+    return column
+
+
+def _as_batch_column(value: Any, n_cases: int) -> npt.NDArray[Any]:
+    column = np.asarray(value)
+    if column.ndim == 0:
+        return np.full(n_cases, value, dtype=column.dtype)
+    if column.shape[0] != n_cases:
+        msg = f"Expected a vectorized output with {n_cases} cases, but got shape {column.shape}."
+        raise ValueError(msg)
+    return column
+
+
+def _item(value: Any) -> Any:
+    """Convert a NumPy scalar into the corresponding builtin value."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _SingleCaseColumns:
+    """Columns of a single case backed by the slot values of that case.
+
+    It allows calling a vectorized relationship in the case-by-case executors.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: SlotValues) -> None:
+        self._values = values
+
+    def __getitem__(self, slot: int) -> npt.NDArray[Any]:
+        return as_column([self._values[slot]])
+
+    def __setitem__(self, slot: int, column: npt.NDArray[Any]) -> None:
+        self._values[slot] = _item(column[0])
+
+
+@dataclass(slots=True)
+class SlotConnectorABC(ABC):
+    """Connector between a relationship argument and the slots of the parameters it refers to."""
+
+    @abstractmethod
+    def gather(self, values: SlotValues) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def scatter(self, values: SlotValues, value: Any) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def gather_batch(self, columns: SlotValues) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def scatter_batch(self, columns: SlotValues, value: Any, n_cases: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_slots(self) -> Iterable[int]:
+        raise NotImplementedError
+
+
+@dataclass(slots=True)
+class ScalarSlotConnector(SlotConnectorABC):
+    slot: int
+
+    def gather(self, values: SlotValues) -> Any:
+        return values[self.slot]
+
+    def scatter(self, values: SlotValues, value: Any) -> None:
+        values[self.slot] = value
+
+    def gather_batch(self, columns: SlotValues) -> npt.NDArray[Any]:
+        return columns[self.slot]  # type: ignore[no-any-return]
+
+    def scatter_batch(self, columns: SlotValues, value: Any, n_cases: int) -> None:
+        columns[self.slot] = _as_batch_column(value, n_cases)
+
+    def iter_slots(self) -> Iterable[int]:
+        yield self.slot
+
+
+@dataclass(slots=True)
+class MappingSlotConnector(SlotConnectorABC):
+    slots: dict[Hashable, int]
+
+    def gather(self, values: SlotValues) -> dict[Hashable, Any]:
+        return {key: values[slot] for key, slot in self.slots.items()}
+
+    def scatter(self, values: SlotValues, value: Any) -> None:
+        for key, slot in self.slots.items():
+            values[slot] = value[key]
+
+    def gather_batch(self, columns: SlotValues) -> dict[Hashable, npt.NDArray[Any]]:
+        return {key: columns[slot] for key, slot in self.slots.items()}
+
+    def scatter_batch(self, columns: SlotValues, value: Any, n_cases: int) -> None:
+        for key, slot in self.slots.items():
+            columns[slot] = _as_batch_column(value[key], n_cases)
+
+    def iter_slots(self) -> Iterable[int]:
+        yield from self.slots.values()
+
+
+@dataclass(slots=True)
+class MappingListSlotConnector(SlotConnectorABC):
+    slots: list[dict[Hashable, int]]
+
+    def gather(self, values: SlotValues) -> list[dict[Hashable, Any]]:
+        return [{key: values[slot] for key, slot in mapping.items()} for mapping in self.slots]
+
+    def scatter(self, values: SlotValues, value: Any) -> None:
+        for mapping, value_item in zip(self.slots, value, strict=True):
+            for key, slot in mapping.items():
+                values[slot] = value_item[key]
+
+    def gather_batch(self, columns: SlotValues) -> list[dict[Hashable, npt.NDArray[Any]]]:
+        return [{key: columns[slot] for key, slot in mapping.items()} for mapping in self.slots]
+
+    def scatter_batch(self, columns: SlotValues, value: Any, n_cases: int) -> None:
+        for mapping, value_item in zip(self.slots, value, strict=True):
+            for key, slot in mapping.items():
+                columns[slot] = _as_batch_column(value_item[key], n_cases)
+
+    def iter_slots(self) -> Iterable[int]:
+        for mapping in self.slots:
+            yield from mapping.values()
+
+
+def _object_array(values: Sequence[Any]) -> npt.NDArray[np.object_]:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+@dataclass(slots=True)
+class ArraySlotConnector(SlotConnectorABC):
+    """Connector between an array argument and the slots of its elements.
+
+    The values are gathered through the flattened slots into (nested) lists, or into arrays of `dtype` if given,
+    and scattered back from any array-like value.
+    """
+
+    slots: npt.NDArray[np.intp]
+    dtype: np.dtype[Any] | None = None
+    _flat_slots: tuple[int, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._flat_slots = tuple(int(slot) for slot in self.slots.flat)
+
+    def to_argument(self, flat_values: Sequence[Any]) -> Any:
+        """Create the argument value from the values of the elements, given in the order of the flattened slots."""
+        if self.dtype is not None:
+            return self.to_array(flat_values)
+        if self.slots.ndim == 1:
+            return list(flat_values)
+        return _object_array(flat_values).reshape(self.slots.shape).tolist()
+
+    def to_array(self, flat_values: Sequence[Any]) -> npt.NDArray[Any]:
+        """Create the array of the values of the elements, given in the order of the flattened slots."""
+        # Values that do not fit the dtype, e.g., None, which NumPy would convert into NaN, are passed as objects
+        if self.dtype is None or self.dtype == object or None in flat_values:
+            return _object_array(flat_values).reshape(self.slots.shape)
+        try:
+            array = np.fromiter(flat_values, dtype=self.dtype, count=len(self._flat_slots))
+        except (TypeError, ValueError):
+            array = _object_array(flat_values)
+        return array.reshape(self.slots.shape)
+
+    def from_array(self, value: Any) -> list[Any]:
+        """Split an array-like value into the values of the elements, in the order of the flattened slots."""
+        array = np.asarray(value)
+        if array.shape != self.slots.shape:
+            # E.g., elements that are sequences themselves
+            array = np.asarray(value, dtype=object)
+            return [array[index] for index in np.ndindex(self.slots.shape)]
+        # `tolist` converts NumPy scalars into the corresponding builtin values
+        return array.reshape(-1).tolist()
+
+    def gather(self, values: SlotValues) -> Any:
+        return self.to_argument(tuple(values[slot] for slot in self._flat_slots))
+
+    def scatter(self, values: SlotValues, value: Any) -> None:
+        for slot, item in zip(self._flat_slots, self.from_array(value), strict=True):
+            values[slot] = item
+
+    def gather_batch(self, columns: SlotValues) -> npt.NDArray[Any]:
+        """Gather the columns into an array of shape `(n_cases, *shape)`."""
+        return np.stack([columns[slot] for slot in self._flat_slots], axis=1).reshape((-1, *self.slots.shape))
+
+    def scatter_batch(self, columns: SlotValues, value: Any, n_cases: int) -> None:
+        value_array = np.broadcast_to(value, (n_cases, *self.slots.shape))
+        for index, slot in zip(np.ndindex(self.slots.shape), self._flat_slots, strict=True):
+            columns[slot] = value_array[(slice(None), *index)]
+
+    def iter_slots(self) -> Iterable[int]:
+        yield from self._flat_slots
+
+
+@dataclass(slots=True)
+class ConstantInput:
+    """Relationship argument whose value is known when the plan is compiled, e.g., `ExecInfo` values."""
+
+    value: Any
+
+    def gather(self, values: SlotValues) -> Any:  # noqa: ARG002
+        return self.value
+
+    def gather_batch(self, columns: SlotValues) -> Any:  # noqa: ARG002
+        return self.value
+
+    def iter_slots(self) -> Iterable[int]:
+        yield from ()
+
+
+@dataclass(slots=True)
+class CopyInstruction:
+    """Copy the value of a parameter across a port mapping.
+
+    The target keeps its value if it has already been set, i.e., provided as an input.
+    """
+
+    source_slot: int
+    target_slot: int
+
+    def run(self, values: SlotValues) -> None:
+        if values[self.target_slot] is MISSING:
+            values[self.target_slot] = values[self.source_slot]
+
+    def iter_input_slots(self) -> Iterable[int]:
+        yield self.source_slot
+
+    def iter_output_slots(self) -> Iterable[int]:
+        yield self.target_slot
+
+
+@dataclass(slots=True)
+class CallInstruction:
+    """Gather the arguments of a function relationship, call it, and scatter its return values."""
+
+    relationship_id: RelationshipId
+    function: Callable[..., Any]
+    inputs: dict[str, SlotConnectorABC | ConstantInput]
+    outputs: tuple[SlotConnectorABC, ...]
+    output_is_scalar: bool
+    vectorized: bool = False
+    is_async: bool = False
+
+    _gatherers: tuple[tuple[str, Callable[[SlotValues], Any]], ...] = field(init=False, repr=False)
+    _scatterers: tuple[Callable[[SlotValues, Any], None], ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._gatherers = tuple((arg_name, connector.gather) for arg_name, connector in self.inputs.items())
+        self._scatterers = tuple(connector.scatter for connector in self.outputs)
+
+    def gather(self, values: SlotValues) -> dict[str, Any]:
+        return {arg_name: gather(values) for arg_name, gather in self._gatherers}
+
+    def scatter(self, values: SlotValues, output_values: Any) -> None:
+        if self.output_is_scalar:
+            output_values = (output_values,)
+        for scatter, output_value in zip(self._scatterers, output_values, strict=True):
+            scatter(values, output_value)
+
+    def run(self, values: SlotValues) -> None:
+        """Call the relationship on the values of a case.
+
+        An async relationship is run to completion in a new event loop, so it cannot be run while an event loop
+        is running (e.g., in Jupyter); use [`execute_exec_model_async`][pdag.execute_exec_model_async] there.
+        """
+        if self.vectorized:
+            self.run_batch(_SingleCaseColumns(values), n_cases=1)
+            return
+        if self.is_async:
+            _check_no_running_event_loop(self.relationship_id)
+            self.scatter(values, asyncio.run(self.function(**self.gather(values))))
+            return
+        self.scatter(values, self.function(**self.gather(values)))
+
+    async def run_async(self, values: SlotValues) -> None:
+        """Await the relationship, which must be a coroutine function."""
+        self.scatter(values, await self.function(**self.gather(values)))
+
+    def run_batch(self, columns: SlotValues, n_cases: int) -> None:
+        """Call the relationship once with the columns of all cases. The relationship must be vectorized."""
+        output_values = self.function(
+            **{arg_name: connector.gather_batch(columns) for arg_name, connector in self.inputs.items()},
+        )
+        if self.output_is_scalar:
+            output_values = (output_values,)
+        for connector, output_value in zip(self.outputs, output_values, strict=True):
+            connector.scatter_batch(columns, output_value, n_cases)
+
+    def iter_input_slots(self) -> Iterable[int]:
+        for connector in self.inputs.values():
+            yield from connector.iter_slots()
+
+    def iter_output_slots(self) -> Iterable[int]:
+        for connector in self.outputs:
+            yield from connector.iter_slots()
+
+
+def _check_no_running_event_loop(relationship_id: RelationshipId) -> None:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    msg = (
+        f"The async relationship {relationship_id} cannot be run by a synchronous executor "
+        "while an event loop is running. Use `pdag.execute_exec_model_async` instead."
+    )
+    raise RuntimeError(msg)
+
+
+type Instruction = CopyInstruction | CallInstruction
+
+
+@dataclass(slots=True)
+class TimeSeriesColumn:
+    """Slots of a time-series parameter at each time step, packed into and unpacked from a typed buffer.
+
+    The buffer holds the values at `time_steps`, the time steps at which the parameter exists in the model,
+    e.g., all but the last one for an input only used to compute the next value of another parameter.
+    The buffer dtype comes from the parameter type: float64 for real parameters, bool for boolean parameters,
+    and integer codes into `categories` for categorical parameters. Other parameters are packed into object arrays,
+    and so are the values that do not fit the buffer, e.g., a `None` filled after a stop condition.
+    """
+
+    connector: ArraySlotConnector
+    time_steps: tuple[int, ...]
+    categories: tuple[Any, ...] | None = None
+    _codes: dict[Any, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._codes = {category: code for code, category in enumerate(self.categories or ())}
+
+    def pack(self, values: SlotValues) -> npt.NDArray[Any] | None:
+        """Pack the values into a buffer, or return None if the value at a time step is missing."""
+        series = [values[slot] for slot in self.connector.iter_slots()]
+        if any(value is MISSING for value in series):
+            return None
+        if self.categories is not None:
+            try:
+                series = [self._codes[value] for value in series]
+            except (KeyError, TypeError):
+                return _object_array(series)
+        return self.connector.to_array(series)
+
+    def unpack(self, array: Any) -> list[Any]:
+        """Unpack an array into the values at each time step.
+
+        An integer array of a categorical parameter is taken as the codes of the categories.
+        """
+        values = self.connector.from_array(array)
+        if self.categories is not None and np.asarray(array).dtype.kind in "iu":
+            return [self.categories[code] for code in values]
+        return values
+
+    def scatter(self, values: SlotValues, array: Any) -> None:
+        if np.shape(array) != self.connector.slots.shape:
+            msg = (
+                f"Expected an array of shape {self.connector.slots.shape} with the values at time steps "
+                f"{list(self.time_steps)}, but got shape {np.shape(array)}."
+            )
+            raise ValueError(msg)
+        for slot, value in zip(self.connector.iter_slots(), self.unpack(array), strict=True):
+            values[slot] = value
+
+    def iter_slots(self) -> Iterable[int]:
+        return self.connector.iter_slots()
+
+
+def create_time_series_columns(
+    core_model: CoreModel,
+    slots: MappingABC[ParameterId, int],
+    *,
+    n_time_steps: int | None,
+) -> dict[TimeSeriesArrayId, TimeSeriesColumn]:
+    """Create the column of each time-series parameter of the model and its sub-models."""
+    if n_time_steps is None:
+        return {}
+    columns: dict[TimeSeriesArrayId, TimeSeriesColumn] = {}
+    for model_path, _, parameter in _iter_parameters_recursively(core_model):
+        if not parameter.is_time_series:
+            continue
+        assert isinstance(parameter.name, str)
+        array_id = TimeSeriesArrayId(model_path=model_path, name=parameter.name)
+        # E.g., a parameter only referred to as the previous value is not in the model at the last time step
+        time_steps = tuple(time_step for time_step in range(n_time_steps) if array_id.at(time_step) in slots)
+        if not time_steps:
+            continue
+        column_slots = np.array([slots[array_id.at(time_step)] for time_step in time_steps], dtype=np.intp)
+        categories: tuple[Any, ...] | None = None
+        dtype: np.dtype[Any]
+        match parameter:
+            case RealParameter():
+                dtype = np.dtype(np.float64)
+            case BooleanParameter():
+                dtype = np.dtype(np.bool_)
+            case CategoricalParameter():
+                categories = parameter.categories
+                dtype = np.min_scalar_type(max(len(categories) - 1, 0))
+            case _:
+                dtype = np.dtype(object)
+        columns[array_id] = TimeSeriesColumn(
+            connector=ArraySlotConnector(slots=column_slots, dtype=dtype),
+            time_steps=time_steps,
+            categories=categories,
+        )
+    return columns
+
+
+def _get_column(
+    columns: MappingABC[TimeSeriesArrayId, TimeSeriesColumn],
+    array_id: TimeSeriesArrayId,
+) -> TimeSeriesColumn:
+    try:
+        return columns[array_id]
+    except KeyError:
+        msg = f"{array_id} is not a time-series parameter of the model, so its values cannot be given as an array."
+        raise ValueError(msg) from None
+
+
+class ResultsView(MappingABC[ParameterId, Any]):
+    """Read-only mapping view over the slot values of an executed plan."""
+
+    __slots__ = ("_columns", "_parameter_ids", "_slots", "_values")
+
+    def __init__(
+        self,
+        parameter_ids: tuple[ParameterId, ...],
+        slots: dict[ParameterId, int],
+        values: list[Any],
+        columns: MappingABC[TimeSeriesArrayId, TimeSeriesColumn] | None = None,
+    ) -> None:
+        self._parameter_ids = parameter_ids
+        self._slots = slots
+        self._values = values
+        self._columns = columns or {}
+
+    def __getitem__(self, key: ParameterId) -> Any:
+        value = self._values[self._slots[key]]
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[ParameterId]:
+        for parameter_id, value in zip(self._parameter_ids, self._values, strict=True):
+            if value is not MISSING:
+                yield parameter_id
+
+    def __len__(self) -> int:
+        return sum(value is not MISSING for value in self._values)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def to_dict(self) -> dict[ParameterId, Any]:
+        return {
+            parameter_id: value
+            for parameter_id, value in zip(self._parameter_ids, self._values, strict=True)
+            if value is not MISSING
+        }
+
+    def to_columns(self) -> dict[InputId, Any]:
+        """Convert the results into a dictionary with the values of each time-series parameter packed into an array.
+
+        A time-series parameter whose value is missing at a time step, e.g., because it is not computed for the
+        requested outputs, is kept as the values at each time step.
+        """
+        results: dict[InputId, Any] = {}
+        packed_slots: set[int] = set()
+        for array_id, column in self._columns.items():
+            array = column.pack(self._values)
+            if array is not None:
+                results[array_id] = array
+                packed_slots.update(column.iter_slots())
+        for slot, (parameter_id, value) in enumerate(zip(self._parameter_ids, self._values, strict=True)):
+            if value is not MISSING and slot not in packed_slots:
+                results[parameter_id] = value
+        return results
+
+
+class _Hold:
+    """Marker for the fill value of a time-series parameter that repeats the value at the stop step."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<HOLD>"
+
+
+_HOLD: Final = _Hold()
+
+
+@dataclass(slots=True)
+class StopCheck:
+    """Stop condition of a model compiled against the slots of an execution plan."""
+
+    stop_condition: StopCondition
+    # Slots of the stop parameter at each time step
+    stop_slots: tuple[int, ...]
+    # Slots of each time-series parameter at each time step, and the value to fill the skipped time steps with
+    fill_slots: tuple[tuple[tuple[int, ...], Any], ...]
+
+    def should_stop(self, values: SlotValues, time_step: int) -> bool:
+        value = values[self.stop_slots[time_step]]
+        return value is not MISSING and self.stop_condition.should_stop(value)
+
+    def fill(self, values: SlotValues, time_step: int) -> None:
+        """Fill the values of the time-series parameters at the time steps after `time_step`.
+
+        Parameters without a value at `time_step` are not filled.
+        """
+        for slots, fill_value in self.fill_slots:
+            value = values[slots[time_step]]
+            if value is MISSING:
+                continue
+            if fill_value is not _HOLD:
+                value = fill_value
+            for slot in slots[time_step + 1 :]:
+                values[slot] = value
+
+
+def _check_stop_condition_ref(core_model: CoreModel, ref: ParameterRef) -> None:
+    if ref.name not in core_model.parameters or not core_model.parameters[ref.name].is_time_series:
+        msg = f"{ref} in the stop condition does not refer to a time-series parameter of model {core_model.name}."
+        raise ValueError(msg)
+
+
+def create_stop_check(
+    core_model: CoreModel,
+    slots: MappingABC[ParameterId, int],
+    *,
+    n_time_steps: int | None,
+) -> StopCheck | None:
+    """Create the stop check of the stop condition of the root model, or None if it has no stop condition."""
+    stop_condition = core_model.stop_condition
+    if stop_condition is None:
+        return None
+    _check_stop_condition_ref(core_model, stop_condition.ref)
+    for ref in stop_condition.fill_values:
+        _check_stop_condition_ref(core_model, ref)
+
+    if n_time_steps is None:
+        msg = "A stop condition requires the number of time steps."
+        raise ValueError(msg)
+
+    fill_values: dict[tuple[ModelPathType, str], Any] = {
+        ((), ref.name): value for ref, value in stop_condition.fill_values.items()
+    }
+    default_fill_value: Any = _HOLD if stop_condition.fill == "hold" else None
+    fill_slots: list[tuple[tuple[int, ...], Any]] = []
+    for model_path, _, parameter in _iter_parameters_recursively(core_model):
+        if not parameter.is_time_series:
+            continue
+        assert isinstance(parameter.name, str)
+        parameter_slots = tuple(
+            slots[TimeSeriesParameterId(model_path=model_path, name=parameter.name, time_step=time_step)]
+            for time_step in range(n_time_steps)
+        )
+        fill_slots.append((parameter_slots, fill_values.get((model_path, parameter.name), default_fill_value)))
+
+    return StopCheck(
+        stop_condition=stop_condition,
+        stop_slots=tuple(
+            slots[TimeSeriesParameterId(model_path=(), name=stop_condition.ref.name, time_step=time_step)]
+            for time_step in range(n_time_steps)
+        ),
+        fill_slots=tuple(fill_slots),
+    )
+
+
+@dataclass(slots=True)
+class ExecutionState:
+    """Values of an execution paused before a time step, from which the remaining time steps can be run.
+
+    Create it with [`checkpoint_exec_model`][pdag.checkpoint_exec_model] and pass it to
+    [`execute_exec_model`][pdag.execute_exec_model] to resume the execution, e.g., many times with different inputs
+    for the remaining time steps. It only holds parameter IDs and values, so it can be pickled if the values can.
+    The random number generator (`RNG_ID`) is held as a copy, and each resumed execution draws from its own copy,
+    so they all draw the same random numbers unless another generator is given in the inputs.
+    """
+
+    time_step: int
+    values: dict[ParameterId, Any]
+
+
+def _copy_rng(parameter_id: ParameterId, value: Any) -> Any:
+    """Return a copy of the value if it is the random number generator, which is advanced by each execution."""
+    return copy.deepcopy(value) if parameter_id == RNG_ID else value
+
+
+def _check_time_step(time_step: int, n_time_steps: int | None, name: str) -> int:
+    if n_time_steps is None:
+        msg = "Checkpoints require a model with time steps."
+        raise ValueError(msg)
+    if not 1 <= time_step <= n_time_steps:
+        msg = f"{name} must be between 1 and the number of time steps {n_time_steps}, but got {time_step}."
+        raise ValueError(msg)
+    return time_step
+
+
+def _step_range(state: ExecutionState | None, stop_step: int | None, n_time_steps: int | None) -> tuple[int, int]:
+    """Return the first time step run after resuming from `state` and the time step to stop before."""
+    start_step = 0 if state is None else _check_time_step(state.time_step, n_time_steps, "The state time step")
+    end_step = n_time_steps or 0
+    if stop_step is not None:
+        end_step = _check_time_step(stop_step, n_time_steps, "stop_step")
+        if end_step < start_step:
+            msg = f"stop_step {stop_step} is before the time step {start_step} of the state."
+            raise ValueError(msg)
+    return start_step, end_step
+
+
+@dataclass(slots=True)
+class ExecutionPlan:
+    """Execution model compiled into a flat list of instructions over integer parameter slots.
+
+    Use [`ExecutionModel.compile`][pdag.ExecutionModel.compile] to get the (cached) plan of an execution model.
+    """
+
+    parameter_ids: tuple[ParameterId, ...]
+    slots: dict[ParameterId, int]
+    required_input_slots: tuple[int, ...]
+    instructions: tuple[Instruction, ...]
+    # Slots to clear after each instruction, or None to keep all values
+    free_after: tuple[tuple[int, ...], ...] | None = None
+    # Stop condition of the model, and the index after the last instruction of each time step.
+    # The instructions run before the time steps come first and those run after them come last.
+    stop: StopCheck | None = None
+    step_ends: tuple[int, ...] = ()
+    columns: dict[TimeSeriesArrayId, TimeSeriesColumn] = field(default_factory=dict)
+    n_time_steps: int | None = None
+    # Values of the slots set before the inputs, e.g., the results of the hoisted case-invariant instructions
+    preset_values: tuple[Any, ...] | None = None
+
+    _readers: dict[int, list[int]] | None = field(default=None, init=False, repr=False, compare=False)
+    _dependents: dict[int, set[int]] | None = field(default=None, init=False, repr=False, compare=False)
+    _levels: list[list[int]] | None = field(default=None, init=False, repr=False, compare=False)
+    _stepwise: "ExecutionPlan | None" = field(default=None, init=False, repr=False, compare=False)
+
+    def initial_values(self, inputs: Inputs) -> list[Any]:
+        values = self._empty_values()
+        self._set_inputs(values, inputs)
+        self._check_required_inputs(values, self.required_input_slots)
+        return values
+
+    def _empty_values(self) -> list[Any]:
+        if self.preset_values is not None:
+            return list(self.preset_values)
+        return [MISSING] * len(self.parameter_ids)
+
+    def _set_inputs(self, values: list[Any], inputs: Inputs) -> None:
+        slots = self.slots
+        for parameter_id, value in inputs.items():
+            if isinstance(parameter_id, TimeSeriesArrayId):
+                _get_column(self.columns, parameter_id).scatter(values, value)
+                continue
+            slot = slots.get(parameter_id)
+            if slot is not None:
+                values[slot] = value
+
+    def _check_required_inputs(self, values: list[Any], required_input_slots: Iterable[int]) -> None:
+        for slot in required_input_slots:
+            if values[slot] is MISSING:
+                msg = f"Node {self.parameter_ids[slot]} not in inputs or port_mapping"
+                raise ValueError(msg)
+
+    def prune(self, outputs: Iterable[ParameterId]) -> "ExecutionPlan":
+        """Create a plan that only runs the instructions needed to compute the given parameters.
+
+        The pruned plan shares the slot layout of this plan.
+        """
+        writers: defaultdict[int, list[int]] = defaultdict(list)
+        for index, instruction in enumerate(self.instructions):
+            for slot in instruction.iter_output_slots():
+                writers[slot].append(index)
+
+        # The stop check reads the stop parameter
+        stack: list[int] = list(self.stop.stop_slots) if self.stop is not None else []
+        for parameter_id in outputs:
+            if parameter_id not in self.slots:
+                msg = f"Parameter {parameter_id} is not in the model."
+                raise ValueError(msg)
+            stack.append(self.slots[parameter_id])
+
+        needed_slots: set[int] = set()
+        needed_instructions: set[int] = set()
+        while stack:
+            slot = stack.pop()
+            if slot in needed_slots:
+                continue
+            needed_slots.add(slot)
+            for index in writers.get(slot, ()):
+                if index not in needed_instructions:
+                    needed_instructions.add(index)
+                    stack.extend(self.instructions[index].iter_input_slots())
+
+        sorted_needed_instructions = sorted(needed_instructions)
+        return ExecutionPlan(
+            parameter_ids=self.parameter_ids,
+            slots=self.slots,
+            required_input_slots=tuple(slot for slot in self.required_input_slots if slot in needed_slots),
+            instructions=tuple(self.instructions[index] for index in sorted_needed_instructions),
+            stop=self.stop,
+            step_ends=tuple(bisect_left(sorted_needed_instructions, end) for end in self.step_ends),
+            columns=self.columns,
+            n_time_steps=self.n_time_steps,
+            preset_values=self.preset_values,
+        )
+
+    def downstream(self, slots: Iterable[int]) -> list[int]:
+        """Return the indices of the instructions that depend on the given slots, in execution order."""
+        if self._readers is None:
+            readers: defaultdict[int, list[int]] = defaultdict(list)
+            for index, instruction in enumerate(self.instructions):
+                for slot in set(instruction.iter_input_slots()):
+                    readers[slot].append(index)
+            self._readers = dict(readers)
+
+        stack = list(slots)
+        visited_slots: set[int] = set()
+        affected_instructions: set[int] = set()
+        while stack:
+            slot = stack.pop()
+            if slot in visited_slots:
+                continue
+            visited_slots.add(slot)
+            for index in self._readers.get(slot, ()):
+                if index not in affected_instructions:
+                    affected_instructions.add(index)
+                    stack.extend(self.instructions[index].iter_output_slots())
+        return sorted(affected_instructions)
+
+    def dependents(self) -> dict[int, set[int]]:
+        """Map the index of each instruction to the indices of the instructions that read its outputs."""
+        if self._dependents is None:
+            # An instruction depends on the last instruction that wrote each of its inputs before it,
+            # as the accumulator of a fold relationship is written by each of its steps
+            writers: dict[int, int] = {}
+            dependents: dict[int, set[int]] = {index: set() for index in range(len(self.instructions))}
+            rng_slot = self.slots.get(RNG_ID)
+            for index, instruction in enumerate(self.instructions):
+                input_slots = set(instruction.iter_input_slots())
+                for slot in input_slots:
+                    if slot in writers:
+                        dependents[writers[slot]].add(index)
+                for slot in instruction.iter_output_slots():
+                    writers[slot] = index
+                # Each draw advances the generator, so the relationships that use it are run in the plan order
+                if rng_slot in input_slots:
+                    writers[rng_slot] = index
+            self._dependents = dependents
+        return self._dependents
+
+    def levels(self) -> list[list[int]]:
+        """Group the indices of the instructions into levels.
+
+        The instructions in a level only depend on instructions in earlier levels,
+        so they can be run in any order or concurrently.
+        """
+        if self._levels is None:
+            self._levels = [sorted(level) for level in topological_levels(self.dependents())]
+        return self._levels
+
+    def free_dead_values(self, outputs: Iterable[ParameterId] | None = None) -> "ExecutionPlan":
+        """Create a plan that clears each value after the last instruction that uses it.
+
+        The values of the inputs and `outputs` are kept. If `outputs` is not given,
+        the values that no instruction uses are kept.
+        """
+        last_reads: dict[int, int] = {}
+        last_writes: dict[int, int] = {}
+        for index, instruction in enumerate(self.instructions):
+            for slot in instruction.iter_input_slots():
+                last_reads[slot] = index
+            for slot in instruction.iter_output_slots():
+                last_writes[slot] = index
+        last_uses = last_writes | {slot: max(index, last_writes.get(slot, index)) for slot, index in last_reads.items()}
+
+        if outputs is None:
+            # The values written after their last read, e.g., the outputs of fold relationships, are kept
+            kept_slots = {slot for slot, index in last_writes.items() if index >= last_reads.get(slot, -1)}
+        else:
+            kept_slots = {self.slots[parameter_id] for parameter_id in outputs}
+        kept_slots.update(self.required_input_slots)
+        if self.stop is not None:
+            kept_slots.update(self.stop.stop_slots)
+
+        free_after: list[list[int]] = [[] for _ in self.instructions]
+        for slot, index in last_uses.items():
+            if slot not in kept_slots:
+                free_after[index].append(slot)
+
+        return ExecutionPlan(
+            parameter_ids=self.parameter_ids,
+            slots=self.slots,
+            required_input_slots=self.required_input_slots,
+            instructions=self.instructions,
+            free_after=tuple(tuple(sorted(slots)) for slots in free_after),
+            stop=self.stop,
+            step_ends=self.step_ends,
+            columns=self.columns,
+            n_time_steps=self.n_time_steps,
+            preset_values=self.preset_values,
+        )
+
+    def hoist(self, constant_inputs: Inputs) -> "ExecutionPlan":
+        """Create a plan for many cases that share the values of `constant_inputs`.
+
+        The instructions that only depend on the constant inputs are run once here,
+        and their results are preset in the slots of the created plan, which runs the other instructions.
+        The inputs of each case should not have different values for the constant inputs.
+        """
+        if self.free_after is not None:
+            msg = "Plans that free intermediate values cannot be hoisted."
+            raise ValueError(msg)
+        values = self._empty_values()
+        self._set_inputs(values, constant_inputs)
+        varying_instructions = set(
+            self.downstream(slot for slot in self.required_input_slots if values[slot] is MISSING),
+        )
+        for index, instruction in enumerate(self.instructions):
+            if index not in varying_instructions:
+                instruction.run(values)
+
+        sorted_varying_instructions = sorted(varying_instructions)
+        return ExecutionPlan(
+            parameter_ids=self.parameter_ids,
+            slots=self.slots,
+            required_input_slots=tuple(slot for slot in self.required_input_slots if values[slot] is MISSING),
+            instructions=tuple(self.instructions[index] for index in sorted_varying_instructions),
+            stop=self.stop,
+            step_ends=tuple(bisect_left(sorted_varying_instructions, end) for end in self.step_ends),
+            columns=self.columns,
+            n_time_steps=self.n_time_steps,
+            preset_values=tuple(values),
+        )
+
+    def stepwise(self) -> "ExecutionPlan":
+        """Create the equivalent plan whose instructions are ordered by time step, so it can be paused and resumed.
+
+        The instructions run before the time steps come first and the static relationships that depend on
+        time-series values come last.
+        """
+        if self.n_time_steps is None:
+            msg = "Checkpoints require a model with time steps."
+            raise ValueError(msg)
+        if self.stop is not None:
+            msg = "Models with a stop condition are not supported by checkpoints."
+            raise ValueError(msg)
+        if self.free_after is not None:
+            msg = "Plans that free intermediate values are not supported by checkpoints."
+            raise ValueError(msg)
+        if self.step_ends:
+            return self
+        if self._stepwise is None:
+            instructions, step_ends = _order_instructions_by_time_step(
+                list(self.instructions),
+                self.parameter_ids,
+                n_time_steps=self.n_time_steps,
+            )
+            self._stepwise = ExecutionPlan(
+                parameter_ids=self.parameter_ids,
+                slots=self.slots,
+                required_input_slots=self.required_input_slots,
+                instructions=tuple(instructions),
+                step_ends=step_ends,
+                columns=self.columns,
+                n_time_steps=self.n_time_steps,
+                preset_values=self.preset_values,
+            )
+        return self._stepwise
+
+    def _read_slots(self, start: int, end: int | None = None) -> set[int]:
+        """Return the slots read by the instructions from `start` to `end` before they are written."""
+        read_slots: set[int] = set()
+        written_slots: set[int] = set()
+        for instruction in self.instructions[start:end]:
+            read_slots.update(slot for slot in instruction.iter_input_slots() if slot not in written_slots)
+            written_slots.update(instruction.iter_output_slots())
+        return read_slots
+
+    def checkpoint(self, results: MappingABC[ParameterId, Any], time_step: int) -> ExecutionState:
+        """Create the state to resume from `time_step` out of the results of an execution stopped there.
+
+        The state only holds the values read by the remaining time steps and the relationships after them,
+        e.g., the values referred to as `previous` values and the static inputs.
+        """
+        plan = self.stepwise()
+        if plan is not self:
+            return plan.checkpoint(results, time_step)
+        read_slots = self._read_slots(self.step_ends[_check_time_step(time_step, self.n_time_steps, "time_step") - 1])
+        return ExecutionState(
+            time_step=time_step,
+            values={
+                self.parameter_ids[slot]: _copy_rng(self.parameter_ids[slot], results[self.parameter_ids[slot]])
+                for slot in sorted(read_slots)
+                if self.parameter_ids[slot] in results
+            },
+        )
+
+    def _execute_steps(
+        self,
+        inputs: Inputs,
+        *,
+        state: ExecutionState | None,
+        stop_step: int | None,
+        profile: "Profile | None",
+    ) -> ResultsView:
+        start_step, end_step = _step_range(state, stop_step, self.n_time_steps)
+        start = 0 if state is None else self.step_ends[start_step - 1]
+        end = len(self.instructions) if stop_step is None else self.step_ends[end_step - 1]
+        values = self._empty_values()
+        if state is not None:
+            for parameter_id, value in state.values.items():
+                values[self.slots[parameter_id]] = _copy_rng(parameter_id, value)
+        self._set_inputs(values, inputs)
+        # Only the inputs of the instructions to run are required
+        read_slots = self._read_slots(start, end)
+        self._check_required_inputs(values, (slot for slot in self.required_input_slots if slot in read_slots))
+        self._run(values, start, end, profile)
+        return ResultsView(self.parameter_ids, self.slots, values, self.columns)
+
+    def _run(self, values: list[Any], start: int, end: int, profile: "Profile | None") -> None:
+        if profile is not None:
+            for index in range(start, end):
+                profile.run(self.instructions[index], values)
+                if self.free_after is not None:
+                    for slot in self.free_after[index]:
+                        values[slot] = MISSING
+        elif self.free_after is None:
+            for instruction in self.instructions[start:end]:
+                instruction.run(values)
+        else:
+            for index in range(start, end):
+                self.instructions[index].run(values)
+                for slot in self.free_after[index]:
+                    values[slot] = MISSING
+
+    def execute(
+        self,
+        inputs: Inputs,
+        *,
+        profile: "Profile | None" = None,
+        state: ExecutionState | None = None,
+        stop_step: int | None = None,
+    ) -> ResultsView:
+        """Execute the plan for a single case. If `profile` is given, the relationship calls are recorded in it.
+
+        If `state` is given, the execution resumes from its time step, and if `stop_step` is given,
+        the execution stops before that time step, skipping the relationships run after the time steps.
+        """
+        if state is not None or stop_step is not None:
+            plan = self.stepwise()
+            if plan is not self:
+                return plan.execute(inputs, profile=profile, state=state, stop_step=stop_step)
+            return self._execute_steps(inputs, state=state, stop_step=stop_step, profile=profile)
+        values = self.initial_values(inputs)
+        if self.stop is None:
+            self._run(values, 0, len(self.instructions), profile)
+            return ResultsView(self.parameter_ids, self.slots, values, self.columns)
+
+        start = 0
+        for time_step, end in enumerate(self.step_ends):
+            self._run(values, start, end, profile)
+            start = end
+            if time_step < len(self.step_ends) - 1 and self.stop.should_stop(values, time_step):
+                self.stop.fill(values, time_step)
+                start = self.step_ends[-1]
+                break
+        self._run(values, start, len(self.instructions), profile)
+        return ResultsView(self.parameter_ids, self.slots, values, self.columns)
+
+
+def _exec_info_value(
+    exec_info_type: ExecInfoType,
+    *,
+    exec_model: ExecutionModel,
+    relationship_id: RelationshipId,
+) -> Any:
+    match exec_info_type:
+        case ExecInfoType.N_TIME_STEPS:
+            return exec_model.n_time_steps
+        case ExecInfoType.TIME:
+            if isinstance(relationship_id, TimeSeriesRelationshipId):
+                return relationship_id.time_step
+            msg = f"Node {relationship_id} is not a TimeSeriesRelationshipId"
+            raise ValueError(msg)
+
+
+def _exec_info_input(
+    exec_info_type: ExecInfoType,
+    *,
+    exec_model: ExecutionModel,
+    relationship_id: RelationshipId,
+    slots: MappingABC[ParameterId, int],
+) -> ScalarSlotConnector | ConstantInput:
+    if exec_info_type == ExecInfoType.RNG:
+        # The generator differs between cases, so it is an input
+        return ScalarSlotConnector(slot=slots[RNG_ID])
+    return ConstantInput(value=_exec_info_value(exec_info_type, exec_model=exec_model, relationship_id=relationship_id))
+
+
+def _to_slot_connector(connector: ConnectorABC, slots: MappingABC[ParameterId, int]) -> SlotConnectorABC:
+    if isinstance(connector, ScalarConnector):
+        return ScalarSlotConnector(slot=slots[connector.parameter_id])
+    if isinstance(connector, MappingConnector):
+        return MappingSlotConnector(slots={key: slots[param_id] for key, param_id in connector.parameter_ids.items()})
+    if isinstance(connector, MappingListConnector):
+        return MappingListSlotConnector(
+            slots=[{key: slots[param_id] for key, param_id in mapping.items()} for mapping in connector.parameter_ids],
+        )
+    if isinstance(connector, ArrayConnector):
+        slot_array = np.empty(connector.parameter_ids.shape, dtype=np.intp)
+        for index, param_id in np.ndenumerate(connector.parameter_ids):
+            slot_array[index] = slots[param_id]
+        return ArraySlotConnector(slots=slot_array, dtype=connector.dtype)
+    msg = f"Connector type {type(connector)} is not supported."
+    raise TypeError(msg)
+
+
+def create_call_instruction(
+    relationship_id: RelationshipId,
+    relationship_info: FunctionRelationshipInfo,
+    slots: MappingABC[ParameterId, int],
+    *,
+    exec_info_input: Callable[[ExecInfoType], SlotConnectorABC | ConstantInput],
+    hooks: Sequence[ExecutionHooks] = (),
+) -> CallInstruction:
+    """Create the instruction that calls a function relationship.
+
+    `exec_info_input` gives the input that provides the value of an `ExecInfo` argument.
+    If `hooks` are given, the relationship is wrapped with their callbacks.
+    """
+    inputs: dict[str, SlotConnectorABC | ConstantInput] = {}
+    for input_arg_name, connector_or_exec_info in relationship_info.input_parameter_info.items():
+        if isinstance(connector_or_exec_info, ExecInfoType):
+            inputs[input_arg_name] = exec_info_input(connector_or_exec_info)
+        else:
+            inputs[input_arg_name] = _to_slot_connector(connector_or_exec_info, slots)
+    function_relationship = relationship_info.function_relationship
+    function = function_relationship.function
+    if function_relationship.cache is not None:
+        function = function_relationship.cache.wrap(function)
+    if hooks:
+        function = wrap_with_hooks(function, relationship_id, hooks, is_async=function_relationship.is_async)
+    return CallInstruction(
+        relationship_id=relationship_id,
+        function=function,
+        inputs=inputs,
+        outputs=tuple(_to_slot_connector(connector, slots) for connector in relationship_info.output_parameter_info),
+        output_is_scalar=function_relationship.output_is_scalar,
+        vectorized=function_relationship.vectorized,
+        is_async=function_relationship.is_async,
+    )
+
+
+def _time_step_of_instruction(instruction: Instruction, parameter_ids: tuple[ParameterId, ...]) -> int | None:
+    node_id = (
+        instruction.relationship_id
+        if isinstance(instruction, CallInstruction)
+        else parameter_ids[instruction.target_slot]
+    )
+    return node_id.time_step if isinstance(node_id, TimeSeriesParameterId | TimeSeriesRelationshipId) else None
+
+
+def _order_instructions_by_time_step(
+    instructions: list[Instruction],
+    parameter_ids: tuple[ParameterId, ...],
+    *,
+    n_time_steps: int,
+) -> tuple[list[Instruction], tuple[int, ...]]:
+    """Order topologically sorted instructions into those run before, at each of, and after the time steps.
+
+    Returns the ordered instructions and the index after the last instruction of each time step.
+    """
+    # Stage 0 is before the time steps, stage t + 1 is time step t, and the last stage is after the time steps
+    after_stage = n_time_steps + 1
+    writers: dict[int, int] = {}
+    stages: list[int] = []
+    for index, instruction in enumerate(instructions):
+        time_step = _time_step_of_instruction(instruction, parameter_ids)
+        stage = max(
+            [
+                0 if time_step is None else time_step + 1,
+                *(stages[writers[slot]] for slot in instruction.iter_input_slots() if slot in writers),
+            ],
+        )
+        if time_step is None and stage > 0:
+            # Static relationships that depend on time-series values are run on the filled values
+            stage = after_stage
+        elif stage == after_stage:
+            msg = (
+                f"{instruction} depends on a static relationship run after the time steps, "
+                "so the model cannot be paused after a time step."
+            )
+            raise ValueError(msg)
+        stages.append(stage)
+        for slot in instruction.iter_output_slots():
+            writers[slot] = index
+
+    # A stable sort keeps the topological order, as no instruction depends on an instruction of a later stage
+    order = sorted(range(len(instructions)), key=stages.__getitem__)
+    counts = [0] * (after_stage + 1)
+    for stage in stages:
+        counts[stage] += 1
+    step_ends = tuple(accumulate(counts))[1:after_stage]
+    return [instructions[index] for index in order], step_ends
+
+
+def compile_exec_model(exec_model: ExecutionModel) -> ExecutionPlan:
+    """Compile an execution model into an execution plan."""
+    sorted_node_ids = exec_model.topologically_sorted_node_ids
+    parameter_ids = tuple(
+        node_id
+        for node_id in sorted_node_ids
+        if isinstance(node_id, StaticParameterId | TimeSeriesParameterId) and node_id not in exec_model.accumulator_ids
+    )
+    if exec_model.uses_rng:
+        parameter_ids = (*parameter_ids, RNG_ID)
+    slots = {parameter_id: slot for slot, parameter_id in enumerate(parameter_ids)}
+    # The accumulators of a fold relationship are updated in place in the slot of its output
+    slots.update(
+        (accumulator_id, slots[output_parameter_id])
+        for accumulator_id, output_parameter_id in exec_model.accumulator_ids.items()
+    )
+
+    required_input_slots: list[int] = [slots[RNG_ID]] if exec_model.uses_rng else []
+    instructions: list[Instruction] = []
+    for node_id in sorted_node_ids:
+        if isinstance(node_id, StaticParameterId | TimeSeriesParameterId):
+            if node_id in exec_model.output_parameter_id_to_relationship_ids or node_id in exec_model.fixed_values:
+                continue
+            if node_id in exec_model.port_mapping_inverse:
+                instructions.append(
+                    CopyInstruction(
+                        source_slot=slots[exec_model.port_mapping_inverse[node_id]],
+                        target_slot=slots[node_id],
+                    ),
+                )
+                continue
+            required_input_slots.append(slots[node_id])
+            continue
+
+        assert isinstance(node_id, StaticRelationshipId | TimeSeriesRelationshipId)
+        instructions.append(
+            create_call_instruction(
+                node_id,
+                exec_model.relationship_infos[node_id],
+                slots,
+                exec_info_input=partial(_exec_info_input, exec_model=exec_model, relationship_id=node_id, slots=slots),
+                hooks=tuple(exec_model.hooks),
+            ),
+        )
+
+    stop = create_stop_check(exec_model._core_model, slots, n_time_steps=exec_model.n_time_steps)  # noqa: SLF001
+    columns = create_time_series_columns(exec_model._core_model, slots, n_time_steps=exec_model.n_time_steps)  # noqa: SLF001
+    preset_values: tuple[Any, ...] | None = None
+    if exec_model.fixed_values:
+        values: list[Any] = [MISSING] * len(parameter_ids)
+        for parameter_id, value in exec_model.fixed_values.items():
+            values[slots[parameter_id]] = value
+        preset_values = tuple(values)
+    if stop is None:
+        return ExecutionPlan(
+            parameter_ids=parameter_ids,
+            slots=slots,
+            required_input_slots=tuple(required_input_slots),
+            instructions=tuple(instructions),
+            columns=columns,
+            n_time_steps=exec_model.n_time_steps,
+            preset_values=preset_values,
+        )
+
+    ordered_instructions, step_ends = _order_instructions_by_time_step(
+        instructions,
+        parameter_ids,
+        n_time_steps=len(stop.stop_slots),
+    )
+    return ExecutionPlan(
+        parameter_ids=parameter_ids,
+        slots=slots,
+        required_input_slots=tuple(required_input_slots),
+        instructions=tuple(ordered_instructions),
+        stop=stop,
+        step_ends=step_ends,
+        columns=columns,
+        n_time_steps=exec_model.n_time_steps,
+        preset_values=preset_values,
+    )
@@ -0,0 +1,100 @@
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import polars as pl
+
+from .model import ModelPathType
+from .plan import CallInstruction, Instruction, SlotValues
+
+
+def _output_size(value: Any) -> int:
+    """Approximate size of an output value in bytes. The data of NumPy arrays is included."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
+@dataclass(slots=True)
+class RelationshipStats:
+    """Statistics of the calls of a relationship across time steps and cases."""
+
+    calls: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    output_size: int = 0
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def merge(self, other: "RelationshipStats") -> None:
+        self.calls += other.calls
+        self.total_time += other.total_time
+        self.max_time = max(self.max_time, other.max_time)
+        self.output_size += other.output_size
+
+
+@dataclass
+class Profile:
+    """Per-relationship profiling statistics collected during execution.
+
+    Pass a profile to [`execute_exec_model`][pdag.execute_exec_model] or `run_experiments` to record
+    the calls of each function relationship. The statistics are grouped by the model path and name of
+    the relationship, so the calls at all time steps and in all cases are aggregated.
+    Wall times are in seconds and output sizes are approximate sizes in bytes.
+    """
+
+    stats: dict[tuple[ModelPathType, str], RelationshipStats] = field(default_factory=dict)
+
+    def run(self, instruction: Instruction, values: SlotValues) -> None:
+        """Run an instruction and record the call if it calls a relationship."""
+        if not isinstance(instruction, CallInstruction):
+            instruction.run(values)
+            return
+        start = time.perf_counter()
+        instruction.run(values)
+        elapsed = time.perf_counter() - start
+
+        relationship_id = instruction.relationship_id
+        key = (relationship_id.model_path, relationship_id.name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = RelationshipStats()
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        stats.output_size += sum(_output_size(values[slot]) for slot in instruction.iter_output_slots())
+
+    def merge(self, other: "Profile") -> None:
+        """Add the statistics of another profile, e.g., one collected in a worker process."""
+        for key, other_stats in other.stats.items():
+            self.stats.setdefault(key, RelationshipStats()).merge(other_stats)
+
+    def to_df(self) -> pl.DataFrame:
+        """Export the statistics as a DataFrame with a row per relationship, sorted by the total time."""
+        return pl.DataFrame(
+            [
+                {
+                    "model_path": ".".join(model_path),
+                    "relationship": name,
+                    "calls": stats.calls,
+                    "total_time": stats.total_time,
+                    "mean_time": stats.mean_time,
+                    "max_time": stats.max_time,
+                    "output_size": stats.output_size,
+                }
+                for (model_path, name), stats in self.stats.items()
+            ],
+            schema={
+                "model_path": pl.String,
+                "relationship": pl.String,
+                "calls": pl.Int64,
+                "total_time": pl.Float64,
+                "mean_time": pl.Float64,
+                "max_time": pl.Float64,
+                "output_size": pl.Int64,
+            },
+        ).sort("total_time", descending=True)
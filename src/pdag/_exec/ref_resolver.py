@@ -1,4 +1,4 @@
-from collections.abc import Hashable
+from collections.abc import Hashable, Iterable
 from collections.abc import Mapping as MappingABC
 from types import EllipsisType
 from typing import Any
@@ -9,7 +9,7 @@ import numpy.typing as npt
 from pdag._core import ReferenceABC
 from pdag._core.collection import Array, CollectionABC, Mapping
 from pdag._core.model import CoreModel
-from pdag._core.parameter import ParameterABC
+from pdag._core.parameter import BooleanParameter, ParameterABC, RealParameter
 from pdag._core.reference import CollectionRef, ParameterRef
 
 from .model import (
@@ -25,6 +25,18 @@ from .model import (
 )
 
 
+def _dtype_of_parameters(ref: ReferenceABC, parameters: Iterable[ParameterABC[Any]]) -> np.dtype[Any] | None:
+    """NumPy dtype of an array of the values of the parameters, or None if the reference asks for lists."""
+    if not ref.as_array:
+        return None
+    parameter_types = {type(parameter) for parameter in parameters}
+    if parameter_types == {RealParameter}:
+        return np.dtype(np.float64)
+    if parameter_types == {BooleanParameter}:
+        return np.dtype(np.bool_)
+    return np.dtype(object)
+
+
 def _mapping_to_array[T](
     mapping: MappingABC[tuple[int, ...], T],
     shape: tuple[int, ...],
@@ -88,6 +100,20 @@ def resolve_ref(  # noqa: PLR0913
     raise NotImplementedError
 
 
+def _referred_time_step(ref: ReferenceABC, time_step: int) -> int:
+    """Time step of the value a reference refers to in a relationship evaluated at `time_step`."""
+    if ref.normal:
+        return time_step
+    if ref.previous:
+        return time_step - 1
+    if ref.next:
+        return time_step + 1
+    if ref.lag:
+        return time_step - ref.lag
+    msg = "Unsupported reference type."
+    raise ValueError(msg)
+
+
 def _resolve_parameter_ref_in_time_series_relationship(
     ref: ParameterRef,
     *,
@@ -96,15 +122,21 @@ def _resolve_parameter_ref_in_time_series_relationship(
     time_step: int,
 ) -> ConnectorABC:
     assert isinstance(parameter.name, str)
-    if ref.normal:
-        param_time_step = time_step
-    elif ref.previous:
-        param_time_step = time_step - 1
-    elif ref.next:
-        param_time_step = time_step + 1
-    else:
-        msg = "Unsupported reference type."
-        raise ValueError(msg)
+    if ref.window is not None:
+        if not parameter.is_time_series:
+            msg = "Window references are only supported for time-series parameters."
+            raise ValueError(msg)
+        # The values at the last `window` time steps, from the oldest to the current one
+        return ArrayConnector(
+            parameter_ids=np.array(
+                [
+                    TimeSeriesParameterId(model_path=model_path, name=parameter.name, time_step=window_time_step)
+                    for window_time_step in range(time_step - ref.window + 1, time_step + 1)
+                ],
+            ),
+            dtype=_dtype_of_parameters(ref, [parameter]),
+        )
+    param_time_step = _referred_time_step(ref, time_step)
 
     if parameter.is_time_series:
         input_parameter_id: ParameterId = TimeSeriesParameterId(
@@ -129,16 +161,7 @@ def _resolve_collection_ref_in_time_series_relationship(
     time_step: int,
 ) -> ConnectorABC:
     if collection.is_time_series():
-        if ref.normal:
-            param_time_step = time_step
-        elif ref.previous:
-            param_time_step = time_step - 1
-        elif ref.next:
-            param_time_step = time_step + 1
-        else:
-            msg = "Unsupported reference type."
-            raise ValueError(msg)
-
+        param_time_step = _referred_time_step(ref, time_step)
         parameter_ids: dict[Hashable, ParameterId] = {
             key: TimeSeriesParameterId(
                 model_path=model_path,
@@ -161,6 +184,7 @@ def _resolve_collection_ref_in_time_series_relationship(
                 shape=collection.shape,
                 error_on_missing=True,
             ),
+            dtype=_dtype_of_parameters(ref, collection.values()),
         )
 
     msg = f"Unsupported collection type: {collection}"
@@ -186,7 +210,7 @@ def _resolve_parameter_ref_in_static_relationship(
                 )
                 for time_step in range(n_time_steps)
             ]
-            return ArrayConnector(parameter_ids=np.array(parameter_ids))
+            return ArrayConnector(parameter_ids=np.array(parameter_ids), dtype=_dtype_of_parameters(ref, [parameter]))
         if ref.initial:
             return ScalarConnector(
                 parameter_id=TimeSeriesParameterId(
@@ -263,6 +287,7 @@ def _resolve_collection_ref_in_static_relationship(
                         for mapping in connector.parameter_ids
                     ],
                 ),
+                dtype=_dtype_of_parameters(ref, collection.values()),
             )
         return ArrayConnector(
             parameter_ids=_mapping_to_array(
@@ -270,6 +295,7 @@ def _resolve_collection_ref_in_static_relationship(
                 shape=collection.shape,
                 error_on_missing=True,
             ),
+            dtype=_dtype_of_parameters(ref, collection.values()),
         )
 
     msg = f"Unsupported collection type: {collection}"
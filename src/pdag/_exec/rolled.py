@@ -0,0 +1,647 @@
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final, Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from pdag._core import CoreModel
+from pdag._utils import topological_sort
+
+from .hooks import ExecutionHooks
+from .model import (
+    RNG_ID,
+    BackendType,
+    ExecInfoType,
+    ExecutionModel,
+    FunctionRelationshipInfo,
+    Inputs,
+    ModelPathType,
+    ParameterId,
+    StaticParameterId,
+    StaticRelationshipId,
+    TimeSeriesArrayId,
+    TimeSeriesParameterId,
+    TimeSeriesRelationshipId,
+)
+from .plan import (
+    MISSING,
+    ConstantInput,
+    CopyInstruction,
+    ExecutionState,
+    Instruction,
+    ResultsView,
+    ScalarSlotConnector,
+    SlotConnectorABC,
+    SlotValues,
+    StopCheck,
+    TimeSeriesColumn,
+    _check_time_step,
+    _copy_rng,
+    _get_column,
+    _step_range,
+    create_call_instruction,
+    create_stop_check,
+    create_time_series_columns,
+)
+from .to_exec_model import (
+    _calculate_dependencies_of_static_function_relationship,
+    _calculate_port_mapping_of_static_submodel_relationship,
+    _iter_function_relationships_recursively,
+    _iter_parameters_recursively,
+    _iter_submodel_relationships_recursively,
+    _resolve_hold_port_mappings,
+    _resolve_time_series_function_relationship,
+    _resolve_time_series_port_mapping,
+    _time_steps_of_time_series_relationship,
+    create_exec_model_from_core_model,
+)
+
+if TYPE_CHECKING:
+    from .profile import Profile
+
+# Placeholder ID of the slot that holds the current time step during the loop. It is never part of the results.
+_TIME_STEP_ID: Final = StaticParameterId(model_path=(), name="<time step>")
+
+
+class _StepValues:
+    """Slot values seen by the per-step instructions at a given time step.
+
+    Time-series slots of the per-step instructions are the slots of the parameters at offset time steps,
+    so they are shifted by the current time step. Static slots are not shifted.
+    """
+
+    __slots__ = ("_time_series_start", "_values", "time_step")
+
+    def __init__(self, values: list[Any], time_series_start: int) -> None:
+        self._values = values
+        self._time_series_start = time_series_start
+        self.time_step = 0
+
+    def __getitem__(self, slot: int) -> Any:
+        return self._values[slot + self.time_step if slot >= self._time_series_start else slot]
+
+    def __setitem__(self, slot: int, value: Any) -> None:
+        self._values[slot + self.time_step if slot >= self._time_series_start else slot] = value
+
+
+def _run_instruction(instruction: Instruction, values: SlotValues) -> None:
+    instruction.run(values)
+
+
+@dataclass(slots=True)
+class RolledExecutionPlan:
+    """Rolled execution model compiled into instructions run before, at each step of, and after the time loop.
+
+    Each time-series parameter has `n_time_steps + lookback + 1` consecutive slots, for the time steps from
+    `-lookback` to `n_time_steps`, so that the per-step instructions can refer to the past and next time steps,
+    where `lookback` is the largest lag referred to by the per-step relationships (at least one).
+    """
+
+    parameter_ids: tuple[ParameterId, ...]
+    slots: dict[ParameterId, int]
+    n_time_steps: int
+    time_series_start: int
+    time_step_slot: int
+    required_input_slots: tuple[int, ...]
+    pre_loop_instructions: tuple[Instruction, ...]
+    step_instructions: tuple[tuple[Instruction, range], ...]
+    post_loop_instructions: tuple[Instruction, ...]
+    stop: StopCheck | None = None
+    columns: dict[TimeSeriesArrayId, TimeSeriesColumn] = field(default_factory=dict)
+    # Values of the slots set before the inputs, i.e., the initial accumulators of fold relationships
+    preset_values: tuple[Any, ...] | None = None
+
+    def initial_values(
+        self,
+        inputs: Inputs,
+        state: ExecutionState | None = None,
+        *,
+        stop_step: int | None = None,
+    ) -> list[Any]:
+        values: list[Any] = (
+            list(self.preset_values) if self.preset_values is not None else [MISSING] * len(self.parameter_ids)
+        )
+        slots = self.slots
+        if state is not None:
+            for state_parameter_id, value in state.values.items():
+                values[slots[state_parameter_id]] = _copy_rng(state_parameter_id, value)
+        for parameter_id, value in inputs.items():
+            if isinstance(parameter_id, TimeSeriesArrayId):
+                _get_column(self.columns, parameter_id).scatter(values, value)
+                continue
+            if isinstance(parameter_id, TimeSeriesParameterId) and not 0 <= parameter_id.time_step < self.n_time_steps:
+                continue
+            slot = slots.get(parameter_id)
+            if slot is not None:
+                values[slot] = value
+        self._check_required_inputs(values, stop_step)
+        return values
+
+    def _check_required_inputs(self, values: list[Any], stop_step: int | None) -> None:
+        for slot in self.required_input_slots:
+            parameter_id = self.parameter_ids[slot]
+            # The inputs of the time steps after the stop are not required
+            if (
+                stop_step is not None
+                and isinstance(parameter_id, TimeSeriesParameterId)
+                and parameter_id.time_step >= stop_step
+            ):
+                continue
+            if values[slot] is MISSING:
+                msg = f"Node {parameter_id} not in inputs or port_mapping"
+                raise ValueError(msg)
+
+    def checkpoint(self, results: Mapping[ParameterId, Any], time_step: int) -> ExecutionState:
+        """Create the state to resume from `time_step` out of the results of an execution stopped there.
+
+        Unlike the state of an unrolled plan, it holds all the values computed so far.
+        """
+        _check_time_step(time_step, self.n_time_steps, "time_step")
+        return ExecutionState(
+            time_step=time_step,
+            values={parameter_id: _copy_rng(parameter_id, value) for parameter_id, value in results.items()},
+        )
+
+    def execute(
+        self,
+        inputs: Inputs,
+        *,
+        profile: "Profile | None" = None,
+        state: ExecutionState | None = None,
+        stop_step: int | None = None,
+    ) -> ResultsView:
+        """Execute the plan for a single case. If `profile` is given, the relationship calls are recorded in it.
+
+        If `state` is given, the execution resumes from its time step, and if `stop_step` is given,
+        the execution stops before that time step, skipping the instructions after the time loop.
+        """
+        if self.stop is not None and (state is not None or stop_step is not None):
+            msg = "Models with a stop condition are not supported by checkpoints."
+            raise ValueError(msg)
+        start_step, end_step = _step_range(state, stop_step, self.n_time_steps)
+
+        values = self.initial_values(inputs, state, stop_step=stop_step)
+        run = _run_instruction if profile is None else profile.run
+        if state is None:
+            for instruction in self.pre_loop_instructions:
+                run(instruction, values)
+
+        step_values = _StepValues(values, self.time_series_start)
+        for time_step in range(start_step, end_step):
+            step_values.time_step = time_step
+            values[self.time_step_slot] = time_step
+            for instruction, time_steps in self.step_instructions:
+                if time_step in time_steps:
+                    run(instruction, step_values)
+            if self.stop is not None and time_step < self.n_time_steps - 1 and self.stop.should_stop(values, time_step):
+                self.stop.fill(values, time_step)
+                break
+        values[self.time_step_slot] = MISSING
+
+        if stop_step is None:
+            for instruction in self.post_loop_instructions:
+                run(instruction, values)
+        return ResultsView(self.parameter_ids, self.slots, values, self.columns)
+
+
+@dataclass(slots=True)
+class RolledExecutionModel:
+    """Execution model that keeps a single template of the relationships evaluated at each time step.
+
+    The time steps of the IDs in `step_relationship_infos` and `step_port_mappings` are offsets
+    relative to the current time step: `-1` for the previous time step and `1` for the next one.
+    Use [`unroll`][pdag.RolledExecutionModel.unroll] to get the equivalent unrolled execution model.
+    """
+
+    static_parameter_ids: list[StaticParameterId]
+    time_series_parameters: list[tuple[ModelPathType, str]]
+    static_relationship_infos: dict[StaticRelationshipId, FunctionRelationshipInfo]
+    step_relationship_infos: dict[TimeSeriesRelationshipId, tuple[FunctionRelationshipInfo, range]]
+    static_port_mapping: dict[ParameterId, ParameterId]
+    step_port_mappings: list[tuple[dict[ParameterId, ParameterId], range]]
+    n_time_steps: int
+
+    _core_model: CoreModel = field(repr=False, compare=False, kw_only=True)
+    _compiled: RolledExecutionPlan | None = field(init=False, default=None, repr=False, compare=False)
+    hooks: list[ExecutionHooks] = field(init=False, default_factory=list, repr=False, compare=False)
+
+    def add_hooks(self, hooks: ExecutionHooks) -> None:
+        """Register hooks that are invoked when the relationships are called."""
+        self.hooks.append(hooks)
+        self._compiled = None
+
+    def remove_hooks(self, hooks: ExecutionHooks) -> None:
+        """Unregister hooks registered with [`add_hooks`][pdag.RolledExecutionModel.add_hooks]."""
+        self.hooks.remove(hooks)
+        self._compiled = None
+
+    @property
+    def uses_rng(self) -> bool:
+        """Whether a relationship draws random numbers from the generator given as the input `RNG_ID`."""
+        return any(relationship_info.uses_rng for relationship_info in self.static_relationship_infos.values()) or any(
+            relationship_info.uses_rng for relationship_info, _ in self.step_relationship_infos.values()
+        )
+
+    def unroll(self) -> ExecutionModel:
+        """Create the equivalent unrolled execution model, e.g. to export the graph."""
+        return create_exec_model_from_core_model(self._core_model, n_time_steps=self.n_time_steps)
+
+    def compile(
+        self,
+        backend: BackendType = "interpreter",
+        *,
+        outputs: Iterable[ParameterId] | None = None,
+        free_intermediates: bool = False,
+    ) -> RolledExecutionPlan:
+        """Compile the model into a rolled execution plan. The result is cached."""
+        if backend != "interpreter" or outputs is not None or free_intermediates:
+            msg = "Rolled execution models only support the interpreter backend without outputs or freeing."
+            raise ValueError(msg)
+        if self._compiled is None:
+            self._compiled = compile_rolled_exec_model(self)
+        return self._compiled
+
+
+def create_rolled_exec_model_from_core_model(
+    core_model: CoreModel,
+    *,
+    n_time_steps: int = 1,
+) -> RolledExecutionModel:
+    """Create a rolled execution model, which does not copy the time-series relationships for each time step."""
+    static_parameter_ids: list[StaticParameterId] = []
+    time_series_parameters: list[tuple[ModelPathType, str]] = []
+    for model_path, _, parameter in _iter_parameters_recursively(core_model):
+        assert isinstance(parameter.name, str)
+        if parameter.is_time_series:
+            time_series_parameters.append((model_path, parameter.name))
+        else:
+            static_parameter_ids.append(StaticParameterId(model_path=model_path, name=parameter.name))
+
+    static_relationship_infos: dict[StaticRelationshipId, FunctionRelationshipInfo] = {}
+    step_relationship_infos: dict[TimeSeriesRelationshipId, tuple[FunctionRelationshipInfo, range]] = {}
+    step_port_mappings: list[tuple[dict[ParameterId, ParameterId], range]] = []
+    for model_path, model, function_relationship in _iter_function_relationships_recursively(core_model):
+        if function_relationship.at_each_time_step:
+            relationship_id = TimeSeriesRelationshipId(
+                model_path=model_path,
+                name=function_relationship.name,
+                time_step=0,
+            )
+            time_steps = _time_steps_of_time_series_relationship(function_relationship, n_time_steps=n_time_steps)
+            step_relationship_infos[relationship_id] = (
+                _resolve_time_series_function_relationship(
+                    function_relationship,
+                    core_model=model,
+                    model_path=model_path,
+                    time_step=0,
+                ),
+                time_steps,
+            )
+            if function_relationship.every > 1 and not function_relationship.fold:
+                step_port_mappings.extend(
+                    _resolve_hold_port_mappings(
+                        function_relationship,
+                        core_model=model,
+                        model_path=model_path,
+                        time_steps=time_steps,
+                    ),
+                )
+        else:
+            _, _, relationship_infos = _calculate_dependencies_of_static_function_relationship(
+                function_relationship,
+                core_model=model,
+                model_path=model_path,
+                n_time_steps=n_time_steps,
+            )
+            for static_relationship_id, relationship_info in relationship_infos.items():
+                assert isinstance(static_relationship_id, StaticRelationshipId)
+                static_relationship_infos[static_relationship_id] = relationship_info
+
+    static_port_mapping: dict[ParameterId, ParameterId] = {}
+    for model_path, model, sub_model_relationship in _iter_submodel_relationships_recursively(core_model):
+        if sub_model_relationship.at_each_time_step:
+            step_port_mappings.append(
+                (
+                    _resolve_time_series_port_mapping(
+                        sub_model_relationship,
+                        core_model=model,
+                        model_path=model_path,
+                        time_step=0,
+                    ),
+                    _time_steps_of_time_series_relationship(sub_model_relationship, n_time_steps=n_time_steps),
+                ),
+            )
+        else:
+            static_port_mapping.update(
+                _calculate_port_mapping_of_static_submodel_relationship(
+                    sub_model_relationship,
+                    core_model=model,
+                    model_path=model_path,
+                    n_time_steps=n_time_steps,
+                ),
+            )
+
+    return RolledExecutionModel(
+        static_parameter_ids=static_parameter_ids,
+        time_series_parameters=time_series_parameters,
+        static_relationship_infos=static_relationship_infos,
+        step_relationship_infos=step_relationship_infos,
+        static_port_mapping=static_port_mapping,
+        step_port_mappings=step_port_mappings,
+        n_time_steps=n_time_steps,
+        _core_model=core_model,
+    )
+
+
+@dataclass(slots=True)
+class _SlotLayout:
+    n_time_steps: int
+    time_series_start: int
+    lookback: int
+
+    @property
+    def n_slots_per_parameter(self) -> int:
+        return self.n_time_steps + self.lookback + 1
+
+    def first_slot(self, parameter_index: int) -> int:
+        return self.time_series_start + parameter_index * self.n_slots_per_parameter
+
+    def is_time_series(self, slot: int) -> bool:
+        return slot >= self.time_series_start
+
+    def split(self, slot: int) -> tuple[int, int]:
+        """Split a time-series slot into the index of the parameter and the index in the mask of its time steps."""
+        return divmod(slot - self.time_series_start, self.n_slots_per_parameter)
+
+    def step_mask(
+        self,
+        step_instructions: Iterable[tuple[Instruction, range]],
+        slots_of: Literal["input", "output"],
+    ) -> dict[int, npt.NDArray[np.bool_]]:
+        """Mask of the time steps (from `-lookback` to `n_time_steps`) read or written by the per-step instructions."""
+        masks: dict[int, npt.NDArray[np.bool_]] = {}
+        for instruction, time_steps in step_instructions:
+            slots = instruction.iter_input_slots() if slots_of == "input" else instruction.iter_output_slots()
+            for slot in slots:
+                if not self.is_time_series(slot) or not time_steps:
+                    continue
+                parameter_index, offset_index = self.split(slot)
+                mask = masks.setdefault(parameter_index, np.zeros(self.n_slots_per_parameter, dtype=np.bool_))
+                mask[time_steps.start + offset_index : time_steps.stop + offset_index : time_steps.step] = True
+        return masks
+
+    def touches(self, slot: int, masks: dict[int, npt.NDArray[np.bool_]]) -> bool:
+        parameter_index, index = self.split(slot)
+        return parameter_index in masks and bool(masks[parameter_index][index])
+
+
+def _order_step_instructions(
+    step_instructions: list[tuple[Instruction, range]],
+    layout: _SlotLayout,
+) -> list[tuple[Instruction, range]]:
+    # The outputs of relationships evaluated every few time steps are also written by the copies that hold them
+    writers: dict[int, list[int]] = {}
+    written_offsets: dict[int, set[int]] = {}
+    for index, (instruction, _) in enumerate(step_instructions):
+        for slot in instruction.iter_output_slots():
+            writers.setdefault(slot, []).append(index)
+            if layout.is_time_series(slot):
+                parameter_index, offset_index = layout.split(slot)
+                written_offsets.setdefault(parameter_index, set()).add(offset_index)
+
+    dependents: dict[int, set[int]] = {index: set() for index in range(len(step_instructions))}
+    for index, (instruction, _) in enumerate(step_instructions):
+        for slot in instruction.iter_input_slots():
+            if layout.is_time_series(slot):
+                parameter_index, offset_index = layout.split(slot)
+                if any(offset < offset_index for offset in written_offsets.get(parameter_index, ())):
+                    msg = f"{instruction} reads a value computed at a later time step, so the model cannot be rolled."
+                    raise ValueError(msg)
+            # The steps of fold relationships read the accumulators they write
+            for writer in set(writers.get(slot, ())) - {index}:
+                dependents[writer].add(index)
+    try:
+        order = topological_sort(dependents)
+    except ValueError as e:
+        msg = "The relationships evaluated at each time step have cyclic dependencies, so the model cannot be rolled."
+        raise ValueError(msg) from e
+    return [step_instructions[index] for index in order]
+
+
+def _split_static_instructions(
+    static_instructions: list[Instruction],
+    step_instructions: list[tuple[Instruction, range]],
+    layout: _SlotLayout,
+) -> tuple[list[Instruction], list[Instruction]]:
+    """Order the static instructions and split them into those run before and after the time loop."""
+    read_masks = layout.step_mask(step_instructions, "input")
+    written_masks = layout.step_mask(step_instructions, "output")
+    read_static_slots = {
+        slot
+        for instruction, _ in step_instructions
+        for slot in instruction.iter_input_slots()
+        if not layout.is_time_series(slot)
+    }
+    written_static_slots = {
+        slot
+        for instruction, _ in step_instructions
+        for slot in instruction.iter_output_slots()
+        if not layout.is_time_series(slot)
+    }
+
+    loop = len(static_instructions)
+    writers: dict[int, list[int]] = {}
+    for index, instruction in enumerate(static_instructions):
+        for slot in instruction.iter_output_slots():
+            writers.setdefault(slot, []).append(index)
+
+    dependents: dict[int, set[int]] = {index: set() for index in range(len(static_instructions) + 1)}
+    for index, instruction in enumerate(static_instructions):
+        for slot in instruction.iter_input_slots():
+            for writer in writers.get(slot, ()):
+                dependents[writer].add(index)
+            if (layout.is_time_series(slot) and layout.touches(slot, written_masks)) or slot in written_static_slots:
+                dependents[loop].add(index)
+        for slot in instruction.iter_output_slots():
+            if (layout.is_time_series(slot) and layout.touches(slot, read_masks)) or slot in read_static_slots:
+                dependents[index].add(loop)
+    try:
+        order = topological_sort(dependents)
+    except ValueError as e:
+        msg = "Static relationships both depend on and feed the time loop, so the model cannot be rolled."
+        raise ValueError(msg) from e
+    loop_position = order.index(loop)
+    return (
+        [static_instructions[index] for index in order[:loop_position]],
+        [static_instructions[index] for index in order[loop_position + 1 :]],
+    )
+
+
+def _lookback(model: RolledExecutionModel) -> int:
+    """Largest number of time steps before the current one referred to by the per-step relationships, at least one."""
+    time_steps = [
+        parameter_id.time_step
+        for relationship_info, _ in model.step_relationship_infos.values()
+        for connector in (*relationship_info.input_parameter_info.values(), *relationship_info.output_parameter_info)
+        if not isinstance(connector, ExecInfoType)
+        for parameter_id in connector.iter_parameter_ids()
+        if isinstance(parameter_id, TimeSeriesParameterId)
+    ]
+    time_steps.extend(
+        parameter_id.time_step
+        for port_mapping, _ in model.step_port_mappings
+        for parameter_ids in port_mapping.items()
+        for parameter_id in parameter_ids
+        if isinstance(parameter_id, TimeSeriesParameterId)
+    )
+    return max(1, -min(time_steps, default=0))
+
+
+def _fold_preset_values(
+    model: RolledExecutionModel,
+    slots: Mapping[ParameterId, int],
+    *,
+    n_slots: int,
+) -> tuple[Any, ...] | None:
+    """Preset the initial accumulators of fold relationships, whose steps update the static slots of their outputs."""
+    preset_values: list[Any] | None = None
+    for relationship_info, _ in model.step_relationship_infos.values():
+        relationship = relationship_info.function_relationship
+        if not relationship.fold:
+            continue
+        if preset_values is None:
+            preset_values = [MISSING] * n_slots
+        for connector, initial_value in zip(
+            relationship_info.output_parameter_info,
+            relationship.fold_initial_values(),
+            strict=True,
+        ):
+            for parameter_id in connector.iter_parameter_ids():
+                preset_values[slots[parameter_id]] = initial_value
+    return tuple(preset_values) if preset_values is not None else None
+
+
+def compile_rolled_exec_model(model: RolledExecutionModel) -> RolledExecutionPlan:
+    """Compile a rolled execution model into a rolled execution plan."""
+    n_time_steps = model.n_time_steps
+    # The generator of the case is a static input
+    static_parameter_ids = [*model.static_parameter_ids, RNG_ID] if model.uses_rng else model.static_parameter_ids
+    parameter_ids: list[ParameterId] = [*static_parameter_ids, _TIME_STEP_ID]
+    time_step_slot = len(static_parameter_ids)
+    time_series_start = len(parameter_ids)
+    lookback = _lookback(model)
+    for model_path, name in model.time_series_parameters:
+        parameter_ids.extend(
+            TimeSeriesParameterId(model_path=model_path, name=name, time_step=time_step)
+            for time_step in range(-lookback, n_time_steps + 1)
+        )
+    slots = {parameter_id: slot for slot, parameter_id in enumerate(parameter_ids) if parameter_id != _TIME_STEP_ID}
+    layout = _SlotLayout(n_time_steps=n_time_steps, time_series_start=time_series_start, lookback=lookback)
+
+    def static_exec_info_input(exec_info_type: ExecInfoType) -> SlotConnectorABC | ConstantInput:
+        if exec_info_type == ExecInfoType.N_TIME_STEPS:
+            return ConstantInput(value=n_time_steps)
+        if exec_info_type == ExecInfoType.RNG:
+            return ScalarSlotConnector(slot=slots[RNG_ID])
+        msg = "Static relationships cannot depend on the time."
+        raise ValueError(msg)
+
+    def step_exec_info_input(exec_info_type: ExecInfoType) -> SlotConnectorABC | ConstantInput:
+        if exec_info_type == ExecInfoType.TIME:
+            return ScalarSlotConnector(slot=time_step_slot)
+        return static_exec_info_input(exec_info_type)
+
+    static_instructions: list[Instruction] = [
+        create_call_instruction(
+            relationship_id,
+            relationship_info,
+            slots,
+            exec_info_input=static_exec_info_input,
+            hooks=tuple(model.hooks),
+        )
+        for relationship_id, relationship_info in model.static_relationship_infos.items()
+    ]
+    static_instructions.extend(
+        CopyInstruction(source_slot=slots[source], target_slot=slots[target])
+        for source, target in model.static_port_mapping.items()
+    )
+    step_instructions: list[tuple[Instruction, range]] = [
+        (
+            create_call_instruction(
+                relationship_id,
+                relationship_info,
+                slots,
+                exec_info_input=step_exec_info_input,
+                hooks=tuple(model.hooks),
+            ),
+            time_steps,
+        )
+        for relationship_id, (relationship_info, time_steps) in model.step_relationship_infos.items()
+    ]
+    step_instructions.extend(
+        (CopyInstruction(source_slot=slots[source], target_slot=slots[target]), time_steps)
+        for port_mapping, time_steps in model.step_port_mappings
+        for source, target in port_mapping.items()
+    )
+
+    step_instructions = _order_step_instructions(step_instructions, layout)
+    pre_loop_instructions, post_loop_instructions = _split_static_instructions(
+        static_instructions,
+        step_instructions,
+        layout,
+    )
+
+    stop = create_stop_check(model._core_model, slots, n_time_steps=n_time_steps)  # noqa: SLF001
+
+    # Parameters that are not computed by any instruction must be given as inputs
+    written_static_slots = {slot for instruction in static_instructions for slot in instruction.iter_output_slots()}
+    written_static_slots.update(
+        slot
+        for instruction, _ in step_instructions
+        for slot in instruction.iter_output_slots()
+        if not layout.is_time_series(slot)
+    )
+    written_masks = layout.step_mask(step_instructions, "output")
+    read_masks = layout.step_mask(step_instructions, "input")
+    read_static_slots = {slot for instruction in static_instructions for slot in instruction.iter_input_slots()}
+    if stop is not None:
+        read_static_slots.update(stop.stop_slots)
+    required_input_slots = [slot for slot in range(time_step_slot) if slot not in written_static_slots]
+    for parameter_index in range(len(model.time_series_parameters)):
+        empty_mask = np.zeros(layout.n_slots_per_parameter, dtype=np.bool_)
+        written_mask = written_masks.get(parameter_index, empty_mask)
+        read_mask = read_masks.get(parameter_index, empty_mask)
+        first_slot = layout.first_slot(parameter_index)
+        # The time steps at which a value is read but not computed, e.g., not the last time step
+        # of a parameter only used to compute the next value of another parameter
+        required_input_slots.extend(
+            first_slot + index
+            for index in range(lookback, layout.n_slots_per_parameter - 1)
+            if not written_mask[index]
+            and (read_mask[index] or first_slot + index in read_static_slots)
+            and first_slot + index not in written_static_slots
+        )
+
+    # The columns only cover the time steps at which the parameters are in the unrolled model
+    static_slots = read_static_slots | written_static_slots
+    column_slots = {
+        parameter_id: slot
+        for parameter_id, slot in slots.items()
+        if slot in static_slots or any(layout.touches(slot, masks) for masks in (read_masks, written_masks))
+    }
+
+    return RolledExecutionPlan(
+        parameter_ids=tuple(parameter_ids),
+        slots=slots,
+        n_time_steps=n_time_steps,
+        time_series_start=time_series_start,
+        time_step_slot=time_step_slot,
+        required_input_slots=tuple(required_input_slots),
+        pre_loop_instructions=tuple(pre_loop_instructions),
+        step_instructions=tuple(step_instructions),
+        post_loop_instructions=tuple(post_loop_instructions),
+        stop=stop,
+        columns=create_time_series_columns(model._core_model, column_slots, n_time_steps=n_time_steps),  # noqa: SLF001
+        preset_values=_fold_preset_values(model, slots, n_slots=len(parameter_ids)),
+    )
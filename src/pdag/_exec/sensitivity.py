@@ -0,0 +1,211 @@
+import copy
+import multiprocessing
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from numbers import Real
+from typing import Any
+
+import polars as pl
+
+from pdag._core import RealParameter
+
+from .incremental import _clear_recomputed_values
+from .model import RNG_ID, ExecutionModel, ParameterId
+from .parallel import PoolType
+from .plan import ExecutionPlan, ResultsView
+
+# The plan, base values and output slots of the perturbations run by the worker processes.
+# They are set before the workers are forked.
+_worker_context: tuple[ExecutionPlan, list[Any], list[int]] | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class SensitivityResults:
+    """Finite-difference sensitivities of the outputs of a model to its inputs around a base case."""
+
+    base_results: dict[ParameterId, Any]
+    # Perturbation added to each input
+    steps: dict[ParameterId, float]
+    # Change of each output when each input is perturbed
+    deltas: dict[ParameterId, dict[ParameterId, float]]
+
+    def derivatives(self) -> dict[ParameterId, dict[ParameterId, float]]:
+        """Return the finite-difference derivative of each output with respect to each input."""
+        return {
+            input_id: {output_id: delta / self.steps[input_id] for output_id, delta in output_deltas.items()}
+            for input_id, output_deltas in self.deltas.items()
+        }
+
+    def to_df(self, *, derivatives: bool = False) -> pl.DataFrame:
+        """Export the deltas, or the derivatives if `derivatives` is `True`, as a DataFrame with a row per input."""
+        table = self.derivatives() if derivatives else self.deltas
+        return pl.DataFrame(
+            [
+                {"input": input_id.parameter_path_str, "step": self.steps[input_id]}
+                | {output_id.parameter_path_str: value for output_id, value in output_values.items()}
+                for input_id, output_values in table.items()
+            ],
+        )
+
+
+def _perturbed_outputs(
+    plan: ExecutionPlan,
+    base_values: list[Any],
+    output_slots: list[int],
+    slot: int,
+    value: float,
+) -> list[Any]:
+    """Re-execute only the instructions downstream of `slot` with its value replaced, and return the outputs.
+
+    If the plan has a random number generator, the instructions that draw from it are also executed again,
+    in the same order and from a copy of the generator in its state before the base execution,
+    so that they draw the same random numbers as in the base execution.
+    """
+    values = list(base_values)
+    values[slot] = value
+    changed_slots = {slot}
+    rng_slot = plan.slots.get(RNG_ID)
+    if rng_slot is not None:
+        values[rng_slot] = copy.deepcopy(values[rng_slot])
+        changed_slots.add(rng_slot)
+    instructions = [plan.instructions[index] for index in plan.downstream(changed_slots)]
+    _clear_recomputed_values(plan, values, instructions, changed_slots)
+    for instruction in instructions:
+        instruction.run(values)
+    return [values[output_slot] for output_slot in output_slots]
+
+
+def _init_worker(plan: ExecutionPlan, base_values: list[Any], output_slots: list[int]) -> None:
+    global _worker_context  # noqa: PLW0603
+    _worker_context = (plan, base_values, output_slots)
+
+
+def _perturbed_outputs_in_worker(slot: int, value: float) -> list[Any]:
+    assert _worker_context is not None
+    return _perturbed_outputs(*_worker_context, slot, value)
+
+
+def _perturbation_input_ids(
+    exec_model: ExecutionModel,
+    base_case: Mapping[ParameterId, Any],
+    parameter_ids: Iterable[ParameterId] | None,
+) -> list[ParameterId]:
+    real_input_ids = {
+        parameter_id
+        for parameter_id, parameter in exec_model.input_parameters().items()
+        if isinstance(parameter, RealParameter)
+    }
+    if parameter_ids is None:
+        return sorted(real_input_ids & base_case.keys(), key=lambda parameter_id: parameter_id.parameter_path_str)
+    parameter_ids = list(parameter_ids)
+    for parameter_id in parameter_ids:
+        if parameter_id not in real_input_ids:
+            msg = f"Parameter {parameter_id} is not a real input parameter of the model."
+            raise ValueError(msg)
+    return parameter_ids
+
+
+def _output_ids(
+    base_results: Mapping[ParameterId, Any],
+    input_ids: Iterable[ParameterId],
+    outputs: Iterable[ParameterId] | None,
+) -> list[ParameterId]:
+    if outputs is None:
+        # Every computed parameter with a real value
+        input_ids = set(input_ids)
+        return [
+            parameter_id
+            for parameter_id, value in base_results.items()
+            if parameter_id not in input_ids and isinstance(value, Real) and not isinstance(value, bool)
+        ]
+    outputs = list(outputs)
+    for parameter_id in outputs:
+        value = base_results.get(parameter_id)
+        if not isinstance(value, Real) or isinstance(value, bool):
+            msg = f"Output {parameter_id} does not have a real value in the base case."
+            raise TypeError(msg)
+    return outputs
+
+
+def execute_exec_model_sensitivity(  # noqa: PLR0913
+    exec_model: ExecutionModel,
+    base_case: Mapping[ParameterId, Any],
+    parameter_ids: Iterable[ParameterId] | None = None,
+    *,
+    outputs: Iterable[ParameterId] | None = None,
+    relative_step: float = 1e-6,
+    pool: PoolType | None = None,
+    max_workers: int | None = None,
+) -> SensitivityResults:
+    """Compute the finite-difference sensitivities of the outputs to the real inputs around `base_case`.
+
+    The base case is executed once, then each input in `parameter_ids` (by default, every input of a
+    [`RealParameter`][pdag.RealParameter] in the base case) is perturbed by `relative_step * max(|x|, 1)`.
+    Only the relationships downstream of the perturbed input are executed again; every other value is
+    taken from the base case.
+    The deltas are computed for `outputs` (by default, every other parameter with a real value).
+    If the model uses `ExecInfo("rng")`, the perturbed executions draw the same random numbers as the base execution.
+    If `pool` is given, the perturbations are run on a pool of `max_workers` workers,
+    which are forked with the process pool (see [`execute_exec_model_parallel`][pdag.execute_exec_model_parallel]).
+    """
+    plan = exec_model.compile()
+    if plan.stop is not None:
+        msg = "Models with a stop condition are not supported by sensitivity analysis."
+        raise ValueError(msg)
+    base_values = plan.initial_values(base_case)
+    rng_slot = plan.slots.get(RNG_ID)
+    # The generator is advanced by the base execution, so its state before it is kept for the perturbations
+    rng = copy.deepcopy(base_values[rng_slot]) if rng_slot is not None else None
+    for instruction in plan.instructions:
+        instruction.run(base_values)
+    base_results = ResultsView(plan.parameter_ids, plan.slots, base_values).to_dict()
+    if rng_slot is not None:
+        base_values[rng_slot] = rng
+
+    input_ids = _perturbation_input_ids(exec_model, base_case, parameter_ids)
+    output_ids = _output_ids(base_results, input_ids, outputs)
+    output_slots = [plan.slots[output_id] for output_id in output_ids]
+    steps = {input_id: relative_step * max(abs(base_case[input_id]), 1.0) for input_id in input_ids}
+    input_slots = [plan.slots[input_id] for input_id in input_ids]
+    perturbed_inputs = [base_case[input_id] + steps[input_id] for input_id in input_ids]
+
+    match pool:
+        case None:
+            perturbed = list(
+                map(partial(_perturbed_outputs, plan, base_values, output_slots), input_slots, perturbed_inputs),
+            )
+        case "thread":
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                perturbed = list(
+                    executor.map(
+                        partial(_perturbed_outputs, plan, base_values, output_slots),
+                        input_slots,
+                        perturbed_inputs,
+                    ),
+                )
+        case "process":
+            # Relationships are generally not picklable, so the workers are forked with the plan and base values
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(plan, base_values, output_slots),
+            ) as executor:
+                perturbed = list(executor.map(_perturbed_outputs_in_worker, input_slots, perturbed_inputs))
+        case _:
+            msg = f"Unknown pool type: {pool}"
+            raise ValueError(msg)
+
+    return SensitivityResults(
+        base_results=base_results,
+        steps=steps,
+        deltas={
+            input_id: {
+                output_id: value - base_values[output_slot]
+                for output_id, output_slot, value in zip(output_ids, output_slots, perturbed_outputs, strict=True)
+            }
+            for input_id, perturbed_outputs in zip(input_ids, perturbed, strict=True)
+        },
+    )
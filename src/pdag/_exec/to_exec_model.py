@@ -1,11 +1,13 @@
 from collections import defaultdict
 from collections.abc import Iterable
+from dataclasses import replace
 from typing import Any
 
 from pdag._core import (
     CoreModel,
     FunctionRelationship,
     ParameterABC,
+    RelationshipABC,
     SubModelRelationship,
 )
 from pdag._core.reference import ExecInfo
@@ -19,6 +21,7 @@ from .model import (
     ModelPathType,
     ParameterId,
     RelationshipId,
+    ScalarConnector,
     StaticParameterId,
     StaticRelationshipId,
     TimeSeriesParameterId,
@@ -97,6 +100,254 @@ def _iter_parameters_recursively(
             yield submodel_path, submodel, parameter
 
 
+def _time_steps_of_time_series_relationship(relationship: RelationshipABC, *, n_time_steps: int) -> range:
+    """Time steps at which a time-series relationship is evaluated."""
+    if relationship.includes_past and relationship.includes_future:
+        msg = "Relationships with both past and future dependencies are not supported."
+        raise ValueError(msg)
+    every = relationship.every if isinstance(relationship, FunctionRelationship) else 1
+    if relationship.includes_past:
+        return range(relationship.lookback, n_time_steps, every)
+    if relationship.includes_future:
+        return range(0, n_time_steps - 1, every)
+    return range(0, n_time_steps, every)
+
+
+def _resolve_hold_port_mappings(
+    relationship: FunctionRelationship[Any, Any],
+    *,
+    core_model: CoreModel,
+    model_path: ModelPathType,
+    time_steps: range,
+) -> list[tuple[dict[ParameterId, ParameterId], range]]:
+    """Port mappings that hold the time-series outputs of a relationship between the time steps it is evaluated at.
+
+    The time steps of the IDs are relative to the time steps at which each mapping is applied.
+    """
+    relationship_info = _resolve_time_series_function_relationship(
+        relationship,
+        core_model=core_model,
+        model_path=model_path,
+        time_step=0,
+    )
+    port_mapping: dict[ParameterId, ParameterId] = {
+        replace(output_parameter_id, time_step=output_parameter_id.time_step - 1): output_parameter_id
+        for connector in relationship_info.output_parameter_info
+        for output_parameter_id in connector.iter_parameter_ids()
+        if isinstance(output_parameter_id, TimeSeriesParameterId)
+    }
+    return [
+        (port_mapping, range(time_steps.start + offset, time_steps.stop, time_steps.step))
+        for offset in range(1, time_steps.step)
+    ]
+
+
+def _calculate_hold_port_mapping(
+    relationship: FunctionRelationship[Any, Any],
+    *,
+    core_model: CoreModel,
+    model_path: ModelPathType,
+    n_time_steps: int,
+) -> dict[ParameterId, ParameterId]:
+    port_mapping: dict[ParameterId, ParameterId] = {}
+    for relative_port_mapping, time_steps in _resolve_hold_port_mappings(
+        relationship,
+        core_model=core_model,
+        model_path=model_path,
+        time_steps=_time_steps_of_time_series_relationship(relationship, n_time_steps=n_time_steps),
+    ):
+        for time_step in time_steps:
+            port_mapping.update(
+                (
+                    replace(source, time_step=source.time_step + time_step),
+                    replace(target, time_step=target.time_step + time_step),
+                )
+                for source, target in relative_port_mapping.items()
+                if isinstance(source, TimeSeriesParameterId) and isinstance(target, TimeSeriesParameterId)
+            )
+    return port_mapping
+
+
+def _resolve_time_series_function_relationship(
+    relationship: FunctionRelationship[Any, Any],
+    *,
+    core_model: CoreModel,
+    model_path: ModelPathType,
+    time_step: int,
+) -> FunctionRelationshipInfo:
+    input_args: dict[str, ConnectorABC | ExecInfoType] = {}
+    for input_arg_name, input_parameter_ref in relationship.inputs.items():
+        if isinstance(input_parameter_ref, ExecInfo):
+            input_args[input_arg_name] = ExecInfoType.from_exec_info(input_parameter_ref)
+        else:
+            input_args[input_arg_name] = resolve_ref(
+                input_parameter_ref,
+                core_model=core_model,
+                model_path=model_path,
+                time_series_relationship=True,
+                time_step=time_step,
+            )
+
+    output_args = tuple(
+        resolve_ref(
+            output_parameter_ref,
+            core_model=core_model,
+            model_path=model_path,
+            time_series_relationship=True,
+            time_step=time_step,
+        )
+        for output_parameter_ref in relationship.outputs
+    )
+    return FunctionRelationshipInfo(
+        function_relationship=relationship,
+        input_parameter_info=input_args,
+        output_parameter_info=output_args,
+    )
+
+
+def _fold_accumulator_id(output_parameter_id: ParameterId, time_step: int) -> TimeSeriesParameterId:
+    """Hidden parameter that holds the accumulator of a fold relationship after a time step."""
+    assert isinstance(output_parameter_id, StaticParameterId)
+    return TimeSeriesParameterId(
+        model_path=output_parameter_id.model_path,
+        name=output_parameter_id.name,
+        time_step=time_step,
+    )
+
+
+def _fold_output_parameter_ids(relationship_info: FunctionRelationshipInfo) -> list[ParameterId]:
+    output_parameter_ids: list[ParameterId] = []
+    for connector in relationship_info.output_parameter_info:
+        if not isinstance(connector, ScalarConnector) or not isinstance(connector.parameter_id, StaticParameterId):
+            msg = (
+                f"The outputs of fold relationship {relationship_info.function_relationship.name} "
+                "must be static parameters."
+            )
+            raise ValueError(msg)  # noqa: TRY004
+        output_parameter_ids.append(connector.parameter_id)
+    return output_parameter_ids
+
+
+def _chain_fold_step(
+    relationship_info: FunctionRelationshipInfo,
+    *,
+    time_step: int,
+    time_steps: range,
+) -> FunctionRelationshipInfo:
+    """Connect a step of a fold relationship to the accumulators of the previous and next steps.
+
+    The step reads the hidden accumulators of the previous step and writes those of its time step,
+    except for the last step, which writes the outputs.
+    """
+    relationship = relationship_info.function_relationship
+    output_parameter_ids = _fold_output_parameter_ids(relationship_info)
+    input_parameter_info = dict(relationship_info.input_parameter_info)
+    for input_arg_name, input_parameter_ref in relationship.inputs.items():
+        if relationship.is_accumulator_ref(input_parameter_ref):
+            connector = input_parameter_info[input_arg_name]
+            assert isinstance(connector, ScalarConnector)
+            input_parameter_info[input_arg_name] = ScalarConnector(
+                _fold_accumulator_id(connector.parameter_id, time_step - time_steps.step),
+            )
+    if time_step == time_steps[-1]:
+        return replace(relationship_info, input_parameter_info=input_parameter_info)
+    return replace(
+        relationship_info,
+        input_parameter_info=input_parameter_info,
+        output_parameter_info=tuple(
+            ScalarConnector(_fold_accumulator_id(output_parameter_id, time_step))
+            for output_parameter_id in output_parameter_ids
+        ),
+    )
+
+
+def _fold_accumulators(
+    relationship_info: FunctionRelationshipInfo,
+    *,
+    time_steps: range,
+) -> tuple[dict[ParameterId, ParameterId], dict[ParameterId, Any]]:
+    """Map the hidden accumulators of a fold relationship to its outputs, and give the initial accumulators."""
+    accumulator_ids: dict[ParameterId, ParameterId] = {}
+    initial_values: dict[ParameterId, Any] = {}
+    for output_parameter_id, initial_value in zip(
+        _fold_output_parameter_ids(relationship_info),
+        relationship_info.function_relationship.fold_initial_values(),
+        strict=True,
+    ):
+        accumulator_ids.update(
+            (_fold_accumulator_id(output_parameter_id, time_step - time_steps.step), output_parameter_id)
+            for time_step in time_steps
+        )
+        initial_values[_fold_accumulator_id(output_parameter_id, time_steps.start - time_steps.step)] = initial_value
+    return accumulator_ids, initial_values
+
+
+def _resolve_time_series_port_mapping(
+    relationship: SubModelRelationship,
+    *,
+    core_model: CoreModel,
+    model_path: ModelPathType,
+    time_step: int,
+) -> dict[ParameterId, ParameterId]:
+    # parent model input to sub-model input / sub-model output to parent model input
+    port_mapping: dict[ParameterId, ParameterId] = {}
+
+    assert isinstance(relationship.name, str)
+    submodel_path = (*model_path, relationship.name)
+
+    for (
+        input_parameter_ref_inner,
+        input_parameter_ref_outer,
+    ) in relationship.inputs.items():
+        input_parameter_inner = resolve_ref(
+            input_parameter_ref_inner,
+            core_model=relationship.submodel,
+            model_path=submodel_path,
+            time_series_relationship=True,
+            time_step=time_step,
+        )
+        input_parameter_outer = resolve_ref(
+            input_parameter_ref_outer,
+            core_model=core_model,
+            model_path=model_path,
+            time_series_relationship=True,
+            time_step=time_step,
+        )
+        for input_parameter_id_inner, input_parameter_id_outer in zip(
+            input_parameter_inner.iter_parameter_ids(),
+            input_parameter_outer.iter_parameter_ids(),
+            strict=True,
+        ):
+            port_mapping[input_parameter_id_outer] = input_parameter_id_inner  # noqa: PERF403
+
+    for (
+        output_parameter_ref_inner,
+        output_parameter_ref_outer,
+    ) in relationship.outputs.items():
+        output_parameter_inner = resolve_ref(
+            output_parameter_ref_inner,
+            core_model=relationship.submodel,
+            model_path=submodel_path,
+            time_series_relationship=True,
+            time_step=time_step,
+        )
+        output_parameter_outer = resolve_ref(
+            output_parameter_ref_outer,
+            core_model=core_model,
+            model_path=model_path,
+            time_series_relationship=True,
+            time_step=time_step,
+        )
+        for output_parameter_id_inner, output_parameter_id_outer in zip(
+            output_parameter_inner.iter_parameter_ids(),
+            output_parameter_outer.iter_parameter_ids(),
+            strict=True,
+        ):
+            port_mapping[output_parameter_id_inner] = output_parameter_id_outer  # noqa: PERF403
+
+    return port_mapping
+
+
 def _calculate_dependencies_of_time_series_function_relationship(
     relationship: FunctionRelationship[Any, Any],
     *,
@@ -127,16 +378,7 @@ def _calculate_dependencies_of_time_series_function_relationship(
         FunctionRelationshipInfo,
     ] = {}
 
-    match relationship.includes_past, relationship.includes_future:
-        case True, True:
-            msg = "Relationships with both past and future dependencies are not supported."
-            raise ValueError(msg)
-        case True, False:
-            time_steps = list(range(1, n_time_steps))
-        case False, True:
-            time_steps = list(range(n_time_steps - 1))
-        case False, False:
-            time_steps = list(range(n_time_steps))
+    time_steps = _time_steps_of_time_series_relationship(relationship, n_time_steps=n_time_steps)
 
     for time_step in time_steps:
         relationship_id = TimeSeriesRelationshipId(
@@ -144,44 +386,25 @@ def _calculate_dependencies_of_time_series_function_relationship(
             name=relationship.name,
             time_step=time_step,
         )
-        input_args: dict[str, ConnectorABC | ExecInfoType] = {}
-        for input_arg_name, input_parameter_ref in relationship.inputs.items():
-            if isinstance(input_parameter_ref, ExecInfo):
-                exec_info_type = ExecInfoType.from_exec_info(input_parameter_ref)
-                input_args[input_arg_name] = exec_info_type
-            else:
-                input_connector = resolve_ref(
-                    input_parameter_ref,
-                    core_model=core_model,
-                    model_path=model_path,
-                    time_series_relationship=True,
-                    time_step=time_step,
-                )
-                for input_parameter_id in input_connector.iter_parameter_ids():
-                    input_parameter_id_to_relationship_ids_dd[input_parameter_id].add(
-                        relationship_id,
-                    )
-                input_args[input_arg_name] = input_connector
-
-        output_args: list[ConnectorABC] = []
-        for output_parameter_ref in relationship.outputs:
-            output_info = resolve_ref(
-                output_parameter_ref,
-                core_model=core_model,
-                model_path=model_path,
-                time_series_relationship=True,
+        function_relationship_info = _resolve_time_series_function_relationship(
+            relationship,
+            core_model=core_model,
+            model_path=model_path,
+            time_step=time_step,
+        )
+        if relationship.fold:
+            function_relationship_info = _chain_fold_step(
+                function_relationship_info,
                 time_step=time_step,
+                time_steps=time_steps,
             )
-            relationship_id_to_output_parameter_ids_dd[relationship_id].update(
-                output_info.iter_parameter_ids(),
-            )
-            output_args.append(output_info)
-
-        relationship_id_to_function_relationship_info[relationship_id] = FunctionRelationshipInfo(
-            function_relationship=relationship,
-            input_parameter_info=input_args,
-            output_parameter_info=tuple(output_args),
-        )
+        for connector in function_relationship_info.input_parameter_info.values():
+            if isinstance(connector, ConnectorABC):
+                for input_parameter_id in connector.iter_parameter_ids():
+                    input_parameter_id_to_relationship_ids_dd[input_parameter_id].add(relationship_id)
+        for connector in function_relationship_info.output_parameter_info:
+            relationship_id_to_output_parameter_ids_dd[relationship_id].update(connector.iter_parameter_ids())
+        relationship_id_to_function_relationship_info[relationship_id] = function_relationship_info
 
     return (
         dict(input_parameter_id_to_relationship_ids_dd),
@@ -274,71 +497,15 @@ def _calculate_port_mapping_of_time_series_submodel_relationship(
 ) -> dict[ParameterId, ParameterId]:
     # parent model input to sub-model input / sub-model output to parent model input
     port_mapping: dict[ParameterId, ParameterId] = {}
-
-    assert isinstance(relationship.name, str)
-    submodel_path = (*model_path, relationship.name)
-
-    match relationship.includes_past, relationship.includes_future:
-        case True, True:
-            msg = "Relationships with both past and future dependencies are not supported."
-            raise ValueError(msg)
-        case True, False:
-            time_steps = list(range(1, n_time_steps))
-        case False, True:
-            time_steps = list(range(n_time_steps - 1))
-        case False, False:
-            time_steps = list(range(n_time_steps))
-
-    for time_step in time_steps:
-        for (
-            input_parameter_ref_inner,
-            input_parameter_ref_outer,
-        ) in relationship.inputs.items():
-            input_parameter_inner = resolve_ref(
-                input_parameter_ref_inner,
-                core_model=relationship.submodel,
-                model_path=submodel_path,
-                time_series_relationship=True,
-                time_step=time_step,
-            )
-            input_parameter_outer = resolve_ref(
-                input_parameter_ref_outer,
+    for time_step in _time_steps_of_time_series_relationship(relationship, n_time_steps=n_time_steps):
+        port_mapping.update(
+            _resolve_time_series_port_mapping(
+                relationship,
                 core_model=core_model,
                 model_path=model_path,
-                time_series_relationship=True,
                 time_step=time_step,
-            )
-            for input_parameter_id_inner, input_parameter_id_outer in zip(
-                input_parameter_inner.iter_parameter_ids(),
-                input_parameter_outer.iter_parameter_ids(),
-                strict=True,
-            ):
-                port_mapping[input_parameter_id_outer] = input_parameter_id_inner  # noqa: PERF403
-
-        for (
-            output_parameter_ref_inner,
-            output_parameter_ref_outer,
-        ) in relationship.outputs.items():
-            output_parameter_inner = resolve_ref(
-                output_parameter_ref_inner,
-                core_model=relationship.submodel,
-                model_path=submodel_path,
-                time_series_relationship=True,
-                time_step=time_step,
-            )
-            output_parameter_outer = resolve_ref(
-                output_parameter_ref_outer,
-                core_model=core_model,
-                model_path=model_path,
-                time_series_relationship=True,
-                time_step=time_step,
-            )
-            for output_parameter_id_inner, output_parameter_id_outer in zip(
-                output_parameter_inner.iter_parameter_ids(),
-                output_parameter_outer.iter_parameter_ids(),
-                strict=True,
-            ):
-                port_mapping[output_parameter_id_inner] = output_parameter_id_outer  # noqa: PERF403
+            ),
+        )
 
     return port_mapping
 
@@ -435,6 +602,8 @@ def create_exec_model_from_core_model(
     input_parameter_id_to_relationship_ids: dict[ParameterId, set[RelationshipId]] = {}
     relationship_id_to_output_parameter_ids: dict[RelationshipId, set[ParameterId]] = {}
     port_mapping: dict[ParameterId, ParameterId] = {}
+    accumulator_ids: dict[ParameterId, ParameterId] = {}
+    fixed_values: dict[ParameterId, Any] = {}
 
     for (
         model_path,
@@ -452,6 +621,29 @@ def create_exec_model_from_core_model(
                 model_path=model_path,
                 n_time_steps=n_time_steps,
             )
+            time_steps = _time_steps_of_time_series_relationship(function_relationship, n_time_steps=n_time_steps)
+            if function_relationship.fold and time_steps:
+                accumulator_ids_local, initial_values = _fold_accumulators(
+                    relationships_local[
+                        TimeSeriesRelationshipId(
+                            model_path=model_path,
+                            name=function_relationship.name,
+                            time_step=time_steps[-1],
+                        )
+                    ],
+                    time_steps=time_steps,
+                )
+                accumulator_ids.update(accumulator_ids_local)
+                fixed_values.update(initial_values)
+            elif function_relationship.every > 1:
+                port_mapping.update(
+                    _calculate_hold_port_mapping(
+                        function_relationship,
+                        core_model=model,
+                        model_path=model_path,
+                        n_time_steps=n_time_steps,
+                    ),
+                )
         else:
             (
                 input_parameter_id_to_relationship_ids_local,
@@ -503,4 +695,6 @@ def create_exec_model_from_core_model(
         port_mapping=port_mapping,
         n_time_steps=n_time_steps,
         _core_model=core_model,
+        fixed_values=fixed_values,
+        accumulator_ids=accumulator_ids,
     )
@@ -1,9 +1,11 @@
+import copy
+import os
 from collections import defaultdict
-from collections.abc import Iterable, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from itertools import tee
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any
+from typing import Any, Literal
 
 import polars as pl
 import pyarrow as pa
@@ -12,9 +14,17 @@ from pyarrow import ipc
 from rich.console import Console
 
 import pdag
-from pdag._exec.model import ExecutionModel, ParameterId
+from pdag._exec.model import RNG_ID, BackendType, ExecutionModel, ParameterId
+from pdag._exec.profile import Profile
 
-from .runner import _infinite_empty_dict_generator
+from .runner import (
+    _CaseRunner,
+    _create_case_runner,
+    _deduplicate_cases,
+    _infinite_empty_dict_generator,
+    _ScenarioBranch,
+    _with_case_rngs,
+)
 
 console = Console()
 err_console = Console(stderr=True)
@@ -46,12 +56,88 @@ def _result_to_df_rows(
 
 
 def _task(
-    exec_model: pdag.ExecutionModel,
+    case_runner: _CaseRunner,
     case: Mapping[pdag.ParameterId, Any],
-    metadata: Mapping[str, Any],
+    metadata: Sequence[Mapping[str, Any]],
+    *,
+    case_index: int | None = None,
+    profile: Profile | None = None,
+) -> list[dict[str, Any]]:
+    # The rows are created for the metadata of each requested case that the executed case stands for
+    result = case_runner.run(case, case_index=case_index, profile=profile)
+    return [row for meta in metadata for row in _result_to_df_rows(result, meta)]
+
+
+def _branch_task(
+    case_runner: _CaseRunner,
+    branch: _ScenarioBranch,
+    metadata: Mapping[int, Sequence[Mapping[str, Any]]],
+    *,
+    profile: Profile | None = None,
+) -> list[dict[str, Any]]:
+    return [
+        row
+        for case_index, result in case_runner.run_scenario_tree(branch, profile=profile)
+        for meta in metadata[case_index]
+        for row in _result_to_df_rows(result, meta)
+    ]
+
+
+def _init_worker_profile(case_runner: _CaseRunner, worker_state: dict[str, Any]) -> None:  # noqa: ARG001
+    worker_state["profile"] = Profile()
+
+
+def _profiled_task(
+    case_runner: _CaseRunner,
+    worker_state: dict[str, Any],
+    **kwargs: Any,
+) -> list[dict[str, Any]]:
+    return _task(case_runner, **kwargs, profile=worker_state["profile"])
+
+
+def _profiled_branch_task(
+    case_runner: _CaseRunner,
+    worker_state: dict[str, Any],
+    **kwargs: Any,
 ) -> list[dict[str, Any]]:
-    result = pdag.execute_exec_model(exec_model, inputs=case)
-    return _result_to_df_rows(result, metadata)
+    return _branch_task(case_runner, **kwargs, profile=worker_state["profile"])
+
+
+def _exit_worker_profile(case_runner: _CaseRunner, worker_state: dict[str, Any]) -> Profile:  # noqa: ARG001
+    # The profile of each worker is sent back to the main process when the worker exits
+    return worker_state["profile"]  # type: ignore[no-any-return]
+
+
+def _branch_tasks(
+    case_runner: _CaseRunner,
+    cases: Iterable[Mapping[ParameterId, Any]],
+    metadata: Iterable[Sequence[Mapping[str, Any]]],
+    *,
+    profile: Profile | None,
+) -> list[dict[str, Any]]:
+    """Fork the scenario tree of the cases into a branch for each worker, at least, and create their tasks."""
+    indexed_cases: list[tuple[int, Mapping[ParameterId, Any]]] = []
+    metadata_by_index: dict[int, Sequence[Mapping[str, Any]]] = {}
+    for case_index, (case, meta) in enumerate(zip(cases, metadata, strict=False)):
+        indexed_cases.append((case_index, case))
+        metadata_by_index[case_index] = meta
+    branches = case_runner.fork_scenario_tree(_ScenarioBranch(indexed_cases), os.cpu_count() or 1, profile=profile)
+    return [
+        {"branch": branch, "metadata": {case_index: metadata_by_index[case_index] for case_index, _ in branch.cases}}
+        for branch in branches
+    ]
+
+
+def _metadata_of_distinct_cases(
+    case_indices: Iterable[int],
+    metadata: Iterable[Mapping[str, Any]],
+    n_distinct_cases: int,
+) -> list[list[Mapping[str, Any]]]:
+    """Collect the metadata of the requested cases that each distinct case stands for."""
+    metadata_of_cases: list[list[Mapping[str, Any]]] = [[] for _ in range(n_distinct_cases)]
+    for case_index, meta in zip(case_indices, metadata, strict=False):
+        metadata_of_cases[case_index].append(meta)
+    return metadata_of_cases
 
 
 def _write_batch(batch: list[dict[str, Any]], writer: ipc.RecordBatchFileWriter, schema: pa.Schema) -> None:
@@ -59,6 +145,28 @@ def _write_batch(batch: list[dict[str, Any]], writer: ipc.RecordBatchFileWriter,
     writer.write_table(table)
 
 
+def _sample_schema(
+    case_runner: _CaseRunner,
+    sample_case: Mapping[ParameterId, Any],
+    metadata: Sequence[Mapping[str, Any]],
+) -> pa.Schema:
+    """Run a sample case to get the schema of the results."""
+    if RNG_ID in sample_case:
+        # The sample case draws from a copy of its generator, so the case is run with the original draws later
+        sample_case = {**sample_case, RNG_ID: copy.deepcopy(sample_case[RNG_ID])}
+    sample_result = _task(case_runner, case=sample_case, metadata=metadata)
+    return pa.Table.from_pylist(sample_result).schema
+
+
+def _case_tasks(
+    cases: Iterable[Mapping[ParameterId, Any]],
+    metadata_of_cases: Iterable[Sequence[Mapping[str, Any]]],
+) -> Iterator[dict[str, Any]]:
+    """Create a task for each case."""
+    for case_index, (case, metadata) in enumerate(zip(cases, metadata_of_cases, strict=False)):
+        yield {"case": case, "metadata": metadata, "case_index": case_index}
+
+
 def run_experiments(  # noqa: PLR0913
     exec_model: ExecutionModel,
     cases: Iterable[Mapping[ParameterId, Any]],
@@ -67,13 +175,50 @@ def run_experiments(  # noqa: PLR0913
     n_cases: int | None = None,
     delete_arrow_file: bool = True,
     parquet_file_path: str | Path,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    profile: Profile | None = None,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None = None,
+    share_prefixes: bool = False,
+    deduplicate: bool = False,
+    seed: int | None = None,
 ) -> None:
-    cases_warmup, cases = tee(cases)
-    metadata_warmup, metadata = tee(metadata if metadata is not None else _infinite_empty_dict_generator())
+    """Run the cases on a pool of worker processes and write the results to a Parquet file.
 
-    # Create a sample result to get the schema
-    sample_result = _task(exec_model, case=next(iter(cases_warmup)), metadata=next(iter(metadata_warmup)))
-    schema = pa.Table.from_pylist(sample_result).schema
+    If `profile` is given, the calls of the relationships in all workers are recorded in it.
+    The hooks registered on the model are invoked in the worker processes.
+    If `constant_inputs` is given, the relationships that only depend on those inputs are executed once
+    before the workers are started (see `pdag.run_experiments`).
+    If `share_prefixes` is `True`, the cases are run as a scenario tree (see `pdag.run_experiments`),
+    which is forked in the main process until there is a branch for each worker to run.
+    If `deduplicate` is `True`, each distinct case is executed only once, and a row is written for each
+    requested case with its own metadata (see `pdag.run_experiments`).
+    If the model uses `ExecInfo("rng")`, each case is given its own generator derived from `seed` and the index
+    of the case (see `pdag.run_experiments`), so the results do not depend on the worker that runs the case.
+    """
+    if exec_model.uses_rng:
+        cases = _with_case_rngs(cases, seed)
+    metadata = metadata if metadata is not None else _infinite_empty_dict_generator()
+    metadata_of_cases: Iterable[Sequence[Mapping[str, Any]]]
+    if deduplicate:
+        cases, case_indices = _deduplicate_cases(cases)
+        n_cases = len(cases)
+        console.log(f"Executing {len(cases)} distinct cases out of {len(case_indices)} requested cases.")
+        metadata_of_cases = _metadata_of_distinct_cases(case_indices, metadata, len(cases))
+    else:
+        metadata_of_cases = ([meta] for meta in metadata)
+
+    # This compiles the model, so the workers forked below reuse the compiled executor.
+    case_runner, cases = _create_case_runner(
+        exec_model,
+        cases,
+        constant_inputs=constant_inputs,
+        outputs=outputs,
+        backend=backend,
+    )
+    cases_warmup, cases = tee(cases)
+    metadata_warmup, metadata_of_cases = tee(metadata_of_cases)
+    schema = _sample_schema(case_runner, next(iter(cases_warmup)), next(iter(metadata_warmup)))
 
     # Write the results to an Arrow file
     buffer = []
@@ -82,19 +227,36 @@ def run_experiments(  # noqa: PLR0913
         arrow_file_path = Path(temp_dir) / "results.arrow"
 
         with ipc.RecordBatchFileWriter(str(arrow_file_path), schema=schema) as writer:
-            with WorkerPool(shared_objects=exec_model) as pool:
+            with WorkerPool(shared_objects=case_runner, use_worker_state=profile is not None) as pool:
                 console.log(f"Running experiments and writing to {arrow_file_path}...")
+                task: Callable[..., list[dict[str, Any]]]
+                n_tasks: int | None
+                if share_prefixes:
+                    branch_tasks = _branch_tasks(case_runner, cases, metadata_of_cases, profile=profile)
+                    tasks: Iterable[dict[str, Any]] = branch_tasks
+                    task = _branch_task if profile is None else _profiled_branch_task
+                    n_tasks = len(branch_tasks)
+                else:
+                    tasks = _case_tasks(cases, metadata_of_cases)
+                    task = _task if profile is None else _profiled_task
+                    n_tasks = n_cases
                 for result in pool.imap_unordered(
-                    _task,
-                    ({"case": case, "metadata": meta} for case, meta in zip(cases, metadata, strict=False)),
-                    iterable_len=n_cases,
+                    task,
+                    tasks,
+                    iterable_len=n_tasks,
                     progress_bar=True,
+                    worker_init=None if profile is None else _init_worker_profile,
+                    worker_exit=None if profile is None else _exit_worker_profile,
                 ):
                     buffer.extend(result)
                     if len(buffer) >= batch_size:
                         _write_batch(buffer, writer, schema)
                         buffer.clear()
 
+                if profile is not None:
+                    for worker_profile in pool.get_exit_results():
+                        profile.merge(worker_profile)
+
             if buffer:
                 _write_batch(buffer, writer, schema)
 
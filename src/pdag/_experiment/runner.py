@@ -1,10 +1,15 @@
-from collections.abc import Generator, Iterable, Mapping
+from collections.abc import Generator, Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
 from typing import Any, Literal, overload
 
+import numpy as np
 import polars as pl
 from tqdm import tqdm
 
-from pdag._exec import ExecutionModel, ParameterId, execute_exec_model
+from pdag._exec import RNG_ID, ExecutionModel, ExecutionPlan, ExecutionState, ParameterId, Profile, TimeSeriesArrayId
+from pdag._exec.codegen import GeneratedExecutor
+from pdag._exec.model import BackendType
+from pdag._exec.plan import MISSING
 
 from .results import results_to_df
 
@@ -14,6 +19,327 @@ def _infinite_empty_dict_generator() -> Generator[dict[str, Any]]:
         yield {}
 
 
+def _same_value(a: Any, b: Any) -> bool:
+    if a is b:
+        return True
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        # E.g., the comparison of NumPy arrays
+        return False
+
+
+def _detect_constant_inputs(cases: Iterable[Mapping[ParameterId, Any]]) -> dict[ParameterId, Any]:
+    """Return the inputs that have the same value in all cases."""
+    constant_inputs: dict[ParameterId, Any] | None = None
+    for case in cases:
+        if constant_inputs is None:
+            constant_inputs = dict(case)
+            continue
+        constant_inputs = {
+            parameter_id: value
+            for parameter_id, value in constant_inputs.items()
+            if parameter_id in case and _same_value(case[parameter_id], value)
+        }
+    return constant_inputs if constant_inputs is not None else {}
+
+
+def _case_rng(seed_sequence: np.random.SeedSequence, case_index: int) -> np.random.Generator:
+    """Return the generator of a case, seeded with the `case_index`-th child that `seed_sequence` would spawn.
+
+    The child is created directly, so the generator only depends on the seed and the case index,
+    not on the order in which the cases are run or on the worker that runs them.
+    """
+    child = np.random.SeedSequence(
+        seed_sequence.entropy,
+        spawn_key=(*seed_sequence.spawn_key, case_index),
+        pool_size=seed_sequence.pool_size,
+    )
+    return np.random.default_rng(child)
+
+
+def _with_case_rngs(
+    cases: Iterable[Mapping[ParameterId, Any]],
+    seed: int | None,
+) -> Generator[Mapping[ParameterId, Any]]:
+    """Give each case that does not have a generator the one derived from `seed` and the index of the case."""
+    seed_sequence = np.random.SeedSequence(seed)
+    for case_index, case in enumerate(cases):
+        yield case if RNG_ID in case else {**case, RNG_ID: _case_rng(seed_sequence, case_index)}
+
+
+def _case_key(case: Mapping[ParameterId, Any]) -> Hashable | None:
+    """Return a key that is equal for the cases with the same inputs, or `None` if an input value is not hashable."""
+    try:
+        # The types are included so that, e.g., `True` and `1` are not merged
+        return frozenset((parameter_id, type(value), value) for parameter_id, value in case.items())
+    except TypeError:
+        return None
+
+
+def _deduplicate_cases(
+    cases: Iterable[Mapping[ParameterId, Any]],
+) -> tuple[list[Mapping[ParameterId, Any]], list[int]]:
+    """Return the distinct cases in the order of their first occurrence, and the distinct case index of each case."""
+    distinct_cases: list[Mapping[ParameterId, Any]] = []
+    distinct_case_indices: dict[Hashable, int] = {}
+    case_indices: list[int] = []
+    for case in cases:
+        key = _case_key(case)
+        # A case that cannot be hashed is kept as a distinct case
+        case_index = len(distinct_cases) if key is None else distinct_case_indices.setdefault(key, len(distinct_cases))
+        if case_index == len(distinct_cases):
+            distinct_cases.append(case)
+        case_indices.append(case_index)
+    return distinct_cases, case_indices
+
+
+@dataclass(slots=True)
+class _ScenarioBranch:
+    """Cases of a scenario tree that have the same inputs before `time_step`, with the execution paused there."""
+
+    cases: list[tuple[int, Mapping[ParameterId, Any]]]
+    state: ExecutionState | None = None
+    # Values computed before the state, which are not returned by the execution resumed from it
+    results: dict[ParameterId, Any] = field(default_factory=dict)
+
+    @property
+    def time_step(self) -> int:
+        return 0 if self.state is None else self.state.time_step
+
+
+def _group_cases(
+    cases: Iterable[tuple[int, Mapping[ParameterId, Any]]],
+    parameter_ids: Iterable[ParameterId],
+) -> list[list[tuple[int, Mapping[ParameterId, Any]]]]:
+    """Group the cases that have the same values for `parameter_ids`, keeping the order of the cases."""
+    parameter_ids = list(parameter_ids)
+    groups: list[list[tuple[int, Mapping[ParameterId, Any]]]] = []
+    group_values: list[tuple[Any, ...]] = []
+    group_indices: dict[tuple[Any, ...], int] = {}
+    unhashable_group_indices: list[int] = []
+    for indexed_case in cases:
+        values = tuple(indexed_case[1].get(parameter_id, MISSING) for parameter_id in parameter_ids)
+        try:
+            group_index = group_indices.setdefault(values, len(groups))
+        except (TypeError, ValueError):
+            # The values that cannot be hashed (e.g., NumPy arrays) are compared with those of the other such groups
+            group_index = next(
+                (index for index in unhashable_group_indices if all(map(_same_value, values, group_values[index]))),
+                len(groups),
+            )
+            if group_index == len(groups):
+                unhashable_group_indices.append(group_index)
+        if group_index == len(groups):
+            groups.append([])
+            group_values.append(values)
+        groups[group_index].append(indexed_case)
+    return groups
+
+
+def _input_slots(plan: ExecutionPlan, parameter_id: ParameterId) -> set[int]:
+    if isinstance(parameter_id, TimeSeriesArrayId):
+        column = plan.columns.get(parameter_id)
+        return set(column.iter_slots()) if column is not None else set()
+    slot = plan.slots.get(parameter_id)
+    return {slot} if slot is not None else set()
+
+
+@dataclass(slots=True)
+class _CaseRunner:
+    """Executor of the cases of an experiment, with the case-invariant relationships possibly hoisted."""
+
+    exec_model: ExecutionModel
+    executor: ExecutionPlan | GeneratedExecutor
+    # Slots read or written by the instructions of each time step of the stepwise plan
+    _step_slots: list[set[int]] | None = field(default=None, init=False, repr=False)
+
+    def run(
+        self,
+        case: Mapping[ParameterId, Any],
+        *,
+        case_index: int | None = None,
+        profile: Profile | None = None,
+    ) -> dict[ParameterId, Any]:
+        """Execute a case, invoking the case hooks registered on the model if `case_index` is given."""
+        if case_index is not None:
+            for hooks in self.exec_model.hooks:
+                hooks.case_start(case_index, case)
+        results = self.executor.execute(case, profile=profile).to_dict()
+        results.pop(RNG_ID, None)
+        if case_index is not None:
+            for hooks in self.exec_model.hooks:
+                hooks.case_end(case_index, results)
+        return results
+
+    def _stepwise_plan(self) -> ExecutionPlan:
+        plan = self.executor if isinstance(self.executor, ExecutionPlan) else self.executor.plan
+        return plan.stepwise()
+
+    def _step_input_ids(self, parameter_ids: Iterable[ParameterId]) -> list[set[ParameterId]]:
+        """Return the parameters among `parameter_ids` whose values are used at each time step."""
+        plan = self._stepwise_plan()
+        if self._step_slots is None:
+            # An input written at a time step is also used there, as it takes the place of the computed value
+            self._step_slots = [
+                {
+                    slot
+                    for instruction in plan.instructions[start:end]
+                    for slot in (*instruction.iter_input_slots(), *instruction.iter_output_slots())
+                }
+                for start, end in zip((0, *plan.step_ends[:-1]), plan.step_ends, strict=True)
+            ]
+        input_slots = {parameter_id: _input_slots(plan, parameter_id) for parameter_id in parameter_ids}
+        return [
+            {parameter_id for parameter_id, slots in input_slots.items() if not slots.isdisjoint(step_slots)}
+            for step_slots in self._step_slots
+        ]
+
+    def _is_leaf(self, branch: _ScenarioBranch) -> bool:
+        return len(branch.cases) <= 1 or branch.time_step == self._stepwise_plan().n_time_steps
+
+    def fork(self, branch: _ScenarioBranch, *, profile: Profile | None = None) -> list[_ScenarioBranch]:
+        """Run the time steps at which the cases of `branch` use the same inputs once, and fork it where they diverge.
+
+        If the cases diverge at the first time step of the branch, that time step is run once for each group
+        of cases with the same inputs.
+        """
+        plan = self._stepwise_plan()
+        step_input_ids = self._step_input_ids({parameter_id for _, case in branch.cases for parameter_id in case})
+        groups = [branch.cases]
+        shared_input_ids: set[ParameterId] = set()
+        stop_step = branch.time_step
+        while stop_step < len(step_input_ids) and len(groups) == 1:
+            # The cases have the same values for the inputs shared so far
+            step_groups = _group_cases(branch.cases, step_input_ids[stop_step])
+            if len(step_groups) > 1 and stop_step > branch.time_step:
+                # The shared time steps are run first, and the branch is forked from their state
+                break
+            groups = step_groups
+            shared_input_ids |= step_input_ids[stop_step]
+            stop_step += 1
+
+        forks: list[_ScenarioBranch] = []
+        for group in groups:
+            case = group[0][1]
+            results = plan.execute(
+                {parameter_id: case[parameter_id] for parameter_id in shared_input_ids if parameter_id in case},
+                state=branch.state,
+                stop_step=stop_step,
+                profile=profile,
+            )
+            forks.append(
+                _ScenarioBranch(group, plan.checkpoint(results, stop_step), branch.results | results.to_dict()),
+            )
+        return forks
+
+    def _run_leaf(
+        self,
+        branch: _ScenarioBranch,
+        *,
+        profile: Profile | None,
+    ) -> Generator[tuple[int, dict[ParameterId, Any]]]:
+        parameter_ids = self._stepwise_plan().parameter_ids
+        for case_index, case in branch.cases:
+            for hooks in self.exec_model.hooks:
+                hooks.case_start(case_index, case)
+            merged_results = branch.results | self.executor.execute(case, profile=profile, state=branch.state).to_dict()
+            results = {
+                parameter_id: merged_results[parameter_id]
+                for parameter_id in parameter_ids
+                if parameter_id in merged_results and parameter_id != RNG_ID
+            }
+            for hooks in self.exec_model.hooks:
+                hooks.case_end(case_index, results)
+            yield case_index, results
+
+    def run_scenario_tree(
+        self,
+        branch: _ScenarioBranch,
+        *,
+        profile: Profile | None = None,
+    ) -> Generator[tuple[int, dict[ParameterId, Any]]]:
+        """Execute the cases of `branch`, running the time steps shared by several cases once.
+
+        The index and results of each case are yielded as the case is finished.
+        """
+        stack = [branch]
+        while stack:
+            branch = stack.pop()
+            if self._is_leaf(branch):
+                yield from self._run_leaf(branch, profile=profile)
+            else:
+                stack.extend(reversed(self.fork(branch, profile=profile)))
+
+    def fork_scenario_tree(
+        self,
+        branch: _ScenarioBranch,
+        n_branches: int,
+        *,
+        profile: Profile | None = None,
+    ) -> list[_ScenarioBranch]:
+        """Fork `branch` breadth-first until there are at least `n_branches` branches or none can be forked."""
+        branches = [branch]
+        while len(branches) < n_branches and not all(self._is_leaf(branch) for branch in branches):
+            branches = [
+                fork
+                for branch in branches
+                for fork in ([branch] if self._is_leaf(branch) else self.fork(branch, profile=profile))
+            ]
+        return branches
+
+
+def _run_scenario_tree(
+    case_runner: _CaseRunner,
+    cases: Iterable[Mapping[ParameterId, Any]],
+    *,
+    profile: Profile | None,
+) -> list[dict[ParameterId, Any]]:
+    """Execute the cases as a scenario tree and return the results in the order of the cases."""
+    indexed_cases = list(enumerate(cases))
+    results: list[dict[ParameterId, Any]] = [{} for _ in indexed_cases]
+    with tqdm(total=len(indexed_cases)) as progress_bar:
+        for case_index, case_results in case_runner.run_scenario_tree(_ScenarioBranch(indexed_cases), profile=profile):
+            results[case_index] = case_results
+            progress_bar.update()
+    return results
+
+
+def _create_case_runner[T: Iterable[Mapping[ParameterId, Any]]](
+    exec_model: ExecutionModel,
+    cases: T,
+    *,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None,
+    outputs: Iterable[ParameterId] | None,
+    backend: BackendType,
+) -> tuple[_CaseRunner, T | list[Mapping[ParameterId, Any]]]:
+    """Create the runner of the cases, hoisting the relationships that only depend on `constant_inputs`.
+
+    If `constant_inputs` is `"detect"`, the cases are collected into a list to detect the constant inputs,
+    and the list is returned in place of `cases`.
+    """
+    if constant_inputs is None:
+        return _CaseRunner(exec_model, exec_model.compile(backend, outputs=outputs)), cases
+    if constant_inputs == "detect":
+        cases_list = list(cases)
+        return _create_case_runner(
+            exec_model,
+            cases_list,
+            constant_inputs=_detect_constant_inputs(cases_list),
+            outputs=outputs,
+            backend=backend,
+        )
+    plan = exec_model.compile(outputs=outputs).hoist(constant_inputs)
+    match backend:
+        case "interpreter":
+            return _CaseRunner(exec_model, plan), cases
+        case "codegen":
+            return _CaseRunner(exec_model, GeneratedExecutor(plan)), cases
+        case _:
+            msg = f"Invalid backend: {backend}"
+            raise ValueError(msg)
+
+
 @overload
 def run_experiments(
     exec_model: ExecutionModel,
@@ -22,6 +348,13 @@ def run_experiments(
     metadata: Iterable[Mapping[str, Any]],
     return_type: Literal["list"],
     n_cases: int | None = None,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    profile: Profile | None = None,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None = None,
+    share_prefixes: bool = False,
+    deduplicate: bool = False,
+    seed: int | None = None,
 ) -> list[dict[ParameterId, Any]]: ...
 @overload
 def run_experiments(
@@ -31,6 +364,13 @@ def run_experiments(
     metadata: None = None,
     return_type: Literal["list"],
     n_cases: int | None = None,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    profile: Profile | None = None,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None = None,
+    share_prefixes: bool = False,
+    deduplicate: bool = False,
+    seed: int | None = None,
 ) -> list[dict[ParameterId | str, Any]]: ...
 @overload
 def run_experiments(
@@ -40,26 +380,85 @@ def run_experiments(
     metadata: Iterable[Mapping[str, Any]] | None = None,
     return_type: Literal["polars"] = "polars",
     n_cases: int | None = None,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    profile: Profile | None = None,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None = None,
+    share_prefixes: bool = False,
+    deduplicate: bool = False,
+    seed: int | None = None,
 ) -> pl.DataFrame: ...
 
 
-def run_experiments(
+def run_experiments(  # noqa: PLR0913
     exec_model: ExecutionModel,
     cases: Iterable[Mapping[ParameterId, Any]],
     *,
     metadata: Iterable[Mapping[str, Any]] | None = None,
     return_type: Literal["list", "polars"] = "polars",
     n_cases: int | None = None,
+    outputs: Iterable[ParameterId] | None = None,
+    backend: BackendType = "interpreter",
+    profile: Profile | None = None,
+    constant_inputs: Mapping[ParameterId, Any] | Literal["detect"] | None = None,
+    share_prefixes: bool = False,
+    deduplicate: bool = False,
+    seed: int | None = None,
 ) -> list[dict[ParameterId, Any]] | list[dict[ParameterId | str, Any]] | pl.DataFrame:
-    results_iter = (
-        execute_exec_model(
-            exec_model,
-            inputs=case,
+    """Run the cases and collect the results.
+
+    If `constant_inputs` is given, the relationships that only depend on those inputs are executed once
+    and their results are reused in all cases. It is either a mapping of the inputs that have the same value
+    in all cases, or `"detect"` to detect them from the cases, which are then collected into a list first.
+    The calls of the hoisted relationships are neither recorded in `profile` nor repeated for each case.
+
+    If `share_prefixes` is `True`, the cases are run as a scenario tree: the time steps at which several cases
+    use the same inputs, e.g., before a decision parameter is first read, are executed once, and the execution
+    is forked from a checkpoint where the inputs of the cases diverge. The cases are collected into a list first,
+    and the case hooks are invoked when each case is finished, after the relationships of its shared time steps.
+
+    If `deduplicate` is `True`, each distinct case is executed only once and its results are copied to its
+    duplicates, each with its own metadata. The cases are collected into a list first, and the numbers of executed
+    and requested cases are reported. The case hooks are only invoked for the distinct cases, which are numbered
+    in the order of their first occurrence. Cases with unhashable input values, e.g., arrays, are never merged.
+
+    If the model uses `ExecInfo("rng")`, each case is given its own generator as the input
+    [`RNG_ID`][pdag.RNG_ID] (unless the case has one), which is derived from `seed` and the index of the case
+    as if spawned from `numpy.random.SeedSequence(seed)`. The results are then reproducible for a given `seed`,
+    regardless of how the cases are run. The generators are not in the results, and as each case has its own
+    generator, no cases are merged by `deduplicate` and no time steps drawing random numbers are shared.
+    """
+    if exec_model.uses_rng:
+        cases = _with_case_rngs(cases, seed)
+    case_indices: list[int] | None = None
+    if deduplicate:
+        cases, case_indices = _deduplicate_cases(cases)
+        n_cases = len(cases)
+        tqdm.write(f"Executing {len(cases)} distinct cases out of {len(case_indices)} requested cases.")
+    case_runner, cases = _create_case_runner(
+        exec_model,
+        cases,
+        constant_inputs=constant_inputs,
+        outputs=outputs,
+        backend=backend,
+    )
+    case_results: Iterable[dict[ParameterId, Any]]
+    if share_prefixes:
+        case_results = _run_scenario_tree(case_runner, cases, profile=profile)
+    else:
+        case_results = (
+            case_runner.run(case, case_index=case_index, profile=profile)
+            for case_index, case in enumerate(tqdm(cases, total=n_cases))
         )
-        | {"metadata": mtd}
-        for case, mtd in tqdm(
-            zip(cases, metadata if metadata is not None else _infinite_empty_dict_generator(), strict=False),
-            total=n_cases,
+    if case_indices is not None:
+        distinct_results = list(case_results)
+        case_results = (distinct_results[case_index] for case_index in case_indices)
+    results_iter = (
+        results | {"metadata": mtd}
+        for mtd, results in zip(
+            metadata if metadata is not None else _infinite_empty_dict_generator(),
+            case_results,
+            strict=False,
         )
     )
     match return_type:
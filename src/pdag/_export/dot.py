@@ -87,7 +87,7 @@ def to_dot_graph(core_model: CoreModel, *, model_element_id: str | None = None)
                     added_exec_infos.add(input_ref.attribute)
                 graph.add_edge(pydot.Edge(input_ref.attribute, name))
             else:
-                style = "dashed" if input_ref.previous else "solid"
+                style = "dashed" if input_ref.lookback > 0 else "solid"
                 graph.add_edge(pydot.Edge(input_ref.name, name, style=style))
 
         for output_ref in relationship.iter_output_refs():
@@ -107,7 +107,7 @@ def to_dot_graph(core_model: CoreModel, *, model_element_id: str | None = None)
                     if isinstance(input_ref, ExecInfo):
                         input_params.add(("execinfo", input_ref.attribute, False))
                     else:
-                        input_params.add(("param", input_ref.name, input_ref.previous))
+                        input_params.add(("param", input_ref.name, input_ref.lookback > 0))
 
                 for output_ref in item.iter_output_refs():
                     output_params.add(("param", output_ref.name, output_ref.next))
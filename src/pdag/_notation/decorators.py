@@ -1,14 +1,16 @@
 import inspect
 from collections.abc import Callable, Hashable
 from types import EllipsisType
-from typing import Literal, get_args, get_origin, overload
+from typing import Any, Literal, get_args, get_origin, overload
 
 from typing_extensions import _AnnotatedAlias
 
 from pdag._core import (
     ExecInfo,
     FunctionRelationship,
+    ParameterRef,
     ReferenceABC,
+    RelationshipCache,
 )
 from pdag._utils import MultiDefProtocol, get_function_body, multidef
 
@@ -71,12 +73,82 @@ def _get_inputs_from_signature(
     }
 
 
+def _check_options(
+    *,
+    at_each_time_step: bool,
+    vectorized: bool,
+    every: int,
+    fold: bool,
+    cache: bool | int,
+) -> None:
+    if cache is not False and vectorized:
+        msg = "Vectorized relationships cannot be cached."
+        raise ValueError(msg)
+    if fold and cache is not False:
+        msg = "Fold relationships cannot be cached."
+        raise ValueError(msg)
+    if every < 1:
+        msg = "every must be positive."
+        raise ValueError(msg)
+    if every != 1 and not (at_each_time_step or fold):
+        msg = "every can only be set for relationships evaluated at each time step."
+        raise ValueError(msg)
+
+
+def _check_fold_signature(
+    name: str,
+    inputs: dict[str, ReferenceABC | ExecInfo],
+    outputs: list[ReferenceABC],
+    *,
+    output_is_scalar: bool,
+    initial: Any,
+) -> None:
+    if not output_is_scalar and (not isinstance(initial, tuple) or len(initial) != len(outputs)):
+        msg = f"The initial value of fold relationship {name} must be a tuple with a value for each output."
+        raise ValueError(msg)
+    accumulator_names = [ref.name for ref in inputs.values() if isinstance(ref, ParameterRef) and ref.previous]
+    for output_ref in outputs:
+        if not isinstance(output_ref, ParameterRef) or not output_ref.normal:
+            msg = f"The outputs of fold relationship {name} must be references to parameters."
+            raise ValueError(msg)
+        if accumulator_names.count(output_ref.name) != 1:
+            msg = (
+                f"Output {output_ref.name} of fold relationship {name} must also be "
+                "an input referred to with `previous=True`."
+            )
+            raise ValueError(msg)
+
+
+def _is_coroutine_function(func: Callable[..., Any]) -> bool:
+    if isinstance(func, staticmethod):
+        func = func.__func__
+    return inspect.iscoroutinefunction(func)
+
+
+def _create_cache(cache: bool | int, cache_key: Callable[..., Hashable] | None) -> RelationshipCache | None:  # noqa: FBT001
+    if cache is False:
+        if cache_key is not None:
+            msg = "cache_key is given but cache is not enabled."
+            raise ValueError(msg)
+        return None
+    maxsize = RelationshipCache.maxsize if cache is True else cache
+    if cache_key is None:
+        return RelationshipCache(maxsize=maxsize)
+    return RelationshipCache(maxsize=maxsize, key=cache_key)
+
+
 @overload
 def relationship[**P, T](
     func: Callable[P, T],
     *,
     identifier: None = None,
     at_each_time_step: Literal[False] = False,
+    vectorized: Literal[False] = False,
+    every: Literal[1] = 1,
+    fold: Literal[False] = False,
+    initial: Any = None,
+    cache: bool | int = False,
+    cache_key: Callable[..., Hashable] | None = None,
 ) -> FunctionRelationship[P, T]: ...
 
 
@@ -86,20 +158,63 @@ def relationship[**P, T](
     *,
     identifier: Hashable = None,
     at_each_time_step: bool = False,
+    vectorized: bool = False,
+    every: int = 1,
+    fold: bool = False,
+    initial: Any = None,
+    cache: bool | int = False,
+    cache_key: Callable[..., Hashable] | None = None,
 ) -> Callable[[Callable[P, T]], FunctionRelationship[P, T]]: ...
 
 
-def relationship[**P, T](
+def relationship[**P, T](  # noqa: PLR0913
     func: Callable[P, T] | None = None,
     *,
     identifier: Hashable = None,
     at_each_time_step: bool = False,
+    vectorized: bool = False,
+    every: int = 1,
+    fold: bool = False,
+    initial: Any = None,
+    cache: bool | int = False,
+    cache_key: Callable[..., Hashable] | None = None,
 ) -> (
     FunctionRelationship[P, T]
     | Callable[[Callable[P, T]], FunctionRelationship[P, T]]
     | Callable[[Callable[P, T]], MultiDefProtocol[Hashable, FunctionRelationship[P, T]]]
 ):
-    """Decorate a function to mark it as a relationship."""
+    """Decorate a function to mark it as a relationship.
+
+    If `vectorized` is `True`, the function is called with the values of many cases at once:
+    each argument is a NumPy array of shape `(n_cases, ...)` (or a mapping or list of such arrays)
+    and each return value must be an array of the same leading dimension.
+    `ExecInfo` arguments are passed as scalars.
+
+    If `cache` is set, the results of the function are memoized in a
+    [`RelationshipCache`][pdag.RelationshipCache] that keeps the `cache` most recently used results
+    (`True` for the default size).
+    Results are keyed by the arguments, or by `cache_key(**kwargs)` if given,
+    which is needed for arguments that the default key does not support (see
+    [`hash_arguments_key`][pdag.hash_arguments_key]).
+    The counters of the cache are available through the `cache` attribute of the relationship.
+
+    Coroutine functions (`async def`) are detected automatically.
+    They are awaited concurrently by [`execute_exec_model_async`][pdag.execute_exec_model_async]
+    and run to completion one at a time by the other executors,
+    which therefore cannot run them while an event loop is running (e.g., in Jupyter).
+
+    If `every` is set for a relationship evaluated at each time step, it is only evaluated every `every` time steps,
+    starting from the first time step at which it can be evaluated.
+    Its time-series outputs hold their last values at the time steps in between.
+
+    If `fold` is `True`, the relationship is a fold over the time steps: it is called at each time step
+    to update the values of its outputs, which must be static parameters, so that a running aggregate
+    (e.g., the sum of a time-series parameter) is computed without gathering the values at all time steps.
+    Each output must also be an input referred to with `previous=True`, which receives the value of the output
+    after the previous time step, or `initial` (a tuple for multiple outputs) at the first time step.
+    If the time loop stops early, the outputs keep their values at the stop.
+    """
+    _check_options(at_each_time_step=at_each_time_step, vectorized=vectorized, every=every, fold=fold, cache=cache)
 
     def decorator(
         func: Callable[P, T],
@@ -111,6 +226,12 @@ def relationship[**P, T](
         inputs = _get_inputs_from_signature(sig)
         outputs, output_is_scalar = _get_outputs_from_signature(sig)
         function_body = get_function_body(func)
+        is_async = _is_coroutine_function(func)
+        if is_async and (vectorized or cache is not False):
+            msg = "Async relationships cannot be vectorized or cached."
+            raise ValueError(msg)
+        if fold:
+            _check_fold_signature(func.__name__, inputs, outputs, output_is_scalar=output_is_scalar, initial=initial)
         return FunctionRelationship(
             _name=func.__name__ if _relationship_name is None else _relationship_name,
             inputs=inputs,
@@ -118,7 +239,13 @@ def relationship[**P, T](
             function_body=function_body,
             output_is_scalar=output_is_scalar,
             _function=func,
-            at_each_time_step=at_each_time_step,
+            at_each_time_step=at_each_time_step or fold,
+            vectorized=vectorized,
+            is_async=is_async,
+            every=every,
+            fold=fold,
+            fold_initial=initial,
+            cache=_create_cache(cache, cache_key),
         )
 
     if func is not None:
@@ -10,6 +10,7 @@ from pdag._core import (
     ParameterABC,
     ReferenceABC,
     RelationshipABC,
+    StopCondition,
     SubModelRelationship,
 )
 from pdag._utils.multidef import MultiDef, MultiDefMeta, MultiDefStorage
@@ -69,6 +70,13 @@ class ModelMeta(MultiDefMeta):
             if isinstance(relationship, RelationshipABC):
                 cls.__pdag_relationships__[relationship_name] = relationship
 
+        # Add the stop condition, if any
+        stop_conditions = [value for value in namespace.values() if isinstance(value, StopCondition)]
+        if len(stop_conditions) > 1:
+            msg = f"Model {name} has more than one stop condition."
+            raise ValueError(msg)
+        cls.__pdag_stop_condition__ = stop_conditions[0] if stop_conditions else None
+
         return cls
 
 
@@ -77,6 +85,7 @@ class Model(MultiDef, metaclass=ModelMeta):
     __pdag_parameters__: dict[str, ParameterABC[Any]]
     __pdag_relationships__: dict[str, RelationshipABC]
     __pdag_collections__: dict[str, CollectionABC[Any, Any]]
+    __pdag_stop_condition__: StopCondition | None
 
     @classmethod
     def parameters(cls) -> dict[str, ParameterABC[Any]]:
@@ -97,6 +106,7 @@ class Model(MultiDef, metaclass=ModelMeta):
             parameters=cls.parameters(),
             collections=cls.collections(),
             relationships=cls.relationships(),
+            stop_condition=cls.__pdag_stop_condition__,
         )
 
     @classmethod
@@ -8,6 +8,7 @@ __all__ = [
     "get_function_body",
     "merge_two_set_dicts",
     "multidef",
+    "topological_levels",
     "topological_sort",
 ]
 
@@ -15,4 +16,4 @@ from .ast_utils import get_function_body
 from .dict_utils import merge_two_set_dicts
 from .init_args_recorder import InitArgsRecorder
 from .multidef import MultiDef, MultiDefMeta, MultiDefProtocol, multidef
-from .topological_sort import topological_sort
+from .topological_sort import topological_levels, topological_sort
@@ -79,7 +79,7 @@ def get_function_body(func: Callable[..., Any]) -> str:
     # Locate the first FunctionDef node in the AST.
     function_node = None
     for node in ast.walk(atok.tree):  # type: ignore[arg-type]
-        if isinstance(node, ast.FunctionDef):
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
             function_node = node
             break
     if function_node is None:
@@ -27,3 +27,35 @@ def topological_sort[T: Hashable](dependencies: Mapping[T, Collection[T]]) -> li
         msg = "Cycle detected in relationship dependencies!"
         raise ValueError(msg)
     return order
+
+
+def topological_levels[T: Hashable](dependencies: Mapping[T, Collection[T]]) -> list[list[T]]:
+    """Group a graph of dependencies into topological levels.
+
+    Takes the same dependency graph as `topological_sort`.
+    Each node is placed in the level right after the last level of the nodes it depends on,
+    so the nodes in a level do not depend on each other.
+    Raises an error if a cycle is detected.
+    """
+    indegree: defaultdict[T, int] = defaultdict(int)
+    for node, deps in dependencies.items():
+        indegree[node] = indegree.get(node, 0)
+        for dep in deps:
+            indegree[dep] += 1
+    level = [node for node, deg in indegree.items() if deg == 0]
+    levels = []
+    n_sorted = 0
+    while level:
+        levels.append(level)
+        n_sorted += len(level)
+        next_level = []
+        for node in level:
+            for dep in dependencies.get(node, []):
+                indegree[dep] -= 1
+                if indegree[dep] == 0:
+                    next_level.append(dep)
+        level = next_level
+    if n_sorted != len(indegree):
+        msg = "Cycle detected in relationship dependencies!"
+        raise ValueError(msg)
+    return levels
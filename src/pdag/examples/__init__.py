@@ -8,6 +8,7 @@ __all__ = [
     "DiamondMdpModel",
     "EachSquaredModel",
     "PolynomialModel",
+    "SavingsModel",
     "SquareModel",
     "TreasureModel",
     "TwoSquares",
@@ -16,6 +17,7 @@ __all__ = [
 from ._diamond_mdp import DiamondMdpModel
 from ._each_squared import EachSquaredModel
 from ._polynomials import PolynomialModel
+from ._savings import SavingsModel
 from ._square import SquareModel
 from ._squares import TwoSquares
 from ._treasure import TreasureModel
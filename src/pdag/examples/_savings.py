@@ -0,0 +1,43 @@
+from typing import Annotated
+
+import pdag
+
+
+class SavingsModel(pdag.Model):
+    """Savings account that earns interest on its balance and receives a deposit at each time step."""
+
+    interest_rate = pdag.RealParameter("interest_rate", lower_bound=0.0, upper_bound=0.1)
+    deposit = pdag.RealParameter("deposit", is_time_series=True)
+    balance = pdag.RealParameter("balance")
+
+    # `fold=True` indicates that the relationship is called at each time step to update `balance`,
+    # starting from `initial`, so the deposits at all time steps do not have to be gathered at once.
+    @pdag.relationship(fold=True, initial=0.0)
+    @staticmethod
+    def update_balance(
+        *,
+        interest_rate: Annotated[float, interest_rate.ref()],
+        # `previous=True` on the output of a fold relationship indicates that
+        # the value updated at the previous time step will be provided.
+        balance: Annotated[float, balance.ref(previous=True)],
+        deposit: Annotated[float, deposit.ref()],
+    ) -> Annotated[float, balance.ref()]:
+        return balance * (1 + interest_rate) + deposit
+
+
+if __name__ == "__main__":
+    from rich import print  # noqa: A004
+
+    core_model = SavingsModel.to_core_model()
+    exec_model = pdag.create_exec_model_from_core_model(core_model, n_time_steps=3)
+    results = pdag.execute_exec_model(
+        exec_model,
+        inputs={
+            pdag.StaticParameterId((), "interest_rate"): 0.05,
+            pdag.TimeSeriesParameterId((), "deposit", 0): 100.0,
+            pdag.TimeSeriesParameterId((), "deposit", 1): 100.0,
+            pdag.TimeSeriesParameterId((), "deposit", 2): 100.0,
+        },
+    )
+
+    print(results)
@@ -0,0 +1,155 @@
+"""Lists and NumPy arrays passed to and returned from relationships through array connectors."""
+
+from typing import Annotated, Any
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._exec.plan import ArraySlotConnector
+
+RECEIVED: dict[str, Any] = {}
+
+
+class ArrayModel(pdag.Model):
+    m = pdag.Array("m", np.array([[pdag.RealParameter(...) for _ in range(3)] for _ in range(2)]))
+    flags = pdag.Array("flags", np.array([pdag.BooleanParameter(...) for _ in range(2)]))
+    doubled = pdag.Array("doubled", np.array([[pdag.RealParameter(...) for _ in range(3)] for _ in range(2)]))
+    n_flags = pdag.RealParameter("n_flags")
+
+    @pdag.relationship
+    @staticmethod
+    def double(
+        *,
+        m: Annotated[npt.NDArray[np.float64], m.ref(as_array=True)],
+    ) -> Annotated[npt.NDArray[np.float64], doubled.ref()]:
+        RECEIVED["m"] = m
+        return 2 * m
+
+    @pdag.relationship
+    @staticmethod
+    def count_flags(
+        *,
+        flags: Annotated[npt.NDArray[np.bool_], flags.ref(as_array=True)],
+    ) -> Annotated[float, n_flags.ref()]:
+        RECEIVED["flags"] = flags
+        return float(flags.sum())
+
+
+class SeriesModel(pdag.Model):
+    x = pdag.RealParameter("x", is_time_series=True)
+    state = pdag.CategoricalParameter("state", categories=("a", "b"), is_time_series=True)
+    total = pdag.RealParameter("total")
+    n_b = pdag.RealParameter("n_b")
+
+    @pdag.relationship
+    @staticmethod
+    def sum_x(
+        *,
+        x: Annotated[npt.NDArray[np.float64], x.ref(all_time_steps=True, as_array=True)],
+    ) -> Annotated[float, total.ref()]:
+        RECEIVED["x"] = x
+        return float(x.sum())
+
+    @pdag.relationship
+    @staticmethod
+    def count_b(
+        *,
+        state: Annotated[npt.NDArray[Any], state.ref(all_time_steps=True, as_array=True)],
+    ) -> Annotated[float, n_b.ref()]:
+        RECEIVED["state"] = state
+        return float(np.count_nonzero(state == "b"))
+
+
+class ListModel(pdag.Model):
+    a = pdag.Array("a", np.array([pdag.RealParameter(...) for _ in range(2)]))
+    x = pdag.RealParameter("x", is_time_series=True)
+    total = pdag.RealParameter("total")
+
+    @pdag.relationship
+    @staticmethod
+    def total_of(
+        *,
+        a: Annotated[list[float], a.ref()],
+        x: Annotated[list[float], x.ref(all_time_steps=True)],
+    ) -> Annotated[float, total.ref()]:
+        RECEIVED["a"], RECEIVED["x"] = a, x
+        return sum(a + x)
+
+
+def _array_inputs() -> dict[pdag.ParameterId, Any]:
+    inputs: dict[pdag.ParameterId, Any] = {
+        pdag.StaticParameterId((), f"m[{i}, {j}]"): float(3 * i + j) for i in range(2) for j in range(3)
+    }
+    inputs[pdag.StaticParameterId((), "flags[0]")] = True
+    inputs[pdag.StaticParameterId((), "flags[1]")] = False
+    return inputs
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_array_inputs_and_outputs(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(ArrayModel.to_core_model())
+    results = pdag.execute_exec_model(exec_model, _array_inputs(), backend=backend)
+
+    assert RECEIVED["m"].dtype == np.float64
+    assert RECEIVED["m"].shape == (2, 3)
+    np.testing.assert_array_equal(RECEIVED["m"], [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]])
+    assert RECEIVED["flags"].dtype == np.bool_
+    assert results[pdag.StaticParameterId((), "n_flags")] == 1.0
+
+    # Elements of returned arrays are stored as builtin values
+    doubled = results[pdag.StaticParameterId((), "doubled[1, 2]")]
+    assert doubled == 10.0  # noqa: PLR2004
+    assert type(doubled) is float
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_all_time_steps_arrays(backend: BackendType) -> None:
+    n_time_steps = 4
+    exec_model = pdag.create_exec_model_from_core_model(SeriesModel.to_core_model(), n_time_steps=n_time_steps)
+    inputs: dict[pdag.ParameterId, Any] = {}
+    for time_step in range(n_time_steps):
+        inputs[pdag.TimeSeriesParameterId((), "x", time_step)] = float(time_step)
+        inputs[pdag.TimeSeriesParameterId((), "state", time_step)] = "ab"[time_step % 2]
+    results = pdag.execute_exec_model(exec_model, inputs, backend=backend)
+
+    assert RECEIVED["x"].dtype == np.float64
+    assert RECEIVED["state"].dtype == object
+    assert results[pdag.StaticParameterId((), "total")] == 6.0  # noqa: PLR2004
+    assert results[pdag.StaticParameterId((), "n_b")] == 2.0  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_lists_by_default(backend: BackendType) -> None:
+    n_time_steps = 3
+    exec_model = pdag.create_exec_model_from_core_model(ListModel.to_core_model(), n_time_steps=n_time_steps)
+    inputs: dict[pdag.ParameterId, Any] = {
+        pdag.StaticParameterId((), "a[0]"): 1.0,
+        pdag.StaticParameterId((), "a[1]"): 2.0,
+    }
+    for time_step in range(n_time_steps):
+        inputs[pdag.TimeSeriesParameterId((), "x", time_step)] = float(time_step)
+    results = pdag.execute_exec_model(exec_model, inputs, backend=backend)
+
+    assert RECEIVED["a"] == [1.0, 2.0]
+    assert RECEIVED["x"] == [0.0, 1.0, 2.0]
+    total = results[pdag.StaticParameterId((), "total")]
+    assert total == 6.0  # noqa: PLR2004
+    assert type(total) is float
+
+
+def test_values_not_fitting_dtype() -> None:
+    connector = ArraySlotConnector(slots=np.array([0, 1]), dtype=np.dtype(np.float64))
+    assert connector.gather([1.0, 2.0]).dtype == np.float64
+    # A value that cannot be converted to the dtype, e.g., a filled `None`, is passed in an object array
+    array = connector.gather([1.0, None])
+    assert array.dtype == object
+    assert array.tolist() == [1.0, None]
+
+
+def test_hash_arguments_key_with_arrays() -> None:
+    a = np.arange(3.0)
+    assert pdag.hash_arguments_key(v=a) == pdag.hash_arguments_key(v=a.copy())
+    assert pdag.hash_arguments_key(v=a) != pdag.hash_arguments_key(v=a.astype(np.float32))
@@ -0,0 +1,65 @@
+"""Async relationships."""
+
+import asyncio
+from typing import Annotated, Literal
+
+import pytest
+
+import pdag
+
+_running = 0
+_max_running = 0
+
+
+class AsyncModel(pdag.Model):
+    m = pdag.Mapping("m", {k: pdag.RealParameter(...) for k in ("a", "b", "c")})
+    m_squared = pdag.Mapping("m_squared", {k: pdag.RealParameter(...) for k in ("a", "b", "c")})
+    total = pdag.RealParameter("total")
+
+    for k in ("a", "b", "c"):
+
+        @pdag.relationship(identifier=k)
+        @staticmethod
+        async def square(m_arg: Annotated[float, m.ref(k)]) -> Annotated[float, m_squared.ref(k)]:
+            global _running, _max_running  # noqa: PLW0603
+            _running += 1
+            _max_running = max(_max_running, _running)
+            await asyncio.sleep(0.01)
+            _running -= 1
+            return m_arg**2
+
+    @pdag.relationship
+    @staticmethod
+    def sum_squares(m_squared: Annotated[dict[str, float], m_squared.ref()]) -> Annotated[float, total.ref()]:
+        return sum(m_squared.values())
+
+
+INPUTS = {pdag.StaticParameterId((), f"m[{k}]"): float(i) for i, k in enumerate("abc")}
+
+
+@pytest.mark.parametrize(("max_concurrency", "expected_max_running"), [(None, 3), (2, 2), (1, 1)])
+def test_async_concurrency(max_concurrency: int | None, expected_max_running: int) -> None:
+    global _max_running  # noqa: PLW0603
+    _max_running = 0
+    exec_model = pdag.create_exec_model_from_core_model(AsyncModel.to_core_model())
+    results = asyncio.run(pdag.execute_exec_model_async(exec_model, INPUTS, max_concurrency=max_concurrency))
+    assert results[pdag.StaticParameterId((), "total")] == 0.0 + 1.0 + 4.0
+    assert _max_running == expected_max_running
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_async_relationships_in_sync_executor(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(AsyncModel.to_core_model())
+    results = pdag.execute_exec_model(exec_model, INPUTS, backend=backend)
+    assert results == asyncio.run(pdag.execute_exec_model_async(exec_model, INPUTS))
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_async_relationships_in_sync_executor_in_event_loop(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(AsyncModel.to_core_model())
+
+    async def run() -> None:
+        pdag.execute_exec_model(exec_model, INPUTS, backend=backend)
+
+    with pytest.raises(RuntimeError, match="while an event loop is running"):
+        asyncio.run(run())
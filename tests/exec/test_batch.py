@@ -0,0 +1,59 @@
+"""Vectorized batch execution."""
+
+from typing import Annotated
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+import pdag
+from pdag.examples import SquareModel
+
+
+class VectorizedPolynomialModel(pdag.Model):
+    a = pdag.Array("a", np.array([pdag.RealParameter(...) for _ in range(3)]))
+    x = pdag.RealParameter("x")
+    x_squared = pdag.RealParameter("x_squared")
+    y = pdag.RealParameter("y")
+
+    calc_square_term = SquareModel.to_relationship(
+        "calc_square_term",
+        inputs={SquareModel.x.ref(): x.ref()},
+        outputs={SquareModel.y.ref(): x_squared.ref()},
+    )
+
+    @pdag.relationship(vectorized=True)
+    @staticmethod
+    def polynomial(
+        *,
+        a: Annotated[npt.NDArray[np.float64], a.ref()],
+        x: Annotated[npt.NDArray[np.float64], x.ref()],
+        x_squared: Annotated[npt.NDArray[np.float64], x_squared.ref()],
+    ) -> Annotated[npt.NDArray[np.float64], y.ref()]:
+        return a[:, 0] + a[:, 1] * x + a[:, 2] * x_squared
+
+
+INPUTS_COLUMNS: dict[pdag.ParameterId, list[float]] = {
+    pdag.StaticParameterId((), "a[0]"): [1.0, 0.0, 2.0],
+    pdag.StaticParameterId((), "a[1]"): [2.0, 1.0, 0.0],
+    pdag.StaticParameterId((), "a[2]"): [3.0, 0.0, 1.0],
+    pdag.StaticParameterId((), "x"): [4.0, 5.0, 6.0],
+}
+
+
+def test_batch_matches_case_by_case() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(VectorizedPolynomialModel.to_core_model())
+    results = pdag.execute_exec_model_batch(exec_model, INPUTS_COLUMNS)
+
+    np.testing.assert_array_equal(results[pdag.StaticParameterId((), "y")], [57.0, 5.0, 38.0])
+    for case_index in range(3):
+        inputs = {parameter_id: values[case_index] for parameter_id, values in INPUTS_COLUMNS.items()}
+        for backend in ("interpreter", "codegen"):
+            results_case = pdag.execute_exec_model(exec_model, inputs, backend=backend)
+            assert results_case == {parameter_id: column[case_index] for parameter_id, column in results.items()}
+
+
+def test_batch_inconsistent_lengths() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(VectorizedPolynomialModel.to_core_model())
+    with pytest.raises(ValueError, match="same length"):
+        pdag.execute_exec_model_batch(exec_model, INPUTS_COLUMNS | {pdag.StaticParameterId((), "x"): [1.0]})
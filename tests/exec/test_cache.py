@@ -0,0 +1,58 @@
+"""Memoization of relationship results."""
+
+from typing import Annotated, Literal
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+import pdag
+
+
+class CachedModel(pdag.Model):
+    x = pdag.RealParameter("x")
+    y = pdag.RealParameter("y")
+    v = pdag.Array("v", np.array([pdag.RealParameter(...) for _ in range(2)]))
+    norm = pdag.RealParameter("norm")
+
+    @pdag.relationship(cache=2)
+    @staticmethod
+    def square(*, x: Annotated[float, x.ref()]) -> Annotated[float, y.ref()]:
+        return x**2
+
+    @pdag.relationship(cache=True, cache_key=lambda *, v: np.asarray(v).tobytes())
+    @staticmethod
+    def calc_norm(*, v: Annotated[npt.NDArray[np.float64], v.ref()]) -> Annotated[float, norm.ref()]:
+        return float(np.linalg.norm(v))
+
+
+def _inputs(x: float) -> dict[pdag.ParameterId, float]:
+    return {
+        pdag.StaticParameterId((), "x"): x,
+        pdag.StaticParameterId((), "v[0]"): 3.0,
+        pdag.StaticParameterId((), "v[1]"): 4.0,
+    }
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_cache_counters(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(CachedModel.to_core_model())
+    square_cache = CachedModel.square.cache
+    norm_cache = CachedModel.calc_norm.cache
+    assert square_cache is not None
+    assert norm_cache is not None
+    square_cache.clear()
+    norm_cache.clear()
+
+    for x in [1.0, 2.0, 1.0, 3.0, 1.0]:
+        results = pdag.execute_exec_model(exec_model, _inputs(x), backend=backend)
+        assert results[pdag.StaticParameterId((), "y")] == x**2
+        assert results[pdag.StaticParameterId((), "norm")] == 5.0  # noqa: PLR2004
+
+    assert square_cache.info() == pdag.CacheInfo(hits=2, misses=3, evictions=1, size=2, maxsize=2)
+    assert norm_cache.info() == pdag.CacheInfo(hits=4, misses=1, evictions=0, size=1, maxsize=128)
+
+
+def test_cache_vectorized() -> None:
+    with pytest.raises(ValueError, match="cannot be cached"):
+        pdag.relationship(cache=True, vectorized=True)
@@ -0,0 +1,142 @@
+"""Checkpointing and resuming executions mid-horizon."""
+
+import dataclasses
+import pickle
+from typing import Annotated, Any
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 5
+POSITION = pdag.TimeSeriesArrayId((), "position")
+STEP = pdag.TimeSeriesArrayId((), "step")
+TOTAL = pdag.StaticParameterId((), "total")
+
+
+class WalkModel(pdag.Model):
+    scale = pdag.RealParameter("scale")
+    step = pdag.RealParameter("step", is_time_series=True)
+    position = pdag.RealParameter("position", is_time_series=True)
+    total = pdag.RealParameter("total")
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, position.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def walk(
+        *,
+        scale: Annotated[float, scale.ref()],
+        previous_position: Annotated[float, position.ref(previous=True)],
+        step: Annotated[float, step.ref(previous=True)],
+    ) -> Annotated[float, position.ref()]:
+        return previous_position + scale * step
+
+    @pdag.relationship
+    @staticmethod
+    def sum_positions(
+        *,
+        position: Annotated[list[float], position.ref(all_time_steps=True)],
+    ) -> Annotated[float, total.ref()]:
+        return sum(position)
+
+
+def _walk_inputs(steps: list[float], *, first_step: int = 0) -> dict[pdag.ParameterId, Any]:
+    inputs: dict[pdag.ParameterId, Any] = {pdag.StaticParameterId((), "scale"): 2.0}
+    for offset, step in enumerate(steps):
+        inputs[STEP.at(first_step + offset)] = step
+    return inputs
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_resume_from_checkpoint(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    inputs = _walk_inputs([1.0, -1.0, 2.0, 3.0, 0.5])
+    expected = pdag.execute_exec_model(exec_model, inputs)
+
+    state = pdag.checkpoint_exec_model(exec_model, inputs, time_step=2)
+    restored_state = pickle.loads(pickle.dumps(state))  # noqa: S301
+    results = pdag.execute_exec_model(exec_model, {}, state=restored_state, backend=backend)
+    assert results[TOTAL] == expected[TOTAL]
+    for time_step in range(2, N_TIME_STEPS):
+        assert results[POSITION.at(time_step)] == expected[POSITION.at(time_step)]
+
+
+def test_state_is_minimal() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    state = pdag.checkpoint_exec_model(exec_model, _walk_inputs([1.0, -1.0, 2.0, 3.0, 0.5]), time_step=2)
+    # The static input, the previous values and the values summed after the time steps
+    assert set(state.values) == {
+        pdag.StaticParameterId((), "scale"),
+        POSITION.at(0),
+        POSITION.at(1),
+        STEP.at(1),
+        STEP.at(2),
+        STEP.at(3),
+    }
+
+
+def test_branch_from_checkpoint() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    prefix = [1.0, -1.0]
+    state = pdag.checkpoint_exec_model(exec_model, _walk_inputs(prefix), time_step=len(prefix))
+    for suffix in ([2.0, 3.0], [0.0, -5.0]):
+        branch = pdag.execute_exec_model(exec_model, _walk_inputs(suffix, first_step=len(prefix)), state=state)
+        full = pdag.execute_exec_model(exec_model, _walk_inputs(prefix + suffix))
+        assert branch[TOTAL] == full[TOTAL]
+
+
+def test_stop_step() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    inputs = _walk_inputs([1.0, -1.0, 2.0, 3.0])
+    results = pdag.execute_exec_model(exec_model, inputs, stop_step=2)
+    assert results[POSITION.at(1)] == 2.0  # noqa: PLR2004
+    assert POSITION.at(2) not in results
+    # The static relationships run after the time steps are skipped
+    assert TOTAL not in results
+
+    # Checkpoints can be chained
+    state = pdag.checkpoint_exec_model(exec_model, inputs, time_step=1)
+    state = pdag.checkpoint_exec_model(exec_model, {}, time_step=3, state=state)
+    assert state.time_step == 3  # noqa: PLR2004
+    resumed = pdag.execute_exec_model(exec_model, {}, state=state)
+    assert resumed[TOTAL] == pdag.execute_exec_model(exec_model, inputs)[TOTAL]
+
+
+def test_rolled_checkpoint() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    inputs = _walk_inputs([1.0, -1.0, 2.0, 3.0, 0.5])
+    expected = pdag.execute_exec_model(rolled, inputs)
+    state = pdag.checkpoint_exec_model(rolled, inputs, time_step=3)
+    assert TOTAL not in state.values
+    assert pdag.execute_exec_model(rolled, {}, state=state)[TOTAL] == expected[TOTAL]
+
+    # Only the inputs of the time steps before the checkpoint are required
+    prefix_state = pdag.checkpoint_exec_model(rolled, _walk_inputs([1.0, -1.0]), time_step=2)
+    branch = pdag.execute_exec_model(rolled, _walk_inputs([2.0, 3.0, 0.5], first_step=2), state=prefix_state)
+    assert branch[TOTAL] == expected[TOTAL]
+
+
+def test_checkpoint_errors() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(WalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    inputs = _walk_inputs([1.0, -1.0, 2.0, 3.0])
+    for time_step in (0, N_TIME_STEPS + 1):
+        with pytest.raises(ValueError, match="must be between 1 and"):
+            pdag.checkpoint_exec_model(exec_model, inputs, time_step=time_step)
+
+    state = pdag.checkpoint_exec_model(exec_model, inputs, time_step=3)
+    with pytest.raises(ValueError, match="before the time step 3 of the state"):
+        pdag.execute_exec_model(exec_model, {}, state=state, stop_step=2)
+
+    stop_condition = pdag.StopCondition(pdag.ParameterRef("reward"))
+    stop_model = pdag.create_exec_model_from_core_model(
+        dataclasses.replace(DiamondMdpModel.to_core_model(), stop_condition=stop_condition),
+        n_time_steps=N_TIME_STEPS,
+    )
+    with pytest.raises(ValueError, match="stop condition"):
+        pdag.checkpoint_exec_model(stop_model, {}, time_step=1)
@@ -0,0 +1,74 @@
+"""Code-generated executor."""
+
+import pickle
+from typing import Annotated, Any
+
+import pytest
+
+import pdag
+from pdag.examples import DiamondMdpModel, PolynomialModel, TwoSquares
+
+CASES: list[tuple[type[pdag.Model], int, dict[pdag.ParameterId, Any]]] = [
+    (
+        DiamondMdpModel,
+        4,
+        {
+            pdag.StaticParameterId((), "policy"): "right",
+            pdag.TimeSeriesParameterId((), "location", 0): "start",
+        },
+    ),
+    (
+        PolynomialModel,
+        1,
+        {
+            pdag.StaticParameterId((), "a[0]"): 1.0,
+            pdag.StaticParameterId((), "a[1]"): 2.0,
+            pdag.StaticParameterId((), "a[2]"): 3.0,
+            pdag.StaticParameterId((), "x"): 4.0,
+        },
+    ),
+    (
+        TwoSquares,
+        1,
+        {
+            pdag.StaticParameterId((), "x"): 4.0,
+            pdag.StaticParameterId((), "y"): 5.0,
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(("model", "n_time_steps", "inputs"), CASES)
+def test_codegen_matches_interpreter(
+    model: type[pdag.Model],
+    n_time_steps: int,
+    inputs: dict[pdag.ParameterId, Any],
+) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(model.to_core_model(), n_time_steps=n_time_steps)
+    assert pdag.execute_exec_model(exec_model, inputs, backend="codegen") == pdag.execute_exec_model(
+        exec_model,
+        inputs,
+        backend="interpreter",
+    )
+
+
+def test_codegen_is_cached_and_pickled_by_reference() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    executor = exec_model.compile(backend="codegen")
+    assert executor is exec_model.compile(backend="codegen")
+    assert "def _execute(values):" in executor.source
+    assert pickle.loads(pickle.dumps(executor)) is executor  # noqa: S301
+
+
+def test_codegen_empty_mapping_list_output() -> None:
+    class EmptyTimeSeriesModel(pdag.Model):
+        m = pdag.Mapping("m", {k: pdag.RealParameter(..., is_time_series=True) for k in ("a", "b")})
+
+        @pdag.relationship
+        @staticmethod
+        def fill() -> Annotated[list[dict[str, float]], m.ref(all_time_steps=True)]:
+            return []
+
+    # There are no time steps, so the output is an empty list of mappings
+    exec_model = pdag.create_exec_model_from_core_model(EmptyTimeSeriesModel.to_core_model(), n_time_steps=0)
+    assert pdag.execute_exec_model(exec_model, {}, backend="codegen") == pdag.execute_exec_model(exec_model, {})
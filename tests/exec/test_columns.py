@@ -0,0 +1,157 @@
+"""Time-series parameters passed and returned as typed arrays."""
+
+from typing import Annotated, Any
+
+import numpy as np
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 4
+LOCATION = pdag.TimeSeriesArrayId((), "location")
+ACTION = pdag.TimeSeriesArrayId((), "action")
+REWARD = pdag.TimeSeriesArrayId((), "reward")
+INPUTS: dict[pdag.ParameterId, Any] = {
+    pdag.StaticParameterId((), "policy"): "left",
+    pdag.TimeSeriesParameterId((), "location", 0): "start",
+}
+
+
+class ThresholdModel(pdag.Model):
+    x = pdag.RealParameter("x", is_time_series=True)
+    above = pdag.BooleanParameter("above", is_time_series=True)
+    n_above = pdag.RealParameter("n_above")
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def threshold(*, x: Annotated[float, x.ref()]) -> Annotated[bool, above.ref()]:
+        return x > 1.0
+
+    @pdag.relationship
+    @staticmethod
+    def count(*, above: Annotated[list[bool], above.ref(all_time_steps=True)]) -> Annotated[float, n_above.ref()]:
+        return float(sum(above))
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_columnar_results(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(exec_model, INPUTS, backend=backend)
+    columns = pdag.execute_exec_model(exec_model, INPUTS, backend=backend, columnar=True)
+
+    assert not any(isinstance(parameter_id, pdag.TimeSeriesParameterId) for parameter_id in columns)
+    assert (
+        columns[pdag.StaticParameterId((), "cumulative_reward")]
+        == results[pdag.StaticParameterId((), "cumulative_reward")]
+    )
+    assert columns[REWARD].dtype == np.float64
+    assert columns[REWARD].tolist() == [results[REWARD.at(time_step)] for time_step in range(N_TIME_STEPS)]
+
+    # Categorical parameters are packed into the codes of their categories
+    categories = DiamondMdpModel.location.categories
+    assert columns[LOCATION].dtype == np.uint8
+    assert [categories[code] for code in columns[LOCATION]] == [
+        results[LOCATION.at(time_step)] for time_step in range(N_TIME_STEPS)
+    ]
+
+
+def test_array_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(ThresholdModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    x = np.array([0.5, 1.5, 2.5, 1.0])
+    columns = pdag.execute_exec_model(exec_model, {pdag.TimeSeriesArrayId((), "x"): x}, columnar=True)
+
+    assert columns[pdag.StaticParameterId((), "n_above")] == 2.0  # noqa: PLR2004
+    above = columns[pdag.TimeSeriesArrayId((), "above")]
+    assert above.dtype == np.bool_
+    np.testing.assert_array_equal(above, x > 1.0)
+    np.testing.assert_array_equal(columns[pdag.TimeSeriesArrayId((), "x")], x)
+
+    with pytest.raises(ValueError, match="Expected an array of shape"):
+        pdag.execute_exec_model(exec_model, {pdag.TimeSeriesArrayId((), "x"): x[:2]})
+
+
+def test_categorical_array_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.execute_exec_model(exec_model, INPUTS | {ACTION.at(0): "go_left"})
+    # Categorical values can be given either as the categories or as their codes
+    actions = ["go_left", "move_forward", "none", "none"]
+    codes = np.array([DiamondMdpModel.action.categories.index(action) for action in actions])
+    for action_array in (np.array(actions, dtype=object), codes):
+        with_actions = INPUTS | {ACTION: action_array}
+        results = pdag.execute_exec_model(exec_model, with_actions, outputs=[LOCATION.at(N_TIME_STEPS - 1)])
+        assert results[LOCATION.at(N_TIME_STEPS - 1)] == expected[LOCATION.at(N_TIME_STEPS - 1)]
+
+
+def test_rolled_columnar_results() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    columns = pdag.execute_exec_model(rolled, INPUTS, columnar=True)
+    unrolled_columns = pdag.execute_exec_model(rolled.unroll(), INPUTS, columnar=True)
+    assert columns.keys() == unrolled_columns.keys()
+    np.testing.assert_array_equal(columns[LOCATION], unrolled_columns[LOCATION])
+
+
+def test_values_not_fitting_buffer() -> None:
+    class StopModel(pdag.Model):
+        x = pdag.RealParameter("x", is_time_series=True)
+        above = pdag.BooleanParameter("above", is_time_series=True)
+        stop = pdag.StopCondition(above.ref(), fill="none")
+
+        @pdag.relationship(at_each_time_step=True)
+        @staticmethod
+        def threshold(*, x: Annotated[float, x.ref()]) -> Annotated[bool, above.ref()]:
+            return x > 1.0
+
+    exec_model = pdag.create_exec_model_from_core_model(StopModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    x = np.array([0.5, 1.5, 2.5, 1.0])
+    columns = pdag.execute_exec_model(exec_model, {pdag.TimeSeriesArrayId((), "x"): x}, columnar=True)
+    # The `None` values filled after the stop step are kept in an object array
+    above = columns[pdag.TimeSeriesArrayId((), "above")]
+    assert above.dtype == object
+    assert above.tolist() == [False, True, None, None]
+
+
+def test_missing_time_steps_are_not_packed() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    columns = pdag.execute_exec_model(exec_model, INPUTS, outputs=[REWARD.at(0)], columnar=True)
+    assert REWARD not in columns
+    assert REWARD.at(0) in columns
+
+
+class DrivenModel(pdag.Model):
+    position = pdag.RealParameter("position", is_time_series=True)
+    velocity = pdag.RealParameter("velocity", is_time_series=True)
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def move(
+        *,
+        position: Annotated[float, position.ref()],
+        velocity: Annotated[float, velocity.ref()],
+    ) -> Annotated[float, position.ref(next=True)]:
+        return position + velocity
+
+
+@pytest.mark.parametrize("rolled", [False, True])
+def test_input_not_at_last_time_step(*, rolled: bool) -> None:
+    core_model = DrivenModel.to_core_model()
+    exec_model: pdag.ExecutionModel | pdag.RolledExecutionModel = (
+        pdag.create_rolled_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+        if rolled
+        else pdag.create_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+    )
+    position, velocity = pdag.TimeSeriesArrayId((), "position"), pdag.TimeSeriesArrayId((), "velocity")
+    # The velocity is only used to compute the next position, so the model has no velocity at the last time step
+    velocities = np.array([1.0, 2.0, 3.0])
+    inputs: dict[pdag.ParameterId | pdag.TimeSeriesArrayId, Any] = {position.at(0): 0.0, velocity: velocities}
+    columns = pdag.execute_exec_model(exec_model, inputs, columnar=True)
+
+    np.testing.assert_array_equal(columns[position], [0.0, 1.0, 3.0, 6.0])
+    np.testing.assert_array_equal(columns[velocity], velocities)
+    assert velocity.at(0) not in columns
+
+    with pytest.raises(ValueError, match=r"with the values at time steps \[0, 1, 2\]"):
+        pdag.execute_exec_model(exec_model, {position.at(0): 0.0, velocity: np.append(velocities, 4.0)})
+    with pytest.raises(ValueError, match="is not a time-series parameter of the model"):
+        pdag.execute_exec_model(exec_model, inputs | {pdag.TimeSeriesArrayId((), "acceleration"): velocities})
@@ -0,0 +1,112 @@
+"""Executing identical cases only once."""
+
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Annotated, Any
+
+import numpy as np
+import polars as pl
+import pytest
+
+import pdag
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 4
+N_SAMPLES = 20
+POLICY = pdag.StaticParameterId((), "policy")
+START = pdag.TimeSeriesParameterId((), "location", 0)
+
+
+class CountingHooks(pdag.ExecutionHooks):
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+
+    def before_relationship(self, relationship_id: pdag.RelationshipId, inputs: Mapping[str, Any]) -> None:  # noqa: ARG002
+        self.calls[relationship_id.name] += 1
+
+
+def _cases() -> list[dict[pdag.ParameterId, Any]]:
+    # The only sampled parameter is categorical, so the samples have only two distinct values
+    policies = pdag.sample_parameter_values(
+        {POLICY: DiamondMdpModel.policy},
+        N_SAMPLES,
+        rng=np.random.default_rng(0),
+    )
+    return [policy | {START: "start"} for policy in policies]
+
+
+def _metadata() -> list[dict[str, Any]]:
+    return [{"sample": sample} for sample in range(N_SAMPLES)]
+
+
+class IdentityModel(pdag.Model):
+    x = pdag.RealParameter("x")
+    y = pdag.RealParameter("y")
+
+    @pdag.relationship
+    @staticmethod
+    def identity(*, x: Annotated[Any, x.ref()]) -> Annotated[Any, y.ref()]:
+        return x
+
+
+def test_deduplicate_cases(capsys: pytest.CaptureFixture[str]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(IdentityModel.to_core_model())
+    x, y = pdag.StaticParameterId((), "x"), pdag.StaticParameterId((), "y")
+    hooks = CountingHooks()
+    exec_model.add_hooks(hooks)
+    cases: list[dict[pdag.ParameterId, Any]] = [{x: "left"}, {x: "right"}, {x: "left"}, {x: True}, {x: 1}]
+    results = pdag.run_experiments(exec_model, cases, return_type="list", deduplicate=True)
+    # `True` and `1` are equal, but they are not merged
+    assert hooks.calls["identity"] == 4  # noqa: PLR2004
+    assert "Executing 4 distinct cases out of 5 requested cases." in capsys.readouterr().out
+    assert [result[y] for result in results] == ["left", "right", "left", True, 1]
+    assert type(results[3][y]) is bool
+    assert type(results[4][y]) is int
+
+    # The cases with unhashable values are kept
+    hooks.calls.clear()
+    array_cases: list[dict[pdag.ParameterId, Any]] = [{x: np.zeros(2)}, {x: np.zeros(2)}]
+    results = pdag.run_experiments(exec_model, array_cases, return_type="list", deduplicate=True)
+    assert hooks.calls["identity"] == len(array_cases)
+    assert results[0][y] is not results[1][y]
+
+
+@pytest.mark.parametrize("share_prefixes", [False, True])
+def test_deduplicate(
+    capsys: pytest.CaptureFixture[str],
+    *,
+    share_prefixes: bool,
+) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.run_experiments(exec_model, _cases(), metadata=_metadata(), return_type="list")
+    hooks = CountingHooks()
+    exec_model.add_hooks(hooks)
+    results = pdag.run_experiments(
+        exec_model,
+        _cases(),
+        metadata=_metadata(),
+        return_type="list",
+        share_prefixes=share_prefixes,
+        deduplicate=True,
+    )
+    # The results are copied to the duplicates with their own metadata
+    assert results == expected
+    assert hooks.calls["action_selection"] == 2 * N_TIME_STEPS
+    assert "Executing 2 distinct cases out of 20 requested cases." in capsys.readouterr().out
+
+
+def test_deduplicate_multi_process(tmp_path: Path) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    parquet_file_path = tmp_path / "results.parquet"
+    run_experiments_multi_process(
+        exec_model,
+        _cases(),
+        metadata=_metadata(),
+        parquet_file_path=parquet_file_path,
+        deduplicate=True,
+    )
+    results = pl.read_parquet(parquet_file_path).sort("sample", "time_step")
+    expected = pdag.run_experiments(exec_model, _cases(), metadata=_metadata()).sort("sample", "time_step")
+    assert results.equals(expected.select(results.columns))
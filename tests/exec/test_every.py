@@ -0,0 +1,103 @@
+"""Relationships evaluated every few time steps."""
+
+from typing import Annotated, Any
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+
+N_TIME_STEPS = 7
+EVERY = 3
+X = pdag.TimeSeriesArrayId((), "x")
+HELD = pdag.TimeSeriesArrayId((), "held")
+FORECAST = pdag.TimeSeriesArrayId((), "forecast")
+TOTAL = pdag.StaticParameterId((), "total")
+XS = [1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0]
+
+
+class MultiRateModel(pdag.Model):
+    x = pdag.RealParameter("x", is_time_series=True)
+    held = pdag.RealParameter("held", is_time_series=True)
+    forecast = pdag.RealParameter("forecast", is_time_series=True)
+    total = pdag.RealParameter("total")
+
+    @pdag.relationship(at_each_time_step=True, every=EVERY)
+    @staticmethod
+    def sample(*, x: Annotated[float, x.ref()]) -> Annotated[float, held.ref()]:
+        return 10 * x
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, forecast.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True, every=2)
+    @staticmethod
+    def predict(*, x: Annotated[float, x.ref()]) -> Annotated[float, forecast.ref(next=True)]:
+        return x + 1
+
+    @pdag.relationship(fold=True, initial=0.0, every=2)
+    @staticmethod
+    def accumulate(
+        *,
+        total: Annotated[float, total.ref(previous=True)],
+        held: Annotated[float, held.ref()],
+    ) -> Annotated[float, total.ref()]:
+        return total + held
+
+
+def _inputs() -> dict[pdag.ParameterId, Any]:
+    return {X.at(time_step): x for time_step, x in enumerate(XS)}
+
+
+def _assert_held(results: pdag.ResultsView | dict[pdag.ParameterId, Any]) -> None:
+    helds = [10 * XS[time_step - time_step % EVERY] for time_step in range(N_TIME_STEPS)]
+    assert [results[HELD.at(time_step)] for time_step in range(N_TIME_STEPS)] == helds
+    # The forecasts of the next time step are made every other time step and held in between
+    forecasts = [0.0] + [XS[time_step - 1 - (time_step - 1) % 2] + 1 for time_step in range(1, N_TIME_STEPS)]
+    assert [results[FORECAST.at(time_step)] for time_step in range(N_TIME_STEPS)] == forecasts
+    assert results[TOTAL] == sum(helds[::2])
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_every(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(MultiRateModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    _assert_held(pdag.execute_exec_model(exec_model, _inputs(), backend=backend))
+
+
+def test_every_only_creates_needed_relationships() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(MultiRateModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    sample_time_steps = sorted(
+        relationship_id.time_step
+        for relationship_id in exec_model.relationship_infos
+        if isinstance(relationship_id, pdag.TimeSeriesRelationshipId) and relationship_id.name == "sample"
+    )
+    assert sample_time_steps == [0, 3, 6]
+    # The held values are copied between the evaluations, so they are not inputs
+    assert exec_model.input_parameter_ids() == {X.at(time_step) for time_step in range(N_TIME_STEPS)}
+
+
+def test_every_rolled() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(MultiRateModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(rolled, _inputs())
+    _assert_held(results)
+    unrolled_results = pdag.execute_exec_model(rolled.unroll(), _inputs())
+    assert {parameter_id: results[parameter_id] for parameter_id in unrolled_results} == unrolled_results
+
+
+def test_every_checkpoint() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(MultiRateModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.execute_exec_model(exec_model, _inputs())
+    state = pdag.checkpoint_exec_model(exec_model, _inputs(), time_step=4)
+    results = pdag.execute_exec_model(exec_model, {}, state=state)
+    # The held value is copied from the state at the time steps after the checkpoint
+    assert results[HELD.at(5)] == expected[HELD.at(5)] == 10 * XS[3]
+    assert {parameter_id: expected[parameter_id] for parameter_id in results} == dict(results)
+
+
+def test_invalid_every() -> None:
+    with pytest.raises(ValueError, match="every must be positive"):
+        pdag.relationship(at_each_time_step=True, every=0)
+    with pytest.raises(ValueError, match="only be set for relationships evaluated at each time step"):
+        pdag.relationship(every=2)
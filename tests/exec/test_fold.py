@@ -0,0 +1,168 @@
+"""Fold relationships, which update an accumulator at each time step."""
+
+import pickle
+from typing import Annotated, Any
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+
+N_TIME_STEPS = 5
+X = pdag.TimeSeriesArrayId((), "x")
+OFFSET = pdag.StaticParameterId((), "offset")
+TOTAL = pdag.StaticParameterId((), "total")
+PEAK = pdag.StaticParameterId((), "peak")
+COUNT = pdag.StaticParameterId((), "count")
+MEAN = pdag.StaticParameterId((), "mean")
+XS = [1.0, -2.0, 4.0, 0.5, 3.0]
+
+
+class RunningStatsModel(pdag.Model):
+    offset = pdag.RealParameter("offset")
+    x = pdag.RealParameter("x", is_time_series=True)
+    total = pdag.RealParameter("total")
+    peak = pdag.RealParameter("peak")
+    count = pdag.RealParameter("count")
+    mean = pdag.RealParameter("mean")
+
+    @pdag.relationship(fold=True, initial=0.0)
+    @staticmethod
+    def accumulate_total(
+        *,
+        total: Annotated[float, total.ref(previous=True)],
+        offset: Annotated[float, offset.ref()],
+        x: Annotated[float, x.ref()],
+    ) -> Annotated[float, total.ref()]:
+        return total + x + offset
+
+    @pdag.relationship(fold=True, initial=(float("-inf"), 0.0))
+    @staticmethod
+    def accumulate_peak(
+        *,
+        peak: Annotated[float, peak.ref(previous=True)],
+        count: Annotated[float, count.ref(previous=True)],
+        x: Annotated[float, x.ref()],
+    ) -> tuple[Annotated[float, peak.ref()], Annotated[float, count.ref()]]:
+        return max(peak, x), count + 1
+
+    @pdag.relationship
+    @staticmethod
+    def calc_mean(
+        *,
+        total: Annotated[float, total.ref()],
+        count: Annotated[float, count.ref()],
+    ) -> Annotated[float, mean.ref()]:
+        return total / count
+
+
+def _inputs(xs: list[float], *, offset: float = 0.0, first_step: int = 0) -> dict[pdag.ParameterId, Any]:
+    inputs: dict[pdag.ParameterId, Any] = {OFFSET: offset}
+    for time_step, x in enumerate(xs, start=first_step):
+        inputs[X.at(time_step)] = x
+    return inputs
+
+
+def _assert_stats(results: pdag.ResultsView | dict[pdag.ParameterId, Any], xs: list[float]) -> None:
+    assert results[TOTAL] == sum(xs)
+    assert results[PEAK] == max(xs)
+    assert results[COUNT] == len(xs)
+    assert results[MEAN] == sum(xs) / len(xs)
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_fold(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(exec_model, _inputs(XS), backend=backend)
+    _assert_stats(results, XS)
+    # The accumulators at each time step share the slot of the output and are not in the results
+    plan = exec_model.compile()
+    assert len(plan.parameter_ids) == len(results)
+    assert {plan.slots[pdag.TimeSeriesParameterId((), "total", t)] for t in range(-1, N_TIME_STEPS - 1)} == {
+        plan.slots[TOTAL],
+    }
+
+
+def test_fold_rolled() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    assert len(rolled.step_relationship_infos) == 2  # noqa: PLR2004
+    results = pdag.execute_exec_model(rolled, _inputs(XS))
+    _assert_stats(results, XS)
+    assert results == pdag.execute_exec_model(rolled.unroll(), _inputs(XS))
+
+
+def test_fold_free_intermediates() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(exec_model, _inputs(XS), free_intermediates=True)
+    assert results[MEAN] == sum(XS) / len(XS)
+    assert TOTAL not in results
+
+    plan = exec_model.compile(free_intermediates=True, outputs=[TOTAL])
+    assert plan.execute(_inputs(XS))[TOTAL] == sum(XS)
+
+
+def test_fold_batch() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    columns: dict[pdag.ParameterId, Any] = {OFFSET: [0.0, 1.0]}
+    for time_step, x in enumerate(XS):
+        columns[X.at(time_step)] = [x, x]
+    results = pdag.execute_exec_model_batch(exec_model, columns)
+    assert results[TOTAL].tolist() == [sum(XS), sum(XS) + N_TIME_STEPS]
+
+
+def test_fold_incremental() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    previous_results = pdag.execute_exec_model(exec_model, _inputs(XS))
+    incremental = pdag.execute_exec_model_incremental(exec_model, previous_results, {X.at(2): 10.0})
+    xs = [*XS[:2], 10.0, *XS[3:]]
+    _assert_stats(incremental.results, xs)
+    assert incremental.results == pdag.execute_exec_model(exec_model, _inputs(xs))
+
+
+def test_fold_checkpoint() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    state = pdag.checkpoint_exec_model(exec_model, _inputs(XS[:2]), time_step=2)
+    # The state holds the accumulators after the time steps run so far
+    assert state.values[TOTAL] == sum(XS[:2])
+    restored_state = pickle.loads(pickle.dumps(state))  # noqa: S301
+    results = pdag.execute_exec_model(exec_model, _inputs(XS[2:], first_step=2), state=restored_state)
+    _assert_stats(results, XS)
+
+
+def test_fold_specialize() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RunningStatsModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    # The fold of the total depends on the free inputs, so none of its steps is folded into constants
+    specialized = exec_model.specialize({OFFSET: 1.0, X.at(0): XS[0]})
+    assert not any(
+        relationship_id.name == "accumulate_total" and relationship_id not in specialized.relationship_infos
+        for relationship_id in exec_model.relationship_infos
+    )
+    results = pdag.execute_exec_model(specialized, {X.at(t): XS[t] for t in range(1, N_TIME_STEPS)})
+    assert results == pdag.execute_exec_model(exec_model, _inputs(XS, offset=1.0))
+
+    fully_specialized = specialized.specialize({X.at(t): XS[t] for t in range(1, N_TIME_STEPS)})
+    assert fully_specialized.relationship_infos == {}
+    assert pdag.execute_exec_model(fully_specialized, {}) == results
+
+
+def test_fold_invalid_signatures() -> None:
+    total = pdag.RealParameter("total")
+    x = pdag.RealParameter("x", is_time_series=True)
+
+    def add(*, x: Annotated[float, x.ref()]) -> Annotated[float, total.ref()]:
+        return x
+
+    with pytest.raises(ValueError, match="must also be an input referred to with `previous=True`"):
+        pdag.relationship(fold=True, initial=0.0)(add)
+
+    def add_both(
+        *,
+        total: Annotated[float, total.ref(previous=True)],
+        x: Annotated[float, x.ref()],
+    ) -> tuple[Annotated[float, total.ref()], Annotated[float, x.ref()]]:
+        return total + x, x
+
+    with pytest.raises(ValueError, match="must be a tuple with a value for each output"):
+        pdag.relationship(fold=True, initial=0.0)(add_both)
+    with pytest.raises(ValueError, match="cannot be cached"):
+        pdag.relationship(fold=True, initial=0.0, cache=True)
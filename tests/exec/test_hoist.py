@@ -0,0 +1,128 @@
+"""Hoisting the case-invariant relationships out of experiment runs."""
+
+from pathlib import Path
+from typing import Annotated, Any
+
+import polars as pl
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+
+N_TIME_STEPS = 4
+SCALE = pdag.StaticParameterId((), "scale")
+STEP = pdag.StaticParameterId((), "step")
+POSITION = pdag.TimeSeriesArrayId((), "position")
+
+# The setup relationship appends a line to this file on each call, so that the calls in worker processes are counted
+SETUP_LOG: list[Path] = []
+
+
+class SetupModel(pdag.Model):
+    scale = pdag.RealParameter("scale")
+    gain = pdag.RealParameter("gain")
+    step = pdag.RealParameter("step")
+    position = pdag.RealParameter("position", is_time_series=True)
+
+    @pdag.relationship
+    @staticmethod
+    def setup(*, scale: Annotated[float, scale.ref()]) -> Annotated[float, gain.ref()]:
+        for path in SETUP_LOG:
+            with path.open("a") as f:
+                f.write("setup\n")
+        return 10 * scale
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, position.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def walk(
+        *,
+        gain: Annotated[float, gain.ref()],
+        step: Annotated[float, step.ref()],
+        previous_position: Annotated[float, position.ref(previous=True)],
+    ) -> Annotated[float, position.ref()]:
+        return previous_position + gain * step
+
+
+CASES: list[dict[pdag.ParameterId, Any]] = [{SCALE: 2.0, STEP: float(step)} for step in range(5)]
+
+
+def _setup_log(tmp_path: Path) -> Path:
+    # The calls of the setup relationship are only logged to the file of the current test
+    path = tmp_path / "setup.log"
+    path.touch()
+    SETUP_LOG[:] = [path]
+    return path
+
+
+def _n_setup_calls(setup_log: Path) -> int:
+    return len(setup_log.read_text().split())
+
+
+def test_hoist_plan() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    plan = exec_model.compile()
+    hoisted = plan.hoist({SCALE: 2.0})
+    assert len(hoisted.instructions) < len(plan.instructions)
+    assert hoisted.slots[SCALE] not in hoisted.required_input_slots
+    for case in CASES:
+        assert hoisted.execute(case).to_dict() == plan.execute(case).to_dict()
+    # The constant inputs do not have to be given again
+    assert hoisted.execute({STEP: 1.0}).to_dict() == plan.execute(CASES[1]).to_dict()
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+@pytest.mark.parametrize("constant_inputs", [{SCALE: 2.0}, "detect"])
+def test_run_experiments(tmp_path: Path, backend: BackendType, constant_inputs: Any) -> None:
+    setup_log = _setup_log(tmp_path)
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.run_experiments(exec_model, CASES, return_type="list", backend=backend)
+    assert _n_setup_calls(setup_log) == len(CASES)
+
+    results = pdag.run_experiments(
+        exec_model,
+        iter(CASES),
+        return_type="list",
+        backend=backend,
+        constant_inputs=constant_inputs,
+    )
+    assert results == expected
+    assert _n_setup_calls(setup_log) == len(CASES) + 1
+    assert results[3][POSITION.at(N_TIME_STEPS - 1)] == 20.0 * 3 * (N_TIME_STEPS - 1)
+
+
+def test_run_experiments_without_constants(tmp_path: Path) -> None:
+    setup_log = _setup_log(tmp_path)
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    cases: list[dict[pdag.ParameterId, float]] = [{SCALE: float(scale), STEP: 1.0} for scale in range(3)]
+    expected = pdag.run_experiments(exec_model, cases, return_type="list")
+    assert pdag.run_experiments(exec_model, cases, return_type="list", constant_inputs="detect") == expected
+    assert _n_setup_calls(setup_log) == 2 * len(cases)
+
+
+def test_run_experiments_multi_process(tmp_path: Path) -> None:
+    setup_log = _setup_log(tmp_path)
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    run_experiments_multi_process(
+        exec_model,
+        CASES,
+        n_cases=len(CASES),
+        parquet_file_path=tmp_path / "hoisted.parquet",
+        constant_inputs="detect",
+    )
+    assert _n_setup_calls(setup_log) == 1
+
+    run_experiments_multi_process(
+        exec_model,
+        CASES,
+        n_cases=len(CASES),
+        parquet_file_path=tmp_path / "plain.parquet",
+    )
+    hoisted = pl.read_parquet(tmp_path / "hoisted.parquet").sort("step", "time_step")
+    plain = pl.read_parquet(tmp_path / "plain.parquet").sort("step", "time_step")
+    assert hoisted.equals(plain)
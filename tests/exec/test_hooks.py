@@ -0,0 +1,120 @@
+"""Execution observer hooks."""
+
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._exec.plan import CallInstruction
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 4
+INPUTS: dict[pdag.ParameterId, Any] = {
+    pdag.StaticParameterId((), "policy"): "left",
+    pdag.TimeSeriesParameterId((), "location", 0): "start",
+}
+
+
+class RecordingHooks(pdag.ExecutionHooks):
+    def __init__(self) -> None:
+        self.events: list[tuple[Any, ...]] = []
+
+    def before_relationship(self, relationship_id: pdag.RelationshipId, inputs: Mapping[str, Any]) -> None:
+        self.events.append(("before", relationship_id, dict(inputs)))
+
+    def after_relationship(
+        self,
+        relationship_id: pdag.RelationshipId,
+        inputs: Mapping[str, Any],  # noqa: ARG002
+        outputs: Any,
+        elapsed: float,
+    ) -> None:
+        assert elapsed >= 0
+        self.events.append(("after", relationship_id, outputs))
+
+    def case_start(self, case_index: int, inputs: Mapping[pdag.ParameterId, Any]) -> None:  # noqa: ARG002
+        self.events.append(("case_start", case_index))
+
+    def case_end(self, case_index: int, results: Mapping[pdag.ParameterId, Any]) -> None:  # noqa: ARG002
+        self.events.append(("case_end", case_index))
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_relationship_hooks(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(exec_model, INPUTS, backend=backend)
+    hooks = RecordingHooks()
+    exec_model.add_hooks(hooks)
+    assert pdag.execute_exec_model(exec_model, INPUTS, backend=backend) == results
+
+    before_events = [event for event in hooks.events if event[0] == "before"]
+    after_events = [event for event in hooks.events if event[0] == "after"]
+    assert {event[1] for event in before_events} == set(exec_model.relationship_infos)
+    assert len(before_events) == len(after_events) == len(exec_model.relationship_infos)
+
+    transition = pdag.TimeSeriesRelationshipId((), "state_transition", 0)
+    assert ("before", transition, {"location": "start", "action": "go_left"}) in hooks.events
+    assert ("after", transition, "left") in hooks.events
+
+
+def test_hooks_are_compiled_into_plan() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    plain_plan = exec_model.compile()
+    hooks = RecordingHooks()
+    exec_model.add_hooks(hooks)
+    hooked_plan = exec_model.compile()
+    assert hooked_plan is not plain_plan
+
+    exec_model.remove_hooks(hooks)
+    plan = exec_model.compile()
+    pdag.execute_exec_model(exec_model, INPUTS)
+    assert hooks.events == []
+    # Without hooks, the instructions call the relationships directly
+    for instruction in plan.instructions:
+        if isinstance(instruction, CallInstruction):
+            relationship_info = exec_model.relationship_infos[instruction.relationship_id]
+            assert instruction.function is relationship_info.function_relationship.function
+
+
+def test_rolled_relationship_hooks() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    hooks = RecordingHooks()
+    rolled.add_hooks(hooks)
+    pdag.execute_exec_model(rolled, INPUTS)
+    assert sum(event[0] == "after" for event in hooks.events) == len(rolled.unroll().relationship_infos)
+
+
+def test_case_hooks() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    hooks = RecordingHooks()
+    exec_model.add_hooks(hooks)
+    pdag.run_experiments(exec_model, [INPUTS, INPUTS], return_type="list")
+
+    case_events = [event for event in hooks.events if event[0].startswith("case")]
+    assert case_events == [("case_start", 0), ("case_end", 0), ("case_start", 1), ("case_end", 1)]
+    # The relationship hooks are invoked between the case hooks
+    assert hooks.events[0] == ("case_start", 0)
+    assert hooks.events[len(hooks.events) // 2 - 1] == ("case_end", 0)
+
+
+def test_case_hooks_multi_process(tmp_path: Path) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+
+    # The hooks run in the worker processes, so they record their events in a file
+    class FileHooks(pdag.ExecutionHooks):
+        def case_end(self, case_index: int, results: Mapping[pdag.ParameterId, Any]) -> None:  # noqa: ARG002
+            with (tmp_path / "cases.txt").open("a") as f:
+                f.write(f"{case_index}\n")
+
+    exec_model.add_hooks(FileHooks())
+    run_experiments_multi_process(
+        exec_model,
+        [INPUTS] * 3,
+        n_cases=3,
+        parquet_file_path=tmp_path / "results.parquet",
+    )
+    assert sorted((tmp_path / "cases.txt").read_text().split()) == ["0", "1", "2"]
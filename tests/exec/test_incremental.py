@@ -0,0 +1,43 @@
+"""Incremental re-execution."""
+
+import pytest
+
+import pdag
+from pdag.examples import PolynomialModel
+
+
+def _inputs(x: float) -> dict[pdag.ParameterId, float]:
+    return {
+        pdag.StaticParameterId((), "a[0]"): 1.0,
+        pdag.StaticParameterId((), "a[1]"): 2.0,
+        pdag.StaticParameterId((), "a[2]"): 3.0,
+        pdag.StaticParameterId((), "x"): x,
+    }
+
+
+def test_incremental_matches_full_execution() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    previous_results = pdag.execute_exec_model(exec_model, _inputs(4.0))
+
+    changed_inputs: dict[pdag.ParameterId, float] = {pdag.StaticParameterId((), "a[0]"): 10.0}
+    incremental = pdag.execute_exec_model_incremental(exec_model, previous_results, changed_inputs)
+
+    assert incremental.results == pdag.execute_exec_model(exec_model, _inputs(4.0) | changed_inputs)
+    assert len(incremental.recomputed_relationship_ids) < len(exec_model.relationship_infos)
+
+
+def test_incremental_through_submodel() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    previous_results = pdag.execute_exec_model(exec_model, _inputs(4.0))
+
+    changed_inputs: dict[pdag.ParameterId, float] = {pdag.StaticParameterId((), "x"): 5.0}
+    incremental = pdag.execute_exec_model_incremental(exec_model, previous_results, changed_inputs)
+
+    assert incremental.results == pdag.execute_exec_model(exec_model, _inputs(5.0))
+
+
+def test_incremental_rejects_computed_parameter() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    previous_results = pdag.execute_exec_model(exec_model, _inputs(4.0))
+    with pytest.raises(ValueError, match="computed by a relationship"):
+        pdag.execute_exec_model_incremental(exec_model, previous_results, {pdag.StaticParameterId((), "y"): 0.0})
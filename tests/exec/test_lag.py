@@ -0,0 +1,123 @@
+"""Time-series references to the values at a lag or in a window of past time steps."""
+
+from typing import Annotated, Any
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._exec.plan import CallInstruction
+
+N_TIME_STEPS = 6
+LAG = 2
+WINDOW = 3
+NOISE = pdag.TimeSeriesArrayId((), "noise")
+SIGNAL = pdag.TimeSeriesArrayId((), "signal")
+DELAYED = pdag.TimeSeriesArrayId((), "delayed")
+SMOOTHED = pdag.TimeSeriesArrayId((), "smoothed")
+NOISES = [1.0, 4.0, -2.0, 0.5, 3.0, 6.0]
+
+
+class SmoothingModel(pdag.Model):
+    noise = pdag.RealParameter("noise", is_time_series=True)
+    signal = pdag.RealParameter("signal", is_time_series=True)
+    delayed = pdag.RealParameter("delayed", is_time_series=True)
+    smoothed = pdag.RealParameter("smoothed", is_time_series=True)
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def measure(*, noise: Annotated[float, noise.ref()]) -> Annotated[float, signal.ref()]:
+        return 2 * noise
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def delay(*, signal: Annotated[float, signal.ref(lag=LAG)]) -> Annotated[float, delayed.ref()]:
+        return signal
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def smooth(
+        *,
+        signal: Annotated[npt.NDArray[np.float64], signal.ref(window=WINDOW, as_array=True)],
+    ) -> Annotated[float, smoothed.ref()]:
+        return float(signal.mean())
+
+
+def _inputs() -> dict[pdag.ParameterId, Any]:
+    inputs: dict[pdag.ParameterId, Any] = {NOISE.at(time_step): noise for time_step, noise in enumerate(NOISES)}
+    # The lagged and smoothed values before the first full lag and window are given
+    for time_step in range(LAG):
+        inputs[DELAYED.at(time_step)] = 0.0
+    for time_step in range(WINDOW - 1):
+        inputs[SMOOTHED.at(time_step)] = 0.0
+    return inputs
+
+
+def _assert_lagged_and_smoothed(results: pdag.ResultsView | dict[pdag.ParameterId, Any]) -> None:
+    signals = [2 * noise for noise in NOISES]
+    for time_step in range(LAG, N_TIME_STEPS):
+        assert results[DELAYED.at(time_step)] == signals[time_step - LAG]
+    for time_step in range(WINDOW - 1, N_TIME_STEPS):
+        assert results[SMOOTHED.at(time_step)] == pytest.approx(
+            sum(signals[time_step - WINDOW + 1 : time_step + 1]) / WINDOW,
+        )
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_lag_and_window(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SmoothingModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    _assert_lagged_and_smoothed(pdag.execute_exec_model(exec_model, _inputs(), backend=backend))
+    # The relationships are evaluated from the first time step at which the referred values exist
+    assert pdag.TimeSeriesRelationshipId((), "delay", LAG - 1) not in exec_model.relationship_infos
+    assert pdag.TimeSeriesRelationshipId((), "delay", LAG) in exec_model.relationship_infos
+    assert pdag.TimeSeriesRelationshipId((), "smooth", WINDOW - 2) not in exec_model.relationship_infos
+
+
+def test_lag_and_window_rolled() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(SmoothingModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    results = pdag.execute_exec_model(rolled, _inputs())
+    _assert_lagged_and_smoothed(results)
+    unrolled_results = pdag.execute_exec_model(rolled.unroll(), _inputs())
+    assert {parameter_id: results[parameter_id] for parameter_id in unrolled_results} == unrolled_results
+
+
+def test_window_values_are_freed_after_the_window() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SmoothingModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    plan = exec_model.compile(free_intermediates=True)
+    freed_after = {
+        instruction.relationship_id: set(slots)
+        for instruction, slots in zip(plan.instructions, plan.free_after or (), strict=True)
+        if isinstance(instruction, CallInstruction)
+    }
+    # Each signal is dropped once the last window containing it has been smoothed,
+    # so only the values of a window are kept at a time
+    for time_step in range(N_TIME_STEPS - WINDOW + 1):
+        last_reader = pdag.TimeSeriesRelationshipId((), "smooth", time_step + WINDOW - 1)
+        assert plan.slots[SIGNAL.at(time_step)] in freed_after[last_reader]
+    results = plan.execute(_inputs())
+    assert SIGNAL.at(0) not in results
+    assert results[SMOOTHED.at(N_TIME_STEPS - 1)] == pytest.approx(2 * sum(NOISES[-WINDOW:]) / WINDOW)
+
+
+def test_invalid_lag_and_window() -> None:
+    signal = pdag.RealParameter("signal", is_time_series=True)
+    with pytest.raises(ValueError, match="lag must be non-negative"):
+        signal.ref(lag=-1)
+    with pytest.raises(ValueError, match="window must be positive"):
+        signal.ref(window=0)
+    with pytest.raises(ValueError, match="more than one of"):
+        pdag.ParameterRef("signal", previous=True, lag=2)
+
+    class StaticWindowModel(pdag.Model):
+        gain = pdag.RealParameter("gain")
+        signal = pdag.RealParameter("signal", is_time_series=True)
+
+        @pdag.relationship(at_each_time_step=True)
+        @staticmethod
+        def amplify(*, gain: Annotated[Any, gain.ref(window=2)]) -> Annotated[float, signal.ref()]:
+            return float(gain.sum())
+
+    with pytest.raises(ValueError, match="only supported for time-series parameters"):
+        pdag.create_exec_model_from_core_model(StaticWindowModel.to_core_model(), n_time_steps=3)
@@ -0,0 +1,38 @@
+"""Freeing intermediate values after their last use."""
+
+from typing import Literal
+
+import pytest
+
+import pdag
+from pdag.examples import DiamondMdpModel
+
+INPUTS: dict[pdag.ParameterId, str] = {
+    pdag.StaticParameterId((), "policy"): "left",
+    pdag.TimeSeriesParameterId((), "location", 0): "start",
+}
+CUMULATIVE_REWARD = pdag.StaticParameterId((), "cumulative_reward")
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_free_intermediates_with_outputs(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=5)
+    results = pdag.execute_exec_model(
+        exec_model,
+        INPUTS,
+        outputs=[CUMULATIVE_REWARD],
+        backend=backend,
+        free_intermediates=True,
+    )
+    assert results == INPUTS | {CUMULATIVE_REWARD: 1.0}
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_free_intermediates_keeps_unused_parameters(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=5)
+    full_results = pdag.execute_exec_model(exec_model, INPUTS)
+    results = pdag.execute_exec_model(exec_model, INPUTS, backend=backend, free_intermediates=True)
+
+    assert results[CUMULATIVE_REWARD] == full_results[CUMULATIVE_REWARD]
+    assert pdag.TimeSeriesParameterId((), "reward", 2) not in results
+    assert results.items() <= full_results.items()
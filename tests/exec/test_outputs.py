@@ -0,0 +1,46 @@
+"""Execute only the part of the model needed for the requested outputs."""
+
+from typing import Literal
+
+import pytest
+
+import pdag
+from pdag.examples import TwoSquares
+
+INPUTS = {
+    pdag.StaticParameterId((), "x"): 4.0,
+    pdag.StaticParameterId((), "y"): 5.0,
+}
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_outputs(backend: Literal["interpreter", "codegen"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    results = pdag.execute_exec_model(
+        exec_model,
+        INPUTS,
+        outputs=[pdag.StaticParameterId((), "x_squared")],
+        backend=backend,
+    )
+    assert results == INPUTS | {
+        pdag.StaticParameterId(("calc_square_term[x]",), "x"): 4.0,
+        pdag.StaticParameterId(("calc_square_term[x]",), "y"): 16.0,
+        pdag.StaticParameterId((), "x_squared"): 16.0,
+    }
+
+
+def test_outputs_plan_is_cached_and_requires_only_needed_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    outputs = [pdag.StaticParameterId((), "y_squared")]
+    plan = exec_model.compile(outputs=outputs)
+    assert plan is exec_model.compile(outputs=set(outputs))
+    assert len(plan.instructions) < len(exec_model.compile().instructions)
+
+    results = plan.execute({pdag.StaticParameterId((), "y"): 5.0})
+    assert results[pdag.StaticParameterId((), "y_squared")] == 25.0  # noqa: PLR2004
+
+
+def test_unknown_output() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    with pytest.raises(ValueError, match="not in the model"):
+        pdag.execute_exec_model(exec_model, INPUTS, outputs=[pdag.StaticParameterId((), "unknown")])
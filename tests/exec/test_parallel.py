@@ -0,0 +1,33 @@
+"""Level-scheduled parallel execution."""
+
+from typing import Literal
+
+import pytest
+
+import pdag
+from pdag.examples import DiamondMdpModel, EachSquaredModel
+
+
+def test_levels() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(EachSquaredModel.to_core_model())
+    plan = exec_model.compile()
+    # The three squares are independent of each other
+    assert [len(level) for level in plan.levels()] == [3]
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_parallel_matches_sequential(pool: Literal["thread", "process"]) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(EachSquaredModel.to_core_model())
+    inputs = {pdag.StaticParameterId((), f"m[{k}]"): float(i) for i, k in enumerate("abc")}
+    results = pdag.execute_exec_model_parallel(exec_model, inputs, pool=pool, max_workers=2)
+    assert results == pdag.execute_exec_model(exec_model, inputs)
+
+
+def test_parallel_time_series() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=4)
+    inputs: dict[pdag.ParameterId, str] = {
+        pdag.StaticParameterId((), "policy"): "left",
+        pdag.TimeSeriesParameterId((), "location", 0): "start",
+    }
+    results = pdag.execute_exec_model_parallel(exec_model, inputs, max_workers=2)
+    assert results == pdag.execute_exec_model(exec_model, inputs)
@@ -0,0 +1,34 @@
+"""Compiled execution plan."""
+
+import pytest
+
+import pdag
+from pdag.examples import DiamondMdpModel, PolynomialModel
+
+
+def test_compile_is_cached() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    assert exec_model.compile() is exec_model.compile()
+
+
+def test_results_view() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    inputs = {
+        pdag.StaticParameterId((), "a[0]"): 1.0,
+        pdag.StaticParameterId((), "a[1]"): 2.0,
+        pdag.StaticParameterId((), "a[2]"): 3.0,
+        pdag.StaticParameterId((), "x"): 4.0,
+    }
+    results = exec_model.compile().execute(inputs)
+
+    assert results[pdag.StaticParameterId((), "y")] == 1 + 2 * 4 + 3 * 4**2
+    assert pdag.StaticParameterId(("calc_square_term",), "y") in results
+    assert pdag.StaticParameterId((), "unknown") not in results
+    assert len(results) == 8  # noqa: PLR2004
+    assert results == pdag.execute_exec_model(exec_model, inputs)
+
+
+def test_missing_input() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=4)
+    with pytest.raises(ValueError, match="not in inputs"):
+        exec_model.compile().execute({pdag.StaticParameterId((), "policy"): "left"})
@@ -0,0 +1,93 @@
+"""Per-relationship profiling statistics."""
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 5
+CASES: list[dict[pdag.ParameterId, str]] = [
+    {
+        pdag.StaticParameterId((), "policy"): policy,
+        pdag.TimeSeriesParameterId((), "location", 0): "start",
+    }
+    for policy in ("left", "right")
+]
+
+
+def _expected_calls(exec_model: pdag.ExecutionModel, n_cases: int) -> dict[tuple[tuple[str, ...], str], int]:
+    counts = Counter(
+        (relationship_id.model_path, relationship_id.name) for relationship_id in exec_model.relationship_infos
+    )
+    return {key: count * n_cases for key, count in counts.items()}
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_profile_execute(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    profile = pdag.Profile()
+    for case in CASES:
+        results = pdag.execute_exec_model(exec_model, case, backend=backend, profile=profile)
+        assert results == pdag.execute_exec_model(exec_model, case)
+
+    assert {key: stats.calls for key, stats in profile.stats.items()} == _expected_calls(exec_model, len(CASES))
+    for stats in profile.stats.values():
+        assert stats.max_time <= stats.total_time
+        assert stats.output_size > 0
+
+
+def test_profile_rolled() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    profile = pdag.Profile()
+    pdag.execute_exec_model(rolled, CASES[0], profile=profile)
+    assert {key: stats.calls for key, stats in profile.stats.items()} == _expected_calls(rolled.unroll(), 1)
+
+
+def test_profile_merge_and_to_df() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    profile = pdag.Profile()
+    for case in CASES:
+        case_profile = pdag.Profile()
+        pdag.execute_exec_model(exec_model, case, profile=case_profile)
+        profile.merge(case_profile)
+
+    df = profile.to_df()
+    assert df.columns == [
+        "model_path",
+        "relationship",
+        "calls",
+        "total_time",
+        "mean_time",
+        "max_time",
+        "output_size",
+    ]
+    assert dict(zip(df["relationship"], df["calls"], strict=True)) == {
+        name: calls for (_, name), calls in _expected_calls(exec_model, len(CASES)).items()
+    }
+    assert df["total_time"].is_sorted(descending=True)
+
+
+def test_profile_run_experiments() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    profile = pdag.Profile()
+    pdag.run_experiments(exec_model, CASES, n_cases=len(CASES), profile=profile)
+    assert {key: stats.calls for key, stats in profile.stats.items()} == _expected_calls(exec_model, len(CASES))
+
+
+def test_profile_run_experiments_multi_process(tmp_path: Path) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    profile = pdag.Profile()
+    run_experiments_multi_process(
+        exec_model,
+        CASES,
+        n_cases=len(CASES),
+        parquet_file_path=tmp_path / "results.parquet",
+        profile=profile,
+    )
+    # The statistics of all workers are merged
+    assert {key: stats.calls for key, stats in profile.stats.items()} == _expected_calls(exec_model, len(CASES))
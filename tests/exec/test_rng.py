@@ -0,0 +1,282 @@
+"""Per-case random number generators given to the relationships as `ExecInfo("rng")`."""
+
+import asyncio
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Annotated, Any
+
+import numpy as np
+import polars as pl
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._exec.parallel import PoolType
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+from pdag._experiment.runner import _case_rng
+
+N_TIME_STEPS = 4
+N_CASES = 3
+SEED = 42
+CHECKPOINT_STEP = 2
+DRIFT = pdag.StaticParameterId((), "drift")
+POSITION = pdag.TimeSeriesArrayId((), "position")
+
+
+class RandomWalkModel(pdag.Model):
+    drift = pdag.RealParameter("drift")
+    position = pdag.RealParameter("position", is_time_series=True)
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, position.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def walk(
+        *,
+        drift: Annotated[float, drift.ref()],
+        previous_position: Annotated[float, position.ref(previous=True)],
+        rng: Annotated[np.random.Generator, pdag.ExecInfo("rng")],
+    ) -> Annotated[float, position.ref()]:
+        return previous_position + drift + rng.normal()
+
+
+def _positions(results: Mapping[Any, Any]) -> list[float]:
+    return [results[POSITION.at(time_step)] for time_step in range(N_TIME_STEPS)]
+
+
+def _expected_positions(rng: np.random.Generator, drift: float = 1.0) -> list[float]:
+    positions = [0.0]
+    for _ in range(1, N_TIME_STEPS):
+        positions.append(positions[-1] + drift + rng.normal())
+    return positions
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_rng(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    assert exec_model.uses_rng
+    # The generator is a reserved input, not a parameter of the model
+    assert pdag.RNG_ID not in exec_model.input_parameter_ids()
+    results = pdag.execute_exec_model(
+        exec_model,
+        {DRIFT: 1.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+        backend=backend,
+    )
+    assert _positions(results) == _expected_positions(np.random.default_rng(SEED))
+
+
+def test_rng_rolled() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    assert rolled.uses_rng
+    results = pdag.execute_exec_model(rolled, {DRIFT: 1.0, pdag.RNG_ID: np.random.default_rng(SEED)})
+    assert _positions(results) == _expected_positions(np.random.default_rng(SEED))
+
+
+def test_case_rng() -> None:
+    seed_sequence = np.random.SeedSequence(SEED)
+    children = np.random.SeedSequence(SEED).spawn(N_CASES)
+    for case_index, child in enumerate(children):
+        assert _case_rng(seed_sequence, case_index).random() == np.random.default_rng(child).random()
+
+
+@pytest.mark.parametrize("share_prefixes", [False, True])
+def test_run_experiments_rng(*, share_prefixes: bool) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    cases: list[dict[pdag.ParameterId, float]] = [{DRIFT: 1.0}] * N_CASES
+    results = pdag.run_experiments(
+        exec_model,
+        cases,
+        return_type="list",
+        seed=SEED,
+        share_prefixes=share_prefixes,
+        deduplicate=True,
+    )
+    # The identical cases draw from their own generators, so they are neither merged nor shared
+    children = np.random.SeedSequence(SEED).spawn(N_CASES)
+    assert [_positions(result) for result in results] == [
+        _expected_positions(np.random.default_rng(child)) for child in children
+    ]
+    assert all(pdag.RNG_ID not in result for result in results)
+    # The results are reproduced with the same seed
+    assert results == pdag.run_experiments(exec_model, cases, return_type="list", seed=SEED)
+
+
+def test_run_experiments_rng_multi_process(tmp_path: Path) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    cases: list[dict[pdag.ParameterId, float]] = [{DRIFT: 1.0}] * N_CASES
+    metadata = [{"case": case_index} for case_index in range(N_CASES)]
+    parquet_file_path = tmp_path / "results.parquet"
+    run_experiments_multi_process(
+        exec_model,
+        cases,
+        metadata=metadata,
+        n_cases=N_CASES,
+        parquet_file_path=parquet_file_path,
+        seed=SEED,
+    )
+    # The draws of each case do not depend on the worker that runs it
+    results = pl.read_parquet(parquet_file_path).sort("case", "time_step")
+    expected = pdag.run_experiments(exec_model, cases, metadata=metadata, seed=SEED).sort("case", "time_step")
+    assert results.equals(expected.select(results.columns))
+
+
+def test_rng_specialize() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    # The random steps are not folded into constants even if all the parameters are fixed
+    specialized = exec_model.specialize({DRIFT: 1.0})
+    assert {relationship_id.name for relationship_id in specialized.relationship_infos} == {"walk"}
+    results = pdag.execute_exec_model(specialized, {pdag.RNG_ID: np.random.default_rng(SEED)})
+    assert _positions(results) == _expected_positions(np.random.default_rng(SEED))
+
+    profile = pdag.Profile()
+    pdag.run_experiments(exec_model, [{DRIFT: 1.0}] * N_CASES, constant_inputs="detect", profile=profile, seed=SEED)
+    walk_calls = sum(stats.calls for key, stats in profile.stats.items() if "walk" in str(key))
+    assert walk_calls == N_CASES * (N_TIME_STEPS - 1)
+
+
+@pytest.mark.parametrize("rolled", [False, True])
+def test_rng_checkpoint(*, rolled: bool) -> None:
+    core_model = RandomWalkModel.to_core_model()
+    exec_model: pdag.ExecutionModel | pdag.RolledExecutionModel = (
+        pdag.create_rolled_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+        if rolled
+        else pdag.create_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+    )
+    state = pdag.checkpoint_exec_model(
+        exec_model,
+        {DRIFT: 1.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+        time_step=CHECKPOINT_STEP,
+    )
+    # Each execution resumed from the state draws from its own copy of the generator
+    expected = _expected_positions(np.random.default_rng(SEED))[CHECKPOINT_STEP:]
+    for _ in range(2):
+        results = pdag.execute_exec_model(exec_model, {}, state=state)
+        assert [results[POSITION.at(time_step)] for time_step in range(CHECKPOINT_STEP, N_TIME_STEPS)] == expected
+
+
+def test_rng_incremental() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    previous_results = pdag.execute_exec_model(exec_model, {DRIFT: 1.0, pdag.RNG_ID: np.random.default_rng(SEED)})
+    with pytest.raises(ValueError, match="must be given as RNG_ID in changed_inputs"):
+        pdag.execute_exec_model_incremental(exec_model, previous_results, {DRIFT: 2.0})
+
+    incremental = pdag.execute_exec_model_incremental(
+        exec_model,
+        previous_results,
+        {DRIFT: 2.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+    )
+    assert _positions(incremental.results) == _expected_positions(np.random.default_rng(SEED), drift=2.0)
+
+
+class TwoDrawsModel(pdag.Model):
+    x = pdag.RealParameter("x")
+    a = pdag.RealParameter("a")
+    b = pdag.RealParameter("b")
+
+    @pdag.relationship
+    @staticmethod
+    def draw_a(*, rng: Annotated[np.random.Generator, pdag.ExecInfo("rng")]) -> Annotated[float, a.ref()]:
+        return rng.normal()
+
+    @pdag.relationship
+    @staticmethod
+    def draw_b(
+        *,
+        x: Annotated[float, x.ref()],
+        rng: Annotated[np.random.Generator, pdag.ExecInfo("rng")],
+    ) -> Annotated[float, b.ref()]:
+        return x + 1e6 * rng.normal()
+
+
+@pytest.mark.parametrize("pool", [None, "thread", "process"])
+def test_rng_sensitivity(pool: PoolType | None) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(RandomWalkModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    sensitivity = pdag.execute_exec_model_sensitivity(
+        exec_model,
+        {DRIFT: 1.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+        outputs=[POSITION.at(N_TIME_STEPS - 1)],
+        pool=pool,
+    )
+    # The perturbed executions draw the same random numbers as the base execution
+    assert sensitivity.derivatives()[DRIFT][POSITION.at(N_TIME_STEPS - 1)] == pytest.approx(N_TIME_STEPS - 1)
+
+    # The relationships that are not downstream of the perturbed input also draw again, in the same order
+    exec_model = pdag.create_exec_model_from_core_model(TwoDrawsModel.to_core_model())
+    x, b = pdag.StaticParameterId((), "x"), pdag.StaticParameterId((), "b")
+    sensitivity = pdag.execute_exec_model_sensitivity(
+        exec_model,
+        {x: 0.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+        outputs=[b],
+        pool=pool,
+    )
+    assert sensitivity.derivatives()[x][b] == pytest.approx(1.0, rel=1e-3)
+
+
+class DelayedDrawModel(pdag.Model):
+    x = pdag.RealParameter("x")
+    y = pdag.RealParameter("y")
+    z = pdag.RealParameter("z")
+    a = pdag.RealParameter("a")
+    b = pdag.RealParameter("b")
+
+    @pdag.relationship
+    @staticmethod
+    async def delay(*, x: Annotated[float, x.ref()]) -> Annotated[float, y.ref()]:
+        await asyncio.sleep(0.01)
+        return x
+
+    @pdag.relationship
+    @staticmethod
+    def copy(*, x: Annotated[float, x.ref()]) -> Annotated[float, z.ref()]:
+        return x
+
+    @pdag.relationship
+    @staticmethod
+    def draw_a(
+        *,
+        y: Annotated[float, y.ref()],
+        rng: Annotated[np.random.Generator, pdag.ExecInfo("rng")],
+    ) -> Annotated[float, a.ref()]:
+        return y + rng.normal()
+
+    @pdag.relationship
+    @staticmethod
+    def draw_b(
+        *,
+        z: Annotated[float, z.ref()],
+        rng: Annotated[np.random.Generator, pdag.ExecInfo("rng")],
+    ) -> Annotated[float, b.ref()]:
+        return z + 1e6 * rng.normal()
+
+
+def _draws(results: Mapping[pdag.ParameterId, Any]) -> tuple[float, float]:
+    return results[pdag.StaticParameterId((), "a")], results[pdag.StaticParameterId((), "b")]
+
+
+@pytest.mark.parametrize("pool", ["thread", "process"])
+def test_rng_parallel(pool: PoolType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoDrawsModel.to_core_model())
+    x = pdag.StaticParameterId((), "x")
+    expected = pdag.execute_exec_model(exec_model, {x: 0.0, pdag.RNG_ID: np.random.default_rng(SEED)})
+    # The independent relationships draw one after the other from the same generator, in the sequential order
+    for _ in range(2):
+        results = pdag.execute_exec_model_parallel(
+            exec_model,
+            {x: 0.0, pdag.RNG_ID: np.random.default_rng(SEED)},
+            pool=pool,
+        )
+        assert _draws(results) == _draws(expected)
+
+
+def test_rng_async() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(DelayedDrawModel.to_core_model())
+    x = pdag.StaticParameterId((), "x")
+    expected = pdag.execute_exec_model(exec_model, {x: 0.0, pdag.RNG_ID: np.random.default_rng(SEED)})
+    # The draws wait for the relationships that draw before them in the sequential order, even if they are ready
+    results = asyncio.run(
+        pdag.execute_exec_model_async(exec_model, {x: 0.0, pdag.RNG_ID: np.random.default_rng(SEED)}),
+    )
+    assert _draws(results) == _draws(expected)
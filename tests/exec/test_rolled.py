@@ -0,0 +1,62 @@
+"""Rolled time-loop execution."""
+
+from typing import Any
+
+import pytest
+
+import pdag
+from pdag.examples import DiamondMdpModel, PolynomialModel, TreasureModel
+from pdag.examples._treasure import AgentPolicy, Cell
+
+CASES: list[tuple[type[pdag.Model], int, dict[pdag.ParameterId, Any]]] = [
+    (
+        DiamondMdpModel,
+        5,
+        {
+            pdag.StaticParameterId((), "policy"): "left",
+            pdag.TimeSeriesParameterId((), "location", 0): "start",
+        },
+    ),
+    (
+        TreasureModel,
+        8,
+        {
+            pdag.StaticParameterId((), "treasure_location"): Cell(col=1, row=1),
+            pdag.StaticParameterId((), "time_limit"): 6.0,
+            pdag.StaticParameterId((), "agent_policy"): AgentPolicy(type="sweep"),
+        },
+    ),
+    (
+        PolynomialModel,
+        1,
+        {
+            pdag.StaticParameterId((), "a[0]"): 1.0,
+            pdag.StaticParameterId((), "a[1]"): 2.0,
+            pdag.StaticParameterId((), "a[2]"): 3.0,
+            pdag.StaticParameterId((), "x"): 2.0,
+        },
+    ),
+]
+
+
+@pytest.mark.parametrize(("model", "n_time_steps", "inputs"), CASES)
+def test_rolled_matches_unrolled(
+    model: type[pdag.Model],
+    n_time_steps: int,
+    inputs: dict[pdag.ParameterId, Any],
+) -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(model.to_core_model(), n_time_steps=n_time_steps)
+    results = pdag.execute_exec_model(rolled, inputs)
+    assert results == pdag.execute_exec_model(rolled.unroll(), inputs)
+
+
+def test_rolled_keeps_single_template() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=1_000)
+    assert len(rolled.step_relationship_infos) == 3  # noqa: PLR2004
+    assert len(rolled.static_relationship_infos) == 2  # noqa: PLR2004
+
+
+def test_rolled_missing_input() -> None:
+    rolled = pdag.create_rolled_exec_model_from_core_model(DiamondMdpModel.to_core_model(), n_time_steps=4)
+    with pytest.raises(ValueError, match="not in inputs"):
+        pdag.execute_exec_model(rolled, {pdag.StaticParameterId((), "policy"): "left"})
@@ -0,0 +1,151 @@
+"""Running cases as a scenario tree that shares the time steps before the cases diverge."""
+
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Annotated, Any
+
+import numpy as np
+import polars as pl
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag._experiment.multi_process import run_experiments as run_experiments_multi_process
+from pdag._experiment.runner import _group_cases
+
+N_TIME_STEPS = 6
+RATE = pdag.StaticParameterId((), "rate")
+ACTION = pdag.TimeSeriesArrayId((), "action")
+
+
+class InvestmentModel(pdag.Model):
+    rate = pdag.RealParameter("rate")
+    action = pdag.RealParameter("action", is_time_series=True)
+    capital = pdag.RealParameter("capital", is_time_series=True)
+    total = pdag.RealParameter("total")
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, capital.ref(initial=True)]:
+        return 1.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def invest(
+        *,
+        rate: Annotated[float, rate.ref()],
+        previous_capital: Annotated[float, capital.ref(previous=True)],
+        action: Annotated[float, action.ref()],
+    ) -> Annotated[float, capital.ref()]:
+        return previous_capital * (1 + rate) + action
+
+    @pdag.relationship
+    @staticmethod
+    def sum_capital(
+        *,
+        capital: Annotated[list[float], capital.ref(all_time_steps=True)],
+    ) -> Annotated[float, total.ref()]:
+        return sum(capital)
+
+
+class CountingHooks(pdag.ExecutionHooks):
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+        self.finished_cases: list[int] = []
+
+    def before_relationship(self, relationship_id: pdag.RelationshipId, inputs: Mapping[str, Any]) -> None:  # noqa: ARG002
+        self.calls[relationship_id.name] += 1
+
+    def case_end(self, case_index: int, results: Mapping[pdag.ParameterId, Any]) -> None:  # noqa: ARG002
+        self.finished_cases.append(case_index)
+
+
+def _case(actions: list[float]) -> dict[pdag.ParameterId, Any]:
+    return {RATE: 0.5} | {ACTION.at(time_step): action for time_step, action in enumerate(actions)}
+
+
+# The cases share the actions up to time step 2, and the last two cases up to time step 4
+CASES = [
+    _case([0.0, 1.0, 2.0, 0.0, 0.0, 0.0]),
+    _case([0.0, 1.0, 2.0, 5.0, 5.0, 5.0]),
+    _case([0.0, 1.0, 2.0, 5.0, 5.0, -1.0]),
+]
+METADATA = [{"policy": "hold"}, {"policy": "invest"}, {"policy": "invest_then_sell"}]
+
+
+def test_group_cases() -> None:
+    cases: list[dict[pdag.ParameterId, Any]] = [
+        {RATE: 0.5},
+        {RATE: 0.1},
+        {RATE: 0.5},
+        {},
+        {RATE: np.zeros(2)},
+        {RATE: [1.0]},
+        {RATE: [1.0]},
+    ]
+    groups = _group_cases(enumerate(cases), [RATE])
+    # The cases with unhashable values are only grouped if their values are equal
+    assert [[case_index for case_index, _ in group] for group in groups] == [[0, 2], [1], [3], [4], [5, 6]]
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_scenario_tree(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(InvestmentModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.run_experiments(exec_model, CASES, metadata=METADATA, return_type="list")
+    hooks = CountingHooks()
+    exec_model.add_hooks(hooks)
+    results = pdag.run_experiments(
+        exec_model,
+        CASES,
+        metadata=METADATA,
+        return_type="list",
+        backend=backend,
+        share_prefixes=True,
+    )
+    assert results == expected
+    # The time steps 1 and 2 are run once, the time steps 3 and 4 twice, and the time step 5 for each case
+    assert hooks.calls == {"start": 1, "invest": 2 + 2 * 2 + 3, "sum_capital": 3}
+    assert sorted(hooks.finished_cases) == [0, 1, 2]
+
+
+def test_scenario_tree_df() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(InvestmentModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    expected = pdag.run_experiments(exec_model, CASES, metadata=METADATA)
+    results = pdag.run_experiments(exec_model, CASES, metadata=METADATA, share_prefixes=True)
+    # The case IDs are random
+    assert results.drop("case_id").equals(expected.drop("case_id"))
+
+
+def test_scenario_tree_divergent_first_step_and_constant_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(InvestmentModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    # The cases diverge at the first time step that reads the actions, and the rate is hoisted
+    cases = [_case([0.0, float(first), 0.0, 0.0, 0.0, 0.0]) for first in (1, 2, 1)]
+    profile = pdag.Profile()
+    results = pdag.run_experiments(
+        exec_model,
+        cases,
+        return_type="list",
+        constant_inputs="detect",
+        profile=profile,
+        share_prefixes=True,
+    )
+    assert results == pdag.run_experiments(exec_model, cases, return_type="list")
+    # The first and last cases are identical, so they share all the time steps
+    invest_calls = sum(stats.calls for key, stats in profile.stats.items() if "invest" in str(key))
+    assert invest_calls == 2 * (N_TIME_STEPS - 1)
+
+
+def test_scenario_tree_multi_process(tmp_path: Path) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(InvestmentModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    parquet_file_path = tmp_path / "results.parquet"
+    run_experiments_multi_process(
+        exec_model,
+        CASES,
+        metadata=METADATA,
+        parquet_file_path=parquet_file_path,
+        share_prefixes=True,
+    )
+    results = pl.read_parquet(parquet_file_path).sort("policy", "time_step")
+    expected = pdag.run_experiments(exec_model, CASES, metadata=METADATA).sort("policy", "time_step")
+    assert results.equals(expected.select(results.columns))
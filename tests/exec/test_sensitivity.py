@@ -0,0 +1,73 @@
+"""Finite-difference sensitivities around a base case."""
+
+from collections import Counter
+from collections.abc import Mapping
+from typing import Any
+
+import pytest
+
+import pdag
+from pdag._exec.parallel import PoolType
+from pdag.examples import PolynomialModel, TwoSquares
+
+X = pdag.StaticParameterId((), "x")
+Y = pdag.StaticParameterId((), "y")
+Z = pdag.StaticParameterId((), "z")
+A = [pdag.StaticParameterId((), f"a[{i}]") for i in range(3)]
+POLYNOMIAL_CASE: dict[pdag.ParameterId, Any] = {A[0]: 1.0, A[1]: 2.0, A[2]: 3.0, X: 4.0}
+
+
+class CountingHooks(pdag.ExecutionHooks):
+    def __init__(self) -> None:
+        self.calls: Counter[str] = Counter()
+
+    def before_relationship(self, relationship_id: pdag.RelationshipId, inputs: Mapping[str, Any]) -> None:  # noqa: ARG002
+        self.calls[relationship_id.node_path_str] += 1
+
+
+@pytest.mark.parametrize("pool", [None, "thread", "process"])
+def test_sensitivity_derivatives(pool: PoolType | None) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(PolynomialModel.to_core_model())
+    sensitivity = pdag.execute_exec_model_sensitivity(exec_model, POLYNOMIAL_CASE, outputs=[Y], pool=pool)
+
+    assert sensitivity.base_results == pdag.execute_exec_model(exec_model, POLYNOMIAL_CASE)
+    assert set(sensitivity.steps) == {*A, X}
+    assert sensitivity.steps[X] == pytest.approx(4e-6)
+    derivatives = sensitivity.derivatives()
+    # The derivatives of the polynomial y with respect to the coefficients and x
+    expected = {A[0]: 1.0, A[1]: 4.0, A[2]: 16.0, X: 2.0 + 2 * 3.0 * 4.0}
+    for input_id, derivative in expected.items():
+        assert derivatives[input_id][Y] == pytest.approx(derivative, rel=1e-4)
+
+
+def test_sensitivity_only_reruns_downstream() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    hooks = CountingHooks()
+    exec_model.add_hooks(hooks)
+    sensitivity = pdag.execute_exec_model_sensitivity(exec_model, {X: 1.0, Y: 2.0}, [X])
+
+    # The base case runs every relationship once, and the perturbation of `x` does not rerun the square of `y`
+    assert hooks.calls == {
+        "calc_square_term[x].square": 2,
+        "calc_square_term[y].square": 1,
+        "squares": 2,
+    }
+    assert sensitivity.deltas[X][Z] == pytest.approx(2e-6)
+    assert sensitivity.deltas[X][pdag.StaticParameterId((), "y_squared")] == 0.0
+
+
+def test_sensitivity_to_df() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    sensitivity = pdag.execute_exec_model_sensitivity(exec_model, {X: 1.0, Y: 2.0}, outputs=[Z])
+    df = sensitivity.to_df(derivatives=True)
+    assert df.columns == ["input", "step", "z"]
+    assert df["input"].to_list() == ["x", "y"]
+    assert df["z"].to_list() == pytest.approx([2.0, 4.0], rel=1e-4)
+
+
+def test_sensitivity_invalid_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    with pytest.raises(ValueError, match="not a real input parameter"):
+        pdag.execute_exec_model_sensitivity(exec_model, {X: 1.0, Y: 2.0}, [Z])
+    with pytest.raises(TypeError, match="does not have a real value"):
+        pdag.execute_exec_model_sensitivity(exec_model, {X: 1.0, Y: 2.0}, outputs=[pdag.StaticParameterId((), "w")])
@@ -0,0 +1,100 @@
+"""Specializing execution models by folding fixed inputs into constants."""
+
+from typing import Annotated, Any
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag.examples import TwoSquares
+
+N_TIME_STEPS = 3
+SCALE = pdag.StaticParameterId((), "scale")
+GAIN = pdag.StaticParameterId((), "gain")
+STEP = pdag.StaticParameterId((), "step")
+POSITION = pdag.TimeSeriesArrayId((), "position")
+
+SETUP_CALLS: list[float] = []
+
+
+class SetupModel(pdag.Model):
+    scale = pdag.RealParameter("scale", lower_bound=0.0, upper_bound=1.0)
+    gain = pdag.RealParameter("gain")
+    step = pdag.RealParameter("step", lower_bound=0.0, upper_bound=1.0)
+    position = pdag.RealParameter("position", is_time_series=True)
+
+    @pdag.relationship
+    @staticmethod
+    def setup(*, scale: Annotated[float, scale.ref()]) -> Annotated[float, gain.ref()]:
+        SETUP_CALLS.append(scale)
+        return 10 * scale
+
+    @pdag.relationship
+    @staticmethod
+    def start() -> Annotated[float, position.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def walk(
+        *,
+        gain: Annotated[float, gain.ref()],
+        step: Annotated[float, step.ref()],
+        previous_position: Annotated[float, position.ref(previous=True)],
+    ) -> Annotated[float, position.ref()]:
+        return previous_position + gain * step
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_specialize(backend: BackendType) -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    SETUP_CALLS.clear()
+    specialized = exec_model.specialize({SCALE: 2.0})
+    assert SETUP_CALLS == [2.0]
+    assert specialized.input_parameter_ids() == {STEP}
+    assert pdag.StaticRelationshipId((), "setup") not in specialized.relationship_infos
+    assert exec_model.input_parameter_ids() == {SCALE, STEP}
+
+    results = pdag.execute_exec_model(specialized, {STEP: 3.0}, backend=backend)
+    assert results == pdag.execute_exec_model(exec_model, {SCALE: 2.0, STEP: 3.0})
+    assert results[GAIN] == 20.0  # noqa: PLR2004
+    assert SETUP_CALLS == [2.0, 2.0]
+
+
+def test_specialize_through_submodel() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(TwoSquares.to_core_model())
+    x = pdag.StaticParameterId((), "x")
+    y = pdag.StaticParameterId((), "y")
+    specialized = exec_model.specialize({x: 3.0})
+    assert specialized.input_parameter_ids() == {y}
+    # Only the sub-model relationship of `y` and the sum are left
+    assert len(specialized.relationship_infos) == 2  # noqa: PLR2004
+    assert pdag.execute_exec_model(specialized, {y: 4.0}) == pdag.execute_exec_model(exec_model, {x: 3.0, y: 4.0})
+
+    twice_specialized = specialized.specialize({y: 4.0})
+    assert twice_specialized.input_parameter_ids() == set()
+    assert twice_specialized.relationship_infos == {}
+    assert pdag.execute_exec_model(twice_specialized, {})[pdag.StaticParameterId((), "z")] == 25.0  # noqa: PLR2004
+
+
+def test_sample_free_inputs() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    specialized = exec_model.specialize({SCALE: 0.5})
+    cases = pdag.sample_parameter_values(specialized.input_parameters(), 4)
+    assert all(case.keys() == {STEP} for case in cases)
+    results: list[dict[Any, Any]] = pdag.run_experiments(specialized, cases, return_type="list")
+    assert [result[SCALE] for result in results] == [0.5] * 4
+
+
+def test_specialize_rejects_non_input() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    with pytest.raises(ValueError, match="not an input of the model"):
+        exec_model.specialize({GAIN: 1.0})
+
+
+def test_incremental_rejects_fixed_input() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(SetupModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    specialized = exec_model.specialize({SCALE: 2.0})
+    previous_results = pdag.execute_exec_model(specialized, {STEP: 1.0})
+    with pytest.raises(ValueError, match="fixed in the specialized model"):
+        pdag.execute_exec_model_incremental(specialized, previous_results, {SCALE: 3.0})
@@ -0,0 +1,136 @@
+"""Early termination of the time steps on a stop condition."""
+
+import dataclasses
+from typing import Annotated, Any, Literal
+
+import pytest
+
+import pdag
+from pdag._exec.model import BackendType
+from pdag.examples import DiamondMdpModel
+
+N_TIME_STEPS = 10
+CALLED_TIME_STEPS: list[int] = []
+
+
+class CounterModel(pdag.Model):
+    count = pdag.RealParameter("count", is_time_series=True)
+    total = pdag.RealParameter("total")
+
+    stop = pdag.StopCondition(count.ref(), predicate=lambda count: count >= 3)  # noqa: PLR2004
+
+    @pdag.relationship
+    @staticmethod
+    def initial_count() -> Annotated[float, count.ref(initial=True)]:
+        return 0.0
+
+    @pdag.relationship(at_each_time_step=True)
+    @staticmethod
+    def increment(
+        count: Annotated[float, count.ref()],
+        time: Annotated[int, pdag.ExecInfo("time")],
+    ) -> Annotated[float, count.ref(next=True)]:
+        CALLED_TIME_STEPS.append(time)
+        return count + 1
+
+    @pdag.relationship
+    @staticmethod
+    def sum_counts(count: Annotated[list[float], count.ref(all_time_steps=True)]) -> Annotated[float, total.ref()]:
+        return sum(count)
+
+
+def _execute(
+    core_model: pdag.CoreModel,
+    backend: BackendType | Literal["rolled"],
+    *,
+    outputs: list[pdag.ParameterId] | None = None,
+    free_intermediates: bool = False,
+) -> dict[pdag.ParameterId, Any]:
+    if backend == "rolled":
+        rolled = pdag.create_rolled_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+        return pdag.execute_exec_model(rolled, {}, outputs=outputs, free_intermediates=free_intermediates)
+    exec_model = pdag.create_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+    return pdag.execute_exec_model(
+        exec_model,
+        {},
+        backend=backend,
+        outputs=outputs,
+        free_intermediates=free_intermediates,
+    )
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen", "rolled"])
+def test_stop_skips_remaining_time_steps(backend: BackendType | Literal["rolled"]) -> None:
+    CALLED_TIME_STEPS.clear()
+    results = _execute(CounterModel.to_core_model(), backend)
+
+    assert CALLED_TIME_STEPS == [0, 1, 2, 3]
+    counts = [results[pdag.TimeSeriesParameterId((), "count", time_step)] for time_step in range(N_TIME_STEPS)]
+    assert counts == [0.0, 1.0, 2.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0]
+    assert results[pdag.StaticParameterId((), "total")] == sum(counts)
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+def test_stop_with_outputs_and_freed_intermediates(backend: BackendType | Literal["rolled"]) -> None:
+    total_id = pdag.StaticParameterId((), "total")
+    assert _execute(CounterModel.to_core_model(), backend, outputs=[total_id])[total_id] == 24.0  # noqa: PLR2004
+    assert _execute(CounterModel.to_core_model(), backend, free_intermediates=True)[total_id] == 24.0  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("backend", ["interpreter", "codegen", "rolled"])
+def test_stop_fill_values(backend: BackendType | Literal["rolled"]) -> None:
+    core_model = dataclasses.replace(
+        CounterModel.to_core_model(),
+        stop_condition=pdag.StopCondition(
+            pdag.ParameterRef("count"),
+            predicate=lambda count: count >= 3,  # noqa: PLR2004
+            fill_values={pdag.ParameterRef("count"): 0.0},
+        ),
+    )
+    results = _execute(core_model, backend)
+    assert results[pdag.StaticParameterId((), "total")] == 6.0  # noqa: PLR2004
+
+
+def test_stop_matches_full_horizon_of_terminal_state() -> None:
+    # Once the end is reached, the location is held and no more reward is earned
+    core_model = DiamondMdpModel.to_core_model()
+    stopping_core_model = dataclasses.replace(
+        core_model,
+        stop_condition=pdag.StopCondition(
+            pdag.ParameterRef("location"),
+            predicate=lambda location: location == "end",
+            fill_values={pdag.ParameterRef("reward"): 0.0},
+        ),
+    )
+    inputs: dict[pdag.ParameterId, str] = {
+        pdag.StaticParameterId((), "policy"): "left",
+        pdag.TimeSeriesParameterId((), "location", 0): "start",
+    }
+    exec_model = pdag.create_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+    stopping_exec_model = pdag.create_exec_model_from_core_model(stopping_core_model, n_time_steps=N_TIME_STEPS)
+    assert pdag.execute_exec_model(stopping_exec_model, inputs) == pdag.execute_exec_model(exec_model, inputs)
+
+
+def test_stop_condition_on_static_parameter() -> None:
+    core_model = dataclasses.replace(
+        CounterModel.to_core_model(),
+        stop_condition=pdag.StopCondition(pdag.ParameterRef("total")),
+    )
+    exec_model = pdag.create_exec_model_from_core_model(core_model, n_time_steps=N_TIME_STEPS)
+    with pytest.raises(ValueError, match="time-series parameter"):
+        exec_model.compile()
+
+
+def test_stop_not_supported_by_batch_execution() -> None:
+    exec_model = pdag.create_exec_model_from_core_model(CounterModel.to_core_model(), n_time_steps=N_TIME_STEPS)
+    with pytest.raises(ValueError, match="stop condition"):
+        pdag.execute_exec_model_batch(exec_model, {}, n_cases=2)
+
+
+def test_multiple_stop_conditions() -> None:
+    with pytest.raises(ValueError, match="more than one stop condition"):
+
+        class _Model(pdag.Model):
+            flag = pdag.BooleanParameter("flag", is_time_series=True)
+            stop = pdag.StopCondition(flag.ref())
+            another_stop = pdag.StopCondition(flag.ref())
@@ -3,11 +3,12 @@ from typing import Any
 import pytest
 
 import pdag
-from pdag.examples import DiamondMdpModel, PolynomialModel, SquareModel, TwoSquares
+from pdag.examples import DiamondMdpModel, PolynomialModel, SavingsModel, SquareModel, TwoSquares
 
 MODELS = [
     DiamondMdpModel,
     PolynomialModel,
+    SavingsModel,
     SquareModel,
     TwoSquares,
 ]
@@ -15,6 +16,7 @@ MODELS = [
 N_TIME_STEPS: dict[type[pdag.Model], int] = {
     DiamondMdpModel: 5,
     PolynomialModel: 1,
+    SavingsModel: 3,
     SquareModel: 1,
     TwoSquares: 1,
 }
@@ -30,6 +32,12 @@ INPUTS = {
         pdag.StaticParameterId((), "a[2]"): 3.0,
         pdag.StaticParameterId((), "x"): 2.0,
     },
+    SavingsModel: {
+        pdag.StaticParameterId((), "interest_rate"): 0.5,
+        pdag.TimeSeriesParameterId((), "deposit", 0): 100.0,
+        pdag.TimeSeriesParameterId((), "deposit", 1): 10.0,
+        pdag.TimeSeriesParameterId((), "deposit", 2): 1.0,
+    },
     SquareModel: {
         pdag.StaticParameterId((), "x"): 2.0,
     },
@@ -69,6 +77,13 @@ RESULTS: dict[type[pdag.Model], dict[pdag.ParameterId, Any]] = {
         pdag.StaticParameterId(model_path=(), name="x_squared"): 4.0,
         pdag.StaticParameterId(model_path=(), name="y"): 17.0,
     },
+    SavingsModel: {
+        pdag.StaticParameterId(model_path=(), name="interest_rate"): 0.5,
+        pdag.TimeSeriesParameterId(model_path=(), name="deposit", time_step=0): 100.0,
+        pdag.TimeSeriesParameterId(model_path=(), name="deposit", time_step=1): 10.0,
+        pdag.TimeSeriesParameterId(model_path=(), name="deposit", time_step=2): 1.0,
+        pdag.StaticParameterId(model_path=(), name="balance"): (100.0 * 1.5 + 10.0) * 1.5 + 1.0,
+    },
     SquareModel: {
         pdag.StaticParameterId(model_path=(), name="x"): 2.0,
         pdag.StaticParameterId(model_path=(), name="y"): 4.0,
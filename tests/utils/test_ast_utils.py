@@ -15,6 +15,15 @@ def test_get_function_body() -> None:
     assert body == "return None\n"
 
 
+async def sample_async_function() -> None:
+    return None
+
+
+def test_get_function_body_async() -> None:
+    body = get_function_body(sample_async_function)
+    assert body == "return None\n"
+
+
 class SampleClass(pdag.Model):
     @staticmethod
     def sqrt(
@@ -0,0 +1,13 @@
+import pytest
+
+from pdag._utils import topological_levels
+
+
+def test_topological_levels() -> None:
+    dependencies = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+    assert topological_levels(dependencies) == [["a"], ["b", "c"], ["d"]]
+
+
+def test_topological_levels_cycle() -> None:
+    with pytest.raises(ValueError, match="Cycle detected"):
+        topological_levels({"a": ["b"], "b": ["a"]})